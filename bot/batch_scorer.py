@@ -0,0 +1,100 @@
+from functools import lru_cache
+
+import numpy as np
+
+from utils.gameplay_tag import NEGATIVE_MASK
+from utils.game_test_on_discord import gods as all_gods_template
+
+# Columns of the god name axis
+GOD_NAMES = list(all_gods_template.keys())
+GOD_INDEX = {name: i for i, name in enumerate(GOD_NAMES)}
+# Abilities valued while the god is hidden or defending (instead of while reloaded)
+_HIDDEN_OR_DEFENDING_NAMES = frozenset(("poseidon", "athena", "ares"))
+
+
+def team_counts(ally: list, enemy: list) -> tuple[int, ...]:
+    """The team sizes the ability values depend on (one scan of each team), in ability_table order."""
+    ally_visible = ally_alive = ally_dead = ally_negative = hermes_visible = 0
+    for god in ally:
+        if god.alive:
+            ally_alive += 1
+            ally_visible += god.visible
+        else:
+            ally_dead += 1
+        ally_negative += (god.effect_mask & NEGATIVE_MASK).bit_count()
+        hermes_visible += god.name == "hermes" and god.visible
+    enemy_alive = sum(1 for god in enemy if god.alive)
+    enemy_visible = sum(1 for god in enemy if god.alive and god.visible)
+    return ally_visible, ally_alive, ally_dead, ally_negative, hermes_visible, enemy_alive, enemy_visible
+
+
+def ability_table(ally_visible, ally_alive, ally_dead, ally_negative, hermes_visible, enemy_alive, enemy_visible):
+    """
+    Ability value of every god for the given team counts, shape (..., 2, len(GOD_NAMES)): the value
+    while hidden ([..., 0, :]) and while visible ([..., 1, :]), assuming the ability is available.
+    The counts may be arrays to value many states at once. Divisors that can be zero (no visible
+    ally, no alive enemy, 5 visible allies for cerberus) are clamped to 1.
+    """
+    v = np.asarray(ally_visible, dtype=np.float64)
+    a = np.asarray(ally_alive, dtype=np.float64)
+    d = np.asarray(ally_dead, dtype=np.float64)
+    e_alive = np.asarray(enemy_alive, dtype=np.float64)
+    e_vis = np.asarray(enemy_visible, dtype=np.float64)
+    shape = np.broadcast(v, a, d, e_alive, e_vis, np.asarray(ally_negative), np.asarray(hermes_visible)).shape
+    const = lambda x: np.full(shape, x, dtype=np.float64)
+    hermes_allies = v - hermes_visible
+
+    values = {
+        "poseidon": 5 / np.maximum(v, 1),
+        "athena": 2 * v + 2,
+        "charon": 6 / np.maximum(v, 1) + ally_negative,
+        "megaera": 8 / np.maximum(e_alive, 1),
+        "tisiphone": np.where((a > 2) & (e_alive > 2), 3.0, 2.0),  # hidden value, visible below
+        "zeus": np.where(e_alive > 2, 6 / (v + 1), 2.0),
+        "cerberus": 6 / np.maximum(5 - v, 1),
+        "hera": const(0),
+        "aphrodite": const(2),
+        "artemis": e_vis,
+        "hades_ow": np.floor(0.5 + d / 2) * (v + 1),
+        "alecto": const(4),
+        "hecate": const(3),
+        "hephaestus": 2 * v + 2,
+        "ares": v + 1,
+        "persephone": const(3),
+        "thanatos": const(4),
+        "apollo": v + 1,
+        "hermes": np.where(hermes_allies == 1, 4.0, np.where(hermes_allies > 1, 8.0, 0.0)),
+        "hades_uw": d * v,
+    }
+    hidden = np.stack([np.broadcast_to(values[name], shape) for name in GOD_NAMES], axis=-1)
+    visible = hidden.copy()
+    visible[..., GOD_INDEX["tisiphone"]] = np.where((a > 2) & (e_alive > 2), 3.0, 1.0)
+    return np.stack([hidden, visible], axis=-2)
+
+
+@lru_cache(maxsize=4096)
+def _ability_rows(counts: tuple[int, ...]) -> list[list[list[float]]]:
+    """ability_table of one state as nested lists [visible][name id] (counts only take a few hundred values)."""
+    return ability_table(*counts).tolist()
+
+
+class BatchScorer:
+    """
+    Ability values for one bot decision: the teams are scanned once and the value of every god
+    comes from one vectorized ability_table pass, cached per team state.
+    """
+
+    def __init__(self, my_team: list, opp_team: list):
+        self.rows = _ability_rows(team_counts(my_team, opp_team))
+
+    def ability_value(self, god, visible: bool, reload: int, attacking: bool) -> float:
+        """
+        Ability value of god, 0 while the ability is unavailable: reloading, or for poseidon,
+        athena and ares visible and attacking.
+        """
+        name = god.name
+        if name in _HIDDEN_OR_DEFENDING_NAMES:
+            available = not visible or not attacking
+        else:
+            available = reload < 1
+        return self.rows[visible][GOD_INDEX[name]] if available else 0
@@ -0,0 +1,51 @@
+import logging
+from collections import deque
+
+import discord
+
+from bot.config import Config
+from bot.outbound import outbound, PRIORITY_PROMPT
+
+logger = logging.getLogger(__name__)
+
+
+class BattleBoard:
+    """
+    The single message of a match that shows the battle: a bounded log of the last actions,
+    the two teams and, while a player has to choose, the selection prompt and its buttons.
+    Every prompt and every end of turn edits this message instead of sending new ones.
+    """
+
+    def __init__(self, log_size: int = Config.BATTLE_LOG_SIZE):
+        self.message = None
+        self.log = deque(maxlen=log_size)
+        self.entry_limit = 4000 // log_size  # keeps the log embed under Discord's 4096 characters
+
+    # ----------------- LOG -----------------
+    def log_action(self, text: str):
+        """Add an action to the log (shown at the next update of the board)."""
+        text = text.strip()
+        if text:
+            if len(text) > self.entry_limit:
+                text = text[:self.entry_limit - 1] + "…"
+            self.log.append(text)
+
+    def _log_embed(self, channel_id: int) -> discord.Embed:
+        embed = discord.Embed(title="📜 Battle log", color=discord.Color.dark_grey())
+        embed.description = "\n\n".join(self.log) if self.log else "The battle begins!"
+        embed.set_footer(text=f"API headroom: {outbound.headroom(channel_id)}/{Config.CHANNEL_RATE_LIMIT} "
+                              f"calls per {Config.CHANNEL_RATE_WINDOW}s")
+        return embed
+
+    # ----------------- MESSAGE -----------------
+    async def show(self, channel: discord.TextChannel, embeds: list[discord.Embed], view: discord.ui.View | None = None):
+        """Edit the board to show the log followed by embeds (sent once if the board doesn't exist yet)."""
+        all_embeds = [self._log_embed(channel.id)] + embeds
+        if self.message is not None:
+            try:
+                await outbound.edit(self.message, PRIORITY_PROMPT, embeds=all_embeds, view=view)
+                return self.message
+            except discord.NotFound:
+                self.message = None  # deleted by someone, send a new one
+        self.message = await outbound.send(channel, PRIORITY_PROMPT, embeds=all_embeds, view=view)
+        return self.message
@@ -1,169 +1,71 @@
 import random 
-import math 
-from utils.gameplay_tag import God
-from utils.game_test_on_discord import get_alive,get_dead,get_visible
+from utils.gameplay_tag import God, EffectType
+from utils.game_test_on_discord import get_alive,get_dead
+from bot.batch_scorer import BatchScorer
 import logging
 logger = logging.getLogger(__name__)
+# -------------------- MATCH --------------------
+class Match:
+    """Represents a single Maggod Fight match."""
+    def __init__(self, player1_id=None, player2_id=None):
+        self.player1_id = player1_id #str
+        self.player1_name = "Player 1" #str
+        self.player2_id = player2_id #str
+        self.player2_name = "Player 2" #str
+        self.started = False #bool
+        self.teams = {} #List in dict {Player_id : [Gods]}
+        self.gods = {} # copy of all the gods (no modification of the initial dict)
+        self.available_gods = [] # list of all the remaining gods (used during team building)
+        self.picked_gods = {}
+        self.next_picker = None # str (player id or "bot")
+        self.current_turn_player = None 
+        self.turn_number = 0
+        self.teams_initialized = False
+        self.game_phase = "Waiting for first player"  # Waiting for second player,ready, building, playing, finished
+
+        self.current_attacking_team = None
+        self.turn_state = {
+            "current_player": None,
+            "turn_number": 1
+        }
+        self.solo_mode = False
+        self.turn_in_progress = False
+        self.start_view = False
+        self.DEBUG_SKIP_BUILD = False
+        self.ai_bot_name = "random" 
+        self.money_sys_type = "2 players"
+        self.bot_type = "random"
+        self.gamb_bet = 0
+        self.gamb_gain = 0
+        self.turn_record = None # bot.mcts.TurnRecord of the turn being played
+        self.board = None # bot.battle_board.BattleBoard, the message showing the battle
+
+        self.compact_mode = False # whether to use compact display mode
+
 # -------------------- BOT CONFIGS --------------------
 bot_configs = {
     "random": {},
     "worst_bot": {"hp": -1, "dmg": -1,"reload":-0.3},
     "best_bot": {"hp": 0.3, "dmg": 1,"reload":0.3},
-    "bot_overloard":{"hp": 0.3, "dmg": 1,"ability":1}
+    "bot_overloard":{"hp": 0.3, "dmg": 1,"ability":1},
+    "mcts": {}
 }
 
 bot_choose_configs = {
     "random": {},
     "worst_bot": {"hp": -0.3, "dmg": -1,"reload":-0.3},
     "best_bot": {"hp": 0.3, "dmg": 1,"reload":0.3},
-    "bot_overloard":{"hp": 0.3, "dmg": 1,"ability":1}
+    "bot_overloard":{"hp": 0.3, "dmg": 1,"ability":1},
+    "mcts": {}  # searches with bot.mcts, falls back to best_bot outside of turns
 }
 
-# -------------------- GOD ABILLITY --------------------
-def poseidon(ally,ennemy,visible,reload,attacking):
-    if not(visible) or not(attacking):
-        return 5/len(get_visible(ally))
-    else:
-        return 0 
-def athena(ally,ennemy,visible,reload,attacking):
-    if not(visible) or not(attacking):
-        return 2 * len(get_visible(ally)) + 2
-    else:
-        return 0 
-def charon(ally,ennemy,visible,reload,attacking):
-    if reload<1:
-        return 6/len(get_visible(ally))+sum(1 for god in ally for e in god.effects if e in ["aphro_charm", "zeus_stun", "tisi_freeze_timer","alecto_get_more_dmg", "mega_do_less_dmg"])
-    else:
-        return 0
-def megaera(ally,ennemy,visible,reload,attacking):
-    if reload<1:
-        return 8/len(get_alive(ennemy))
-    else: 
-        return 0  
-def tisiphone(ally,ennemy,visible,reload,attacking):
-    if reload<1:
-        ally_vis = len(get_alive(ally))
-        if ally_vis>2 and len(get_alive(ennemy))>2:
-            return 3
-        if not(visible):
-            return 2
-        else:
-            return 1
-    else:
-        return 0 
-def zeus(ally,ennemy,visible,reload,attacking):
-    if reload<1:
-        if len(get_alive(ennemy))>2:
-            return 6/(len(get_visible(ally))+1)
-        else:
-            return 2
-    else:
-        return 0
-def cerberus(ally,ennemy,visible,reload,attacking):
-    if reload<1:
-        return 6/(5-len(get_visible(ally)))
-    else:
-        return 0 
-def hera(ally,ennemy,visible,reload,attacking):
-    return 0
-def aphrodite(ally,ennemy,visible,reload,attacking):
-    if reload<1:
-        return 2
-    else:
-        return 0
-def artemis(ally,ennemy,visible,reload,attacking):
-    if reload<1:
-        return len(get_visible(ennemy))
-    else:
-        return 0   
-def hades_ow(ally,ennemy,visible,reload,attacking):
-    if reload<1:
-        return math.floor(0.5 + len(get_dead(ally))/2)*(len(get_visible(ally))+1)
-    else:
-        return 0  
-def alecto(ally,ennemy,visible,reload,attacking):
-    if reload<1:
-        return 4
-    else:
-        return 0 
-def hecate(ally,ennemy,visible,reload,attacking):
-    if reload<1:
-        return 3
-    else:
-        return 0 
-def hephaestus(ally,ennemy,visible,reload,attacking):
-    if reload<1:
-        return 2*len(get_visible(ally))+2
-    else:
-        return 0
-def ares(ally,ennemy,visible,reload,attacking):
-    if not(visible) or not(attacking):
-        return len(get_visible(ally))+1
-    else:
-        return 0
-def persephone(ally,ennemy,visible,reload,attacking):
-    if reload<1:
-        return 3
-    else:
-        return 0
-def thanatos(ally,ennemy,visible,reload,attacking):
-    if reload<1:
-        return 4
-    else:
-        return 0
-def apollo(ally,ennemy,visible,reload,attacking):
-    if reload<1:
-        return len(get_visible(ally))+1
-    else:
-        return 0
-def hermes(ally,ennemy,visible,reload,attacking):
-    if reload<1:
-        al_lng = len(get_visible(ally))
-        for g in ally:
-            if g.name =="hermes" and g.visible:
-                al_lng -=1
-        if al_lng==1:
-            return 4
-        if al_lng>1:
-            return 8
-        else:
-            return 0
-    else:
-        return 0
-def hades_uw(ally,ennemy,visible,reload,attacking):
-    if reload<1:
-        return len(get_dead(ally))*len(get_visible(ally))
-    else:
-        return 0
-
-
-GOD_ABILITIES = {
-    "poseidon": poseidon,
-    "athena": athena,
-    "charon": charon,
-    "megaera": megaera,
-    "tisiphone": tisiphone,
-    "zeus": zeus,
-    "cerberus": cerberus,
-    "hera": hera,
-    "aphrodite": aphrodite,
-    "artemis": artemis,
-    "hades_ow": hades_ow,
-    "alecto": alecto,
-    "hecate": hecate,
-    "hephaestus": hephaestus,
-    "ares": ares,
-    "persephone": persephone,
-    "thanatos": thanatos,
-    "apollo": apollo,
-    "hermes": hermes,
-    "hades_uw": hades_uw,
-}
 # -------------------- TURN CONTEXT --------------------
 class TurnContext:
-    def __init__(self, select=None, my_team=None, opp_team=None, action_text=None, attack_cerbs: bool = False):
+    def __init__(self, select=None, my_team=None, opp_team=None, action_text=None, attack_cerbs: bool = False,
+                 record=None):
         self.action_text = action_text
         self.attack_cerbs = attack_cerbs
+        self.record = record  # bot.mcts.TurnRecord of the current turn (live matches only)
         if action_text == "attack":
             self.my_team = opp_team or []
             self.opp_team = my_team or []
@@ -181,9 +83,17 @@ class BotClass:
         self.choose_config = bot_choose_configs[name]
         self.true_dmg_list = []
         self.ctx: TurnContext | None = None
+        self._scorer: BatchScorer | None = None
 
     def set_ctx(self, ctx: TurnContext):
         self.ctx = ctx
+        self._scorer = None
+
+    def scorer(self) -> BatchScorer:
+        """Ability values of the current context (the teams are scanned once per decision)."""
+        if self._scorer is None:
+            self._scorer = BatchScorer(self.ctx.my_team, self.ctx.opp_team)
+        return self._scorer
 
 ### Helper functions :
 
@@ -210,16 +120,10 @@ class BotClass:
         # add ability values if configured
         ability_mult = self.choose_config.get("ability", None)
         if ability_mult is not None:
+            scorer = self.scorer()
             for god in self.ctx.my_team:
-                if god in dmg_values and god.name in GOD_ABILITIES:
-                    dmg_values[god] += (
-                        GOD_ABILITIES[god.name](
-                            self.ctx.my_team, 
-                            self.ctx.opp_team, 
-                            god.visible, 
-                            god.reload,True
-                        ) * ability_mult
-                    )
+                if god in dmg_values:
+                    dmg_values[god] += scorer.ability_value(god, god.visible, god.reload, True) * ability_mult
         # bot config choose max or min
         if dmg_multiplier is not None and dmg_multiplier < 0:
             target_value = min(dmg_values.values())
@@ -278,7 +182,7 @@ class BotClass:
         scores = {}
         for g in gods: # calculate 
                 score = 0
-                if "charon_invisible_duration" in g.effects:
+                if g.has_effect(EffectType.CHARON_INVISIBLE):
                     score = 0
                 else:
                         
@@ -300,14 +204,7 @@ class BotClass:
                     ability_mult = self.choose_config.get("ability", None)
                     if ability_mult is not None:
                         # get ability value for god and aplly it to score
-                        score += (
-                            GOD_ABILITIES[g.name](
-                                self.ctx.my_team, 
-                                self.ctx.opp_team, 
-                                g.visible, 
-                                g.reload,False
-                            ) * ability_mult
-                        )
+                        score += self.scorer().ability_value(g, g.visible, g.reload, False) * ability_mult
                     scores[g] = score
         return scores
 
@@ -317,7 +214,7 @@ class BotClass:
         all_gods = []
         # Check which gods can be instakilled
         for g in self.ctx.select:
-            if "charon_invisible_duration" in g.effects:
+            if g.has_effect(EffectType.CHARON_INVISIBLE):
                 if len(self.ctx.select)==1:
                     self.true_dmg_list.clear()
                     return g
@@ -338,8 +235,27 @@ class BotClass:
         self.true_dmg_list.clear()
 
         return chosen
+
+    def mcts_god(self):
+        """Search the pick with MCTS (needs the turn record, except for the first pick of a turn)."""
+        from bot.mcts import MCTSBot, TurnRecord
+        record = self.ctx.record
+        if record is None:
+            if self.ctx.action_text != "attack with":
+                return BotClass("best_bot").choose_god(self.ctx)
+            record = TurnRecord(self.ctx.my_team, self.ctx.opp_team)
+        return MCTSBot().choose(self.ctx, record)
  
 
+    def draft_god(self):
+        """Team building pick from the matchup table (None without a table, the heuristics are used)."""
+        from utils.matchups import get_matchup_table
+        table = get_matchup_table()
+        if table is None or not self.choose_config:
+            return None
+        sign = 1 if self.choose_config.get("dmg", 1) >= 0 else -1  # worst_bot drafts the weakest gods
+        return max(self.ctx.select, key=lambda g: sign * table.draft_score(g, self.ctx.my_team, self.ctx.opp_team))
+
     # -------------------- MAIN BOT FUNCTION --------------------
     def choose_god(self, ctx: TurnContext):
         self.set_ctx(ctx)
@@ -351,6 +267,9 @@ class BotClass:
         if self.name == "random":
             return random.choice(ctx.select)
 
+        if self.name == "mcts":
+            return self.mcts_god()
+
         # --- "attack with" logic ---
         if ctx.action_text and ctx.action_text.startswith("attack with"):
             return self.max_damage_god()
@@ -369,7 +288,7 @@ class BotClass:
         
         if ctx.action_text == "protect":
             # If any ally has cerberus effect, protect them
-            cerb_ally = next((g for g in ctx.my_team if "cerberus_more_max_hp_per_visible_ally" in g.effects), None)
+            cerb_ally = next((g for g in ctx.my_team if g.has_effect(EffectType.CERBERUS_MORE_MAX_HP)), None)
             if cerb_ally:
                 return cerb_ally
             # Otherwise protect the ally with lowest hp
@@ -397,6 +316,12 @@ class BotClass:
             return max(alive_allies, key=lambda g: g.hp, default=None)
 
 
+        # --- team building ---
+        if ctx.action_text is None:
+            god = self.draft_god()
+            if god is not None:
+                return god
+
         # --- fallback score-based system ---
         if self.choose_config:
             scores = {
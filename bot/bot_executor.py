@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, BrokenExecutor
+
+from bot.bot_class import BotClass, TurnContext
+from bot.config import Config
+from bot.metrics import BOT_DECISION_SECONDS, BOT_DECISION_FALLBACKS
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_BOT = "random"
+
+
+def _candidates(ctx: TurnContext) -> list:
+    # A bot may answer with a god outside ctx.select (e.g. "protect" picks any ally),
+    # so picks are located in the select list first, then in the two teams.
+    return list(ctx.select) + list(ctx.my_team) + list(ctx.opp_team)
+
+
+def _decide(bot_name: str, ctx: TurnContext) -> int | None:
+    """Run one decision in a worker and return the position of the pick in _candidates(ctx)."""
+    chosen = BotClass(bot_name).choose_god(ctx)
+    if chosen is None:
+        return None
+    for index, god in enumerate(_candidates(ctx)):
+        if god is chosen:
+            return index
+    return None
+
+
+class DecisionMetrics:
+    """Latency counters of the decisions of one bot_type."""
+
+    def __init__(self, window: int = 256):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.timeouts = 0
+        self.errors = 0
+        self.recent = deque(maxlen=window)
+
+    def record(self, elapsed: float):
+        self.count += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        self.recent.append(elapsed)
+
+    def get_stats_dict(self) -> dict:
+        recent = sorted(self.recent)
+        p95 = recent[min(len(recent) - 1, int(len(recent) * 0.95))] if recent else 0.0
+        return {
+            "decisions": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 1) if self.count else 0.0,
+            "p95_ms": round(p95 * 1000, 1),
+            "max_ms": round(self.max * 1000, 1),
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+        }
+
+
+class BotExecutor:
+    """
+    Runs bot decisions off the event loop in a thread or process pool.
+    A decision that times out or raises is replaced by a pick of the "random" bot.
+    """
+
+    def __init__(self, mode: str = Config.BOT_EXECUTOR_MODE, max_workers: int = Config.BOT_EXECUTOR_WORKERS,
+                 timeout: float = Config.BOT_DECISION_TIMEOUT):
+        self.mode = mode
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.metrics: dict[str, DecisionMetrics] = {}
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            if self.mode == "process":
+                # spawn: don't fork the running event loop/Discord connection into the workers
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bot-decision")
+        return self._pool
+
+    async def choose_god(self, bot_name: str, ctx: TurnContext):
+        """Return the god picked by bot_name (same contract as BotClass.choose_god)."""
+        metrics = self.metrics.setdefault(bot_name, DecisionMetrics())
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            index = await asyncio.wait_for(
+                loop.run_in_executor(self._get_pool(), _decide, bot_name, ctx), timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            metrics.timeouts += 1
+            BOT_DECISION_FALLBACKS.inc(bot=bot_name, reason="timeout")
+            logger.warning(f"Bot {bot_name} timed out after {self.timeout}s, using {FALLBACK_BOT}")
+            return self._fallback(ctx)
+        except BrokenExecutor as e:
+            # A worker died (e.g. killed process), start a fresh pool for the next decision
+            metrics.errors += 1
+            BOT_DECISION_FALLBACKS.inc(bot=bot_name, reason="broken_pool")
+            logger.error(f"Bot executor pool broken ({e}), restarting it, using {FALLBACK_BOT}")
+            self.shutdown()
+            return self._fallback(ctx)
+        except Exception as e:
+            metrics.errors += 1
+            BOT_DECISION_FALLBACKS.inc(bot=bot_name, reason="error")
+            logger.error(f"Bot {bot_name} failed: {e}, using {FALLBACK_BOT}")
+            return self._fallback(ctx)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.record(elapsed)
+            BOT_DECISION_SECONDS.observe(elapsed, bot=bot_name)
+
+        if index is None:
+            return None
+        return _candidates(ctx)[index]
+
+    @staticmethod
+    def _fallback(ctx: TurnContext):
+        if not ctx.select:
+            return None
+        return BotClass(FALLBACK_BOT).choose_god(ctx)
+
+    def get_stats_dict(self) -> dict:
+        return {bot_name: metrics.get_stats_dict() for bot_name, metrics in self.metrics.items()}
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+bot_executor = BotExecutor()
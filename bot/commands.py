@@ -75,8 +75,9 @@ async def setup_commands(bot):
             memory = psutil.virtual_memory()
             
             # Get match statistics
-            from utils import matchmaking_dict
-            active_matches = len(matchmaking_dict)
+            from bot.match_registry import match_registry
+            active_matches = len(match_registry)
+            match_bytes = match_registry.stats()["bytes"]
             
             embed = discord.Embed(
                 title="🤖 Bot Status",
@@ -96,7 +97,7 @@ async def setup_commands(bot):
             # Game Statistics
             embed.add_field(
                 name="🎮 Game Stats",
-                value=f"**Active Matches:** {active_matches}\n"
+                value=f"**Active Matches:** {active_matches} (~{match_bytes // 1024} KiB)\n"
                       f"**Commands Used:** {bot.stats.commands_used}\n"
                       f"**Messages Seen:** {bot.stats.messages_seen}",
                 inline=True
@@ -135,7 +136,7 @@ async def setup_commands(bot):
             # Active matches details
             if active_matches > 0:
                 match_details = []
-                for channel_id, match in list(matchmaking_dict.items())[:5]:  # Show first 5
+                for channel_id, match in list(match_registry.items())[:5]:  # Show first 5
                     try:
                         channel = bot.get_channel(channel_id)
                         if channel:
@@ -24,6 +24,42 @@ class Config:
     TURN_TIMEOUT = 1  # 5 minutes per turn
     TEAM_SIZE = 5
     SELECTION_TIMEOUT = 300  # 5 minutes
+    MATCH_IDLE_TTL = 1800  # seconds without any lookup before a match is evicted from memory
+    MATCH_SWEEP_INTERVAL = 300  # seconds between two idle match sweeps
+    BATTLE_LOG_SIZE = 4  # actions kept in the log of the battle board message
+    # Discord allows about 5 messages per 5 seconds in a channel (shown as headroom on the board)
+    CHANNEL_RATE_LIMIT = 5
+    CHANNEL_RATE_WINDOW = 5  # seconds
+    GLOBAL_RATE_LIMIT = 50  # requests per second for the whole bot
+    LOBBY_STATUS_CHANNEL_ID = 1394978367287066725
+    LOBBY_STATUS_GUILD_ID = int(os.getenv("LOBBY_STATUS_GUILD_ID", "1096028646323527740"))  # guild of LOBBY_STATUS_CHANNEL_ID
+    LOBBY_STATUS_DEBOUNCE = 5  # seconds between two edits of the lobby status message
+    # Currency: "supabase" (production) or "sqlite" (local WAL file, for offline tests/benchmarks)
+    MONEY_BACKEND = os.getenv("MONEY_BACKEND", "supabase")
+    MONEY_DB_PATH = os.getenv("MONEY_DB_PATH", "currency/money/money.db")
+    MONEY_CACHE_TTL = 60  # seconds a cached money row is trusted before it is read again
+    GUESS_FLUSH_INTERVAL = 30  # seconds between saves of the hangman guess windows to player_time
+    # /balance leaderboard
+    LEADERBOARD_PAGE_SIZE = 10
+    LEADERBOARD_CACHE_SIZE = 100  # top rows kept in memory (deeper pages are read on demand)
+    LEADERBOARD_TTL = 60  # seconds the cached top rows are shown before they are read again
+    MEMBER_NAME_TTL = 3600  # seconds a resolved display name is reused
+    # Sharding: WORKER_PROCESSES bot processes share SHARD_COUNT shards (0 = Discord's recommendation)
+    SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0"))
+    WORKER_PROCESSES = int(os.getenv("WORKER_PROCESSES", "1"))
+    # Arcade matchmaking shared by the worker processes (tic-tac-toe queue)
+    BROKER_DB_PATH = os.getenv("BROKER_DB_PATH", "database/database/broker.db")
+    ARCADE_QUEUE_TIMEOUT = 120  # seconds a player waits in an arcade queue
+    # keep_alive web server (/, /health, /metrics); worker i listens on KEEP_ALIVE_PORT + i
+    KEEP_ALIVE_PORT = int(os.getenv("KEEP_ALIVE_PORT", "5000"))
+    METRICS_INTERVAL = 1.0  # seconds between two event loop lag samples
+    # MCTS bot
+    MCTS_TIME_BUDGET = float(os.getenv("MCTS_TIME_BUDGET", "0.2"))  # seconds of search per decision
+    # Bot decisions run in a worker pool ("thread" or "process"), slower ones fall back to the random bot
+    BOT_EXECUTOR_MODE = os.getenv("BOT_EXECUTOR_MODE", "thread")
+    BOT_EXECUTOR_WORKERS = int(os.getenv("BOT_EXECUTOR_WORKERS", "2"))
+    BOT_DECISION_TIMEOUT = 2.0  # seconds
+    MCTS_ROLLOUT_TURNS = 4  # turns simulated per iteration before the position is scored (short beats deep here)
 
     # Game Settings
     LOBBY_CATEGORY_NAME = "Maggod Gaming"
@@ -139,10 +139,10 @@ def setup_events(bot):
         logger.info(f"Bot removed from guild: {guild.name} (ID: {guild.id})")
         
         # Clean up any matches in progress for this guild
-        from main import matchmaking_dict
+        from bot.match_registry import match_registry
         
         channels_to_remove = []
-        for channel_id, match in matchmaking_dict.items():
+        for channel_id, match in match_registry.items():
             try:
                 channel = bot.get_channel(channel_id)
                 if channel and channel.guild.id == guild.id:
@@ -151,7 +151,7 @@ def setup_events(bot):
                 logger.error(f"Error checking channel {channel_id}: {e}")
         
         for channel_id in channels_to_remove:
-            del matchmaking_dict[channel_id]
+            match_registry.remove(channel_id)
             logger.info(f"Cleaned up match for channel {channel_id}")
     
     @bot.event
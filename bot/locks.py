@@ -0,0 +1,56 @@
+import asyncio
+import contextlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ChannelLocks:
+    """
+    One asyncio.Lock per lobby channel (use the `channel_locks` instance), shared by the commands
+    that change a match (/join, /leave, /start, /choose, /do). Commands of one lobby run one at a
+    time, other lobbies are never blocked. A lock is created on first use and dropped as soon as
+    nobody holds or waits for it, so idle channels cost nothing.
+    """
+
+    def __init__(self):
+        self._locks: dict[int, list] = {}  # channel_id -> [lock, holders + waiters]
+
+    async def acquire(self, channel_id: int):
+        entry = self._locks.get(channel_id)
+        if entry is None:
+            entry = self._locks[channel_id] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            await entry[0].acquire()
+        except BaseException:
+            self._done(channel_id, entry)  # cancelled while waiting
+            raise
+
+    def release(self, channel_id: int):
+        entry = self._locks[channel_id]
+        entry[0].release()
+        self._done(channel_id, entry)
+
+    def _done(self, channel_id: int, entry: list):
+        entry[1] -= 1
+        if entry[1] == 0 and self._locks.get(channel_id) is entry:
+            del self._locks[channel_id]
+
+    @contextlib.asynccontextmanager
+    async def hold(self, channel_id: int):
+        await self.acquire(channel_id)
+        try:
+            yield
+        finally:
+            self.release(channel_id)
+
+    def locked(self, channel_id: int) -> bool:
+        entry = self._locks.get(channel_id)
+        return entry is not None and entry[0].locked()
+
+    def __len__(self):
+        return len(self._locks)
+
+
+channel_locks = ChannelLocks()
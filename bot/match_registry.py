@@ -0,0 +1,201 @@
+import asyncio
+import sys
+import time
+import logging
+from types import FunctionType, MethodType, ModuleType, BuiltinFunctionType
+
+from bot.config import Config
+from bot.locks import channel_locks
+from bot.metrics import ACTIVE_MATCHES
+from database.manager import db_manager
+
+logger = logging.getLogger(__name__)
+
+# Phases whose match can be restored by db_manager.load_game (teams are built)
+RESUMABLE_PHASES = frozenset(("playing",))
+_NOT_COUNTED = (type, ModuleType, FunctionType, MethodType, BuiltinFunctionType)
+
+
+def match_memory(match) -> int:
+    """
+    Approximate bytes held by one match: sys.getsizeof of the match and of everything it reaches
+    through containers and attributes. Discord objects (messages, views, channels) are shared
+    with the gateway cache and are not counted, neither are functions and classes.
+    """
+    seen = set()
+    stack = [match]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _NOT_COUNTED):
+            continue
+        seen.add(id(obj))
+        if type(obj).__module__.startswith("discord"):
+            continue
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, "__dict__"):
+            stack.append(vars(obj))
+    return total
+
+
+def persist_match(channel_id: int, match):
+    """Default evict hook: keep resumable matches in the database, drop the save of the others."""
+    if match.game_phase in RESUMABLE_PHASES and match.teams_initialized:
+        db_manager.queue_game_save(channel_id, match)
+    else:
+        db_manager.queue_delete_game_save(channel_id)
+
+
+class MatchRegistry:
+    """
+    Matches by channel id (use the `match_registry` instance). The first lookup of a channel
+    resumes its saved match (if any) from the database, so nothing is loaded at startup.
+    Every lookup marks the match as active; matches idle for `idle_ttl` seconds are evicted
+    by the sweeper after running the evict hooks (by default persist_match), so abandoned
+    lobbies don't keep their teams and gods forever. Removing a match also drops its save.
+    """
+
+    MAX_CHECKED = 4096
+
+    def __init__(self, idle_ttl: float = Config.MATCH_IDLE_TTL, evict_hooks: list | None = None):
+        self.idle_ttl = idle_ttl
+        self.evict_hooks = list(evict_hooks or [])  # hook(channel_id, match), run before eviction
+        self._matches = {}  # channel_id -> match
+        self._last_active = {}  # channel_id -> time.monotonic() of the last lookup
+        self._checked = set()  # channels already looked up in the database (trimmed past MAX_CHECKED)
+        self._sweeper = None
+        self.evicted = 0
+
+    def _resume(self, channel_id):
+        if channel_id in self._checked or channel_id is None:
+            return
+        self._mark_checked(channel_id)
+        from bot.bot_class import Match
+        match = db_manager.load_game(channel_id, Match)
+        if match is not None:
+            logger.info(f"Resumed saved match of channel {channel_id} (turn {match.turn_number})")
+            self._matches[channel_id] = match
+
+    def _mark_checked(self, channel_id):
+        self._checked.add(channel_id)
+        if len(self._checked) > self.MAX_CHECKED:
+            # channels without a match are looked up again (load_game also sees the queued writes)
+            self._checked = set(self._matches) | {channel_id}
+
+    def touch(self, channel_id):
+        if channel_id in self._matches:
+            self._last_active[channel_id] = time.monotonic()
+
+    def get(self, channel_id):
+        """The match of a channel (resumed from its save on first lookup), None if there is none."""
+        self._resume(channel_id)
+        self.touch(channel_id)
+        return self._matches.get(channel_id)
+
+    def add(self, channel_id, match):
+        """Register a new match of a channel (it replaces any stale save)."""
+        self._mark_checked(channel_id)
+        self._matches[channel_id] = match
+        self._last_active[channel_id] = time.monotonic()
+        return match
+
+    def remove(self, channel_id):
+        """Forget the match of a channel and drop its save. Returns the removed match (or None)."""
+        self._mark_checked(channel_id)
+        self._last_active.pop(channel_id, None)
+        match = self._matches.pop(channel_id, None)
+        db_manager.queue_delete_game_save(channel_id)
+        return match
+
+    def __contains__(self, channel_id):
+        self._resume(channel_id)
+        return channel_id in self._matches
+
+    def __len__(self):
+        return len(self._matches)
+
+    def items(self) -> list:
+        """Snapshot of the (channel_id, match) pairs in memory (safe to iterate across awaits)."""
+        return list(self._matches.items())
+
+    def by_phase(self, *phases: str) -> list:
+        """(channel_id, match) pairs in memory whose game_phase is one of phases."""
+        return [(cid, match) for cid, match in self._matches.items() if match.game_phase in phases]
+
+    def idle_seconds(self, channel_id) -> float:
+        return time.monotonic() - self._last_active.get(channel_id, time.monotonic())
+
+    # ----------------- EVICTION -----------------
+    def evict(self, channel_id):
+        """Run the evict hooks and drop a match from memory; a persisted match resumes on next lookup."""
+        match = self._matches.get(channel_id)
+        if match is None:
+            return None
+        for hook in self.evict_hooks:
+            try:
+                hook(channel_id, match)
+            except Exception as e:
+                logger.error(f"Evict hook {getattr(hook, '__name__', hook)} failed for channel {channel_id}: {e}")
+        del self._matches[channel_id]
+        self._last_active.pop(channel_id, None)
+        self._checked.discard(channel_id)  # look the save up again if the channel is used
+        self.evicted += 1
+        return match
+
+    def evict_idle(self, ttl: float | None = None) -> list:
+        """Evict every match idle for more than ttl seconds (skipping lobbies a command is working on)."""
+        ttl = self.idle_ttl if ttl is None else ttl
+        now = time.monotonic()
+        stale = [
+            (cid, now - last) for cid, last in self._last_active.items()
+            if now - last > ttl and not channel_locks.locked(cid)
+        ]
+        for channel_id, idle in stale:
+            match = self.evict(channel_id)
+            if match is not None:
+                logger.info(f"Evicted idle match of channel {channel_id} ({match.game_phase}, idle {idle:.0f}s)")
+        return [cid for cid, _ in stale]
+
+    def start_sweeper(self, bot=None, interval: float = Config.MATCH_SWEEP_INTERVAL):
+        """Evict idle matches every `interval` seconds (and refresh the lobby status if any was evicted)."""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep(bot, interval))
+
+    async def _sweep(self, bot, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if self.evict_idle() and bot is not None:
+                    from bot.utils import lobby_status_board
+                    lobby_status_board.request_refresh(bot)
+            except Exception as e:
+                logger.error(f"Idle match sweep failed: {e}")
+
+    # ----------------- MEMORY -----------------
+    def memory_usage(self, channel_id) -> int:
+        match = self._matches.get(channel_id)
+        return 0 if match is None else match_memory(match)
+
+    def stats(self) -> dict:
+        """Matches in memory by phase and their approximate size in bytes."""
+        by_phase = {}
+        total = 0
+        for match in self._matches.values():
+            by_phase[match.game_phase] = by_phase.get(match.game_phase, 0) + 1
+            total += match_memory(match)
+        return {"matches": len(self._matches), "by_phase": by_phase, "bytes": total, "evicted": self.evicted}
+
+    def export_metrics(self):
+        """Refresh the maggod_active_matches gauge (a metrics collector, runs on the event loop)."""
+        counts = {}
+        for match in self._matches.values():
+            counts[(match.game_phase,)] = counts.get((match.game_phase,), 0) + 1
+        ACTIVE_MATCHES.replace(counts)
+
+
+match_registry = MatchRegistry(evict_hooks=[persist_match])
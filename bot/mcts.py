@@ -0,0 +1,147 @@
+import math
+import random
+import time
+import logging
+
+from bot.config import Config
+from utils.game_test_on_discord import clone_team
+
+logger = logging.getLogger(__name__)
+
+UCT_C = 1.4  # exploration constant
+
+
+class TurnRecord:
+    """
+    Snapshot of both teams at the start of a turn plus the picks made so far in that turn.
+    Picks are stored as the index of the chosen god in the team it was picked from, so
+    the turn can be replayed on cloned teams.
+    """
+
+    def __init__(self, attack_team: list, defend_team: list):
+        self.attack_team = clone_team(attack_team)
+        self.defend_team = clone_team(defend_team)
+        self.picks = []
+
+    def add_pick(self, team: list, god):
+        if god in team:
+            self.picks.append(team.index(god))
+
+
+class _Node:
+    """Open-loop tree node: statistics for one sequence of picks (states are re-sampled on every replay)."""
+    __slots__ = ("visits", "value", "children")
+
+    def __init__(self):
+        self.visits = 0
+        self.value = 0.0  # summed reward of the side that made the pick leading here
+        self.children = {}
+
+
+def evaluate(my_team: list, opp_team: list) -> float:
+    """Reward in [0, 1] for my_team: 1/0 for a decided game, otherwise the share of alive HP."""
+    my_alive = any(god.alive for god in my_team)
+    opp_alive = any(god.alive for god in opp_team)
+    if not opp_alive:
+        return 1.0 if my_alive else 0.5
+    if not my_alive:
+        return 0.0
+    my_hp = sum(god.hp + 2 for god in my_team if god.alive)
+    opp_hp = sum(god.hp + 2 for god in opp_team if god.alive)
+    return my_hp / (my_hp + opp_hp)
+
+
+class MCTSBot:
+    """
+    Monte Carlo tree search over the picks of the current and following turns.
+    Every iteration replays the turn from a TurnRecord on cloned teams with the headless
+    engine, walks the tree with UCT, then finishes with random picks for up to
+    `rollout_turns` turns. Search stops when the wall-clock budget is spent.
+    """
+
+    def __init__(self, time_budget: float = Config.MCTS_TIME_BUDGET,
+                 rollout_turns: int = Config.MCTS_ROLLOUT_TURNS):
+        self.time_budget = time_budget
+        self.rollout_turns = rollout_turns
+        self.iterations = 0
+
+    def choose(self, ctx, record: TurnRecord):
+        """Return the god of ctx.select with the most visits at the root."""
+        # The picked god comes from the team the prompt shows first (the opponents for "attack")
+        prompt_team = ctx.opp_team if ctx.action_text == "attack" else ctx.my_team
+        options = [prompt_team.index(god) for god in ctx.select if god in prompt_team]
+        if len(options) <= 1:
+            return ctx.select[0] if ctx.select else None
+
+        root = _Node()
+        deadline = time.perf_counter() + self.time_budget
+        self.iterations = 0
+        while time.perf_counter() < deadline:
+            try:
+                self._iterate(root, record, options)
+            except Exception as e:
+                logger.debug(f"MCTS iteration failed: {e}")
+            self.iterations += 1
+
+        visited = [(root.children[i].visits, i) for i in options if i in root.children]
+        if not visited:
+            return random.choice(ctx.select)
+        _, best = max(visited)
+        return prompt_team[best]
+
+    def _iterate(self, root: _Node, record: TurnRecord, root_options: list[int]):
+        from simulation.engine import execute_turn
+
+        teams = (clone_team(record.attack_team), clone_team(record.defend_team))  # side 0 is the bot
+        forced = list(record.picks)
+        path = []  # (node, side that picked it)
+        state = {"node": root, "at_root": True}
+
+        def chooser(side: int):
+            def choose(team1, team2, selectable, action_text):
+                if not selectable:
+                    return None
+                if forced:
+                    index = forced.pop(0)
+                    god = team1[index] if index < len(team1) else None
+                    return god if god in selectable else random.choice(selectable)
+
+                node = state["node"]
+                if node is None:
+                    return random.choice(selectable)  # rollout
+
+                options = [team1.index(god) for god in selectable]
+                if state["at_root"]:
+                    state["at_root"] = False
+                    options = [i for i in root_options if i < len(team1) and team1[i] in selectable] or options
+
+                unvisited = [i for i in options if i not in node.children or not node.children[i].visits]
+                if unvisited:
+                    index = random.choice(unvisited)
+                    child = node.children.setdefault(index, _Node())
+                    state["node"] = None  # expanded, the rest is a rollout
+                else:
+                    log_n = math.log(node.visits or 1)
+                    index = max(
+                        options,
+                        key=lambda i: node.children[i].value / node.children[i].visits
+                        + UCT_C * math.sqrt(log_n / node.children[i].visits)
+                    )
+                    child = node.children[index]
+                    state["node"] = child
+                path.append((child, side))
+                return team1[index]
+            return choose
+
+        ended = execute_turn(teams[0], teams[1], chooser(0))
+        turn = 1
+        while not ended and turn < self.rollout_turns:
+            side = turn % 2
+            ended = execute_turn(teams[side], teams[1 - side], chooser(side))
+            turn += 1
+
+        reward = evaluate(teams[0], teams[1])
+        root.visits += 1
+        for node, side in path:
+            node.visits += 1
+            node.value += reward if side == 0 else 1.0 - reward
@@ -0,0 +1,78 @@
+import asyncio
+import time
+import logging
+
+import discord
+
+from bot.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class MemberNameCache:
+    """
+    Display names by user id (use the `member_names` instance). Names come from the gateway
+    caches of discord.py when possible and are kept for `ttl` seconds, so a REST call is
+    only made for players that are neither cached by the gateway nor resolved recently.
+    """
+
+    def __init__(self, ttl: float = Config.MEMBER_NAME_TTL):
+        self.ttl = ttl
+        self._names = {}  # user_id -> (name, time resolved)
+        self.rest_calls = 0
+
+    def _cached(self, user_id) -> str | None:
+        entry = self._names.get(user_id)
+        if entry and time.monotonic() - entry[1] < self.ttl:
+            return entry[0]
+        return None
+
+    def _store(self, user_id, name: str) -> str:
+        self._names[user_id] = (name, time.monotonic())
+        return name
+
+    async def _fetch(self, guild: discord.Guild | None, client: discord.Client, user_id) -> str:
+        self.rest_calls += 1
+        try:
+            if guild is not None:
+                return (await guild.fetch_member(user_id)).display_name
+        except discord.NotFound:
+            pass
+        try:
+            return str(await client.fetch_user(user_id))
+        except discord.NotFound:
+            return f"User {user_id}"
+
+    async def resolve(self, guild: discord.Guild | None, client: discord.Client, user_ids: list) -> dict:
+        """{user_id: display name} for user_ids (REST calls for the remaining ones run concurrently)."""
+        names = {}
+        missing = []
+        for user_id in user_ids:
+            name = self._cached(user_id)
+            if name is None:
+                member = guild.get_member(user_id) if guild is not None else None
+                if member is not None:
+                    name = self._store(user_id, member.display_name)
+                elif (user := client.get_user(user_id)) is not None:
+                    name = self._store(user_id, str(user))
+            if name is None:
+                missing.append(user_id)
+            else:
+                names[user_id] = name
+
+        if missing:
+            results = await asyncio.gather(*(self._fetch(guild, client, uid) for uid in missing), return_exceptions=True)
+            for user_id, name in zip(missing, results):
+                if isinstance(name, Exception):
+                    logger.warning(f"Failed to resolve the name of {user_id}: {name}")
+                    names[user_id] = f"User {user_id}"  # not cached, retried next time
+                else:
+                    names[user_id] = self._store(user_id, name)
+
+        if len(self._names) > 4096:
+            now = time.monotonic()
+            self._names = {uid: e for uid, e in self._names.items() if now - e[1] < self.ttl}
+        return names
+
+
+member_names = MemberNameCache()
@@ -0,0 +1,207 @@
+import asyncio
+import bisect
+import math
+import threading
+import time
+import logging
+
+from bot.config import Config
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+TURN_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 900.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}  # label values tuple -> value
+        self._lock = threading.Lock()  # /metrics is rendered by the keep_alive thread
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels.get(name, "") for name in self.labelnames)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                    for key, value in self._values.items()]
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def replace(self, values: dict):
+        """Set every labelled value at once ({label values tuple: value}); missing labels are dropped."""
+        with self._lock:
+            self._values = dict(values)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]  # [counts per bucket, sum]
+            entry[0][bisect.bisect_left(self.buckets, value)] += 1
+            entry[1] += value
+
+    def _samples(self) -> list[str]:
+        lines = []
+        with self._lock:
+            for key, (counts, total) in self._values.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets + (math.inf,), counts):
+                    cumulative += count
+                    labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Counters, gauges and histograms of this process in the Prometheus text format (use the
+    `metrics` instance, served at /metrics by keep_alive). Recording only takes a lock and a few
+    additions, so it is safe on the hot paths. The collector task samples the event loop lag and
+    runs the `collectors` (callables refreshing gauges from the bot state) on the event loop.
+    """
+
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+        self.collectors = []
+        self._task = None
+
+    def _register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple = (),
+                  buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+    def start_collector(self, interval: float = Config.METRICS_INTERVAL):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._collect(interval))
+
+    async def _collect(self, interval: float):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + interval
+            await asyncio.sleep(interval)
+            lag = max(0.0, loop.time() - expected)
+            EVENT_LOOP_LAG.observe(lag)
+            EVENT_LOOP_LAG_LAST.set(lag)
+            for collector in self.collectors:
+                try:
+                    collector()
+                except Exception as e:
+                    logger.error(f"Metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+
+
+metrics = MetricsRegistry()
+
+TURN_SECONDS = metrics.histogram(
+    "maggod_turn_seconds", "Duration of one Maggod turn, selection prompts included.", ("player",), TURN_BUCKETS)
+SELECTION_WAIT_SECONDS = metrics.histogram(
+    "maggod_selection_wait_seconds", "Time a player took to pick a god in a turn prompt.", (), TURN_BUCKETS)
+BOT_DECISION_SECONDS = metrics.histogram(
+    "maggod_bot_decision_seconds", "Latency of the bot decisions run in the bot executor.", ("bot",))
+BOT_DECISION_FALLBACKS = metrics.counter(
+    "maggod_bot_decision_fallbacks_total", "Bot decisions replaced by the random bot.", ("bot", "reason"))
+DISCORD_HTTP_REQUESTS = metrics.counter(
+    "maggod_discord_http_requests_total", "HTTP requests sent to the Discord API.", ("method", "status"))
+DISCORD_HTTP_RATE_LIMITED = metrics.counter(
+    "maggod_discord_http_rate_limited_total", "Discord API responses with status 429.", ("scope",))
+STORE_CALL_SECONDS = metrics.histogram(
+    "maggod_store_call_seconds", "Latency of the calls to the money, save and broker stores.", ("store", "operation"))
+ACTIVE_MATCHES = metrics.gauge(
+    "maggod_active_matches", "Matches in memory by game_phase.", ("phase",))
+EVENT_LOOP_LAG = metrics.histogram(
+    "maggod_event_loop_lag_seconds", "Delay of the periodic metrics wake-up past its deadline.")
+EVENT_LOOP_LAG_LAST = metrics.gauge(
+    "maggod_event_loop_lag_last_seconds", "Last sampled event loop lag.")
+COMMANDS_USED = metrics.counter("maggod_commands_total", "Commands used.")
+MESSAGES_SEEN = metrics.counter("maggod_messages_total", "Messages seen.")
+MATCHES_STARTED = metrics.counter("maggod_matches_started_total", "Matches started.")
+MATCHES_COMPLETED = metrics.counter("maggod_matches_completed_total", "Matches completed.")
+
+
+def timed_store_call(store: str, operation: str, start: float):
+    """Record a store call that began at time.perf_counter() == start."""
+    STORE_CALL_SECONDS.observe(time.perf_counter() - start, store=store, operation=operation)
+
+
+def discord_http_trace():
+    """aiohttp TraceConfig counting the Discord API requests and 429s (passed to the bot as http_trace)."""
+    import aiohttp
+
+    async def on_request_end(session, context, params):
+        status = params.response.status
+        DISCORD_HTTP_REQUESTS.inc(method=params.method, status=status)
+        if status == 429:
+            DISCORD_HTTP_RATE_LIMITED.inc(scope=params.response.headers.get("X-RateLimit-Scope", "unknown"))
+
+    async def on_request_exception(session, context, params):
+        DISCORD_HTTP_REQUESTS.inc(method=params.method, status="error")
+
+    trace = aiohttp.TraceConfig()
+    trace.on_request_end.append(on_request_end)
+    trace.on_request_exception.append(on_request_exception)
+    return trace
@@ -0,0 +1,212 @@
+import asyncio
+import itertools
+import time
+import logging
+
+import discord
+
+from bot.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Priorities (lower goes first)
+PRIORITY_PROMPT = 0   # selection prompts a player is waiting for
+PRIORITY_RESULT = 1   # turn results, end of game, draft messages
+PRIORITY_STATUS = 2   # lobby status board and other background refreshes
+
+
+class TokenBucket:
+    """`capacity` calls at once, refilled at `capacity / window` calls per second."""
+
+    def __init__(self, capacity: int, window: float):
+        self.capacity = capacity
+        self.rate = capacity / window
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, cost: int = 1) -> float:
+        """Seconds until `cost` tokens are available (0 if they are now)."""
+        self._refill(time.monotonic())
+        missing = min(cost, self.capacity) - self.tokens
+        return max(0.0, missing / self.rate)
+
+    def take(self, cost: int = 1):
+        self._refill(time.monotonic())
+        self.tokens -= min(cost, self.capacity)
+
+
+class _Job:
+    __slots__ = ("priority", "seq", "channel_id", "factory", "key", "cost", "futures", "queued_at")
+
+    def __init__(self, priority, seq, channel_id, factory, key, cost):
+        self.priority = priority
+        self.seq = seq
+        self.channel_id = channel_id
+        self.factory = factory
+        self.key = key
+        self.cost = cost
+        self.futures = []
+        self.queued_at = time.monotonic()
+
+
+class OutboundScheduler:
+    """
+    Single queue for the channel messages of the bot (use the `outbound` instance).
+    Calls wait for a token of their channel's bucket and of the global bucket, run by
+    priority, and calls queued with the same `key` (e.g. edits of one message) are
+    coalesced: only the latest one is made and every caller gets its result.
+    """
+
+    def __init__(self, channel_limit: int = Config.CHANNEL_RATE_LIMIT, channel_window: float = Config.CHANNEL_RATE_WINDOW,
+                 global_limit: int = Config.GLOBAL_RATE_LIMIT):
+        self.channel_limit = channel_limit
+        self.channel_window = channel_window
+        self.global_bucket = TokenBucket(global_limit, 1.0)
+        self._buckets: dict[int, TokenBucket] = {}
+        self._pending: list[_Job] = []
+        self._by_key: dict = {}
+        self._seq = itertools.count()
+        self._wakeup = None
+        self._worker = None
+
+        self.calls = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.total_wait = 0.0
+        self.max_queue = 0
+
+    # ----------------- API -----------------
+    async def call(self, channel_id: int, factory, priority: int = PRIORITY_RESULT, key=None, cost: int = 1):
+        """Run `factory()` (a coroutine function making `cost` HTTP calls in the channel) and return its result."""
+        future = asyncio.get_running_loop().create_future()
+        job = self._by_key.get(key) if key is not None else None
+        if job is not None:
+            # Same target still queued: keep its place in the queue, make only the latest call
+            job.factory = factory
+            job.priority = min(job.priority, priority)
+            self.coalesced += 1
+        else:
+            job = _Job(priority, next(self._seq), channel_id, factory, key, cost)
+            self._pending.append(job)
+            if key is not None:
+                self._by_key[key] = job
+            self.max_queue = max(self.max_queue, len(self._pending))
+        job.futures.append(future)
+        self._wake()
+        return await future
+
+    async def send(self, channel, priority: int = PRIORITY_RESULT, **kwargs):
+        return await self.call(channel.id, lambda: channel.send(**kwargs), priority)
+
+    async def edit(self, message, priority: int = PRIORITY_RESULT, **kwargs):
+        """Edit a message; queued edits of the same message are coalesced."""
+        return await self.call(message.channel.id, lambda: message.edit(**kwargs), priority,
+                               key=("edit", message.id))
+
+    async def delete(self, message, priority: int = PRIORITY_RESULT):
+        return await self.call(message.channel.id, message.delete, priority, key=("delete", message.id))
+
+    def headroom(self, channel_id: int) -> int:
+        """Calls the channel can make right now without waiting."""
+        bucket = self._bucket(channel_id)
+        bucket.wait_time()  # refresh the tokens
+        return int(bucket.tokens)
+
+    # ----------------- WORKER -----------------
+    def _wake(self):
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        self._wakeup.set()
+
+    def _bucket(self, channel_id) -> TokenBucket:
+        bucket = self._buckets.get(channel_id)
+        if bucket is None:
+            bucket = self._buckets[channel_id] = TokenBucket(self.channel_limit, self.channel_window)
+        return bucket
+
+    def _next_job(self) -> tuple[_Job | None, float]:
+        """Best job that can run now, or the time until one can."""
+        delay = None
+        global_wait = self.global_bucket.wait_time()
+        for job in sorted(self._pending, key=lambda j: (j.priority, j.seq)):
+            wait = max(global_wait, self._bucket(job.channel_id).wait_time(job.cost))
+            if wait == 0:
+                return job, 0.0
+            delay = wait if delay is None else min(delay, wait)
+        return None, delay or 0.0
+
+    async def _run(self):
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            job, delay = self._next_job()
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    # New jobs may be runnable earlier (other channel / higher priority)
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self._pending.remove(job)
+            if job.key is not None:
+                self._by_key.pop(job.key, None)
+            self._bucket(job.channel_id).take(job.cost)
+            self.global_bucket.take(job.cost)
+            self.total_wait += time.monotonic() - job.queued_at
+            asyncio.get_running_loop().create_task(self._execute(job))
+
+    async def _execute(self, job: _Job):
+        self.calls += 1
+        try:
+            result = await job.factory()
+        except Exception as e:
+            self.errors += 1
+            if isinstance(e, discord.HTTPException) and e.status == 429:
+                self.rate_limited += 1
+            for future in job.futures:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for future in job.futures:
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            # Drop the buckets of idle channels
+            if len(self._buckets) > 1024:
+                self._buckets = {cid: b for cid, b in self._buckets.items() if b.wait_time(b.capacity) > 0}
+
+    def get_stats_dict(self) -> dict:
+        done = self.calls or 1
+        return {
+            "calls": self.calls,
+            "queued": len(self._pending),
+            "max_queue": self.max_queue,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "rate_limited": self.rate_limited,
+            "avg_wait_ms": round(self.total_wait / done * 1000, 1),
+        }
+
+    def shutdown(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        for job in self._pending:
+            for future in job.futures:
+                if not future.done():
+                    future.cancel()
+        self._pending.clear()
+        self._by_key.clear()
+
+
+outbound = OutboundScheduler()
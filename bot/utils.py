@@ -1,13 +1,19 @@
+import asyncio
 import logging
 import os
+import time
 from datetime import datetime
 from bot.config import Config
 import discord
 from discord.ext import commands
  
-from database.manager import db_manager
+from bot.bot_executor import bot_executor
+from bot.outbound import outbound, PRIORITY_STATUS
+from bot.match_registry import match_registry
+from database.broker import queue_broker
+from bot.metrics import COMMANDS_USED, MESSAGES_SEEN, MATCHES_STARTED, MATCHES_COMPLETED
 
-matchmaking_dict = db_manager.load_all()
+logger = logging.getLogger(__name__)
 
 def setup_logging():
     """Set up logging configuration for the bot."""
@@ -90,43 +96,127 @@ def get_lobby_line(index: int, phase: str) -> str:
     icon = STATUS_ICONS.get(phase, "🔘")
     return f"{icon}・{name}"
 
-async def update_lobby_status_embed(bot: commands.Bot):
-    LOBBY_STATUS_CHANNEL_ID = 1394978367287066725
-    channel = bot.get_channel(LOBBY_STATUS_CHANNEL_ID)
-    if not channel:
-        print(f"❌ Channel with ID {LOBBY_STATUS_CHANNEL_ID} not found.")
-        return
-
-    try:
-        await channel.purge()
-    except discord.Forbidden:
-        print("❌ Missing permissions to delete messages.")
-        return
+class LobbyStatusBoard:
+    """
+    One persistent lobby status message, edited at most once every LOBBY_STATUS_DEBOUNCE seconds.
+    Refresh requests only schedule an update; the update renders a snapshot of match_registry,
+    reuses the lines of lobbies that didn't change and skips the edit if nothing changed.
+    With several worker processes each one publishes its lobbies to the queue broker, and only
+    the worker owning the status channel's guild renders them all (polling the broker).
+    """
 
-    embed = discord.Embed(
-        title="📊 Maggod Fight - Lobby Status",
-        description="",
-        color=0x00ff00
-    )
+    TITLE = "📊 Maggod Fight - Lobby Status"
 
-    if not matchmaking_dict:
-        embed.description = "*no actif lobby.*"
-    else:
-        lines = []
-        for i, (channel_id, match) in enumerate(matchmaking_dict.items(), start=1):
-            phase = match.game_phase
+    def __init__(self, debounce: float = Config.LOBBY_STATUS_DEBOUNCE):
+        self.debounce = debounce
+        self.message = None
+        self.last_update = 0.0
+        self.last_description = None
+        self._lines = {}  # channel_id -> (index, phase, player1, player2, rendered line)
+        self._task = None
+
+    def start(self, bot: commands.Bot):
+        """Multi-worker mode: clear this worker's old summaries, and poll the others if this worker shows the board."""
+        if Config.WORKER_PROCESSES > 1:
+            self.request_refresh(bot)
+            if bot.owns_guild(Config.LOBBY_STATUS_GUILD_ID):
+                asyncio.get_running_loop().create_task(self._poll(bot))
+
+    async def _poll(self, bot: commands.Bot):
+        while True:
+            await asyncio.sleep(self.debounce)
+            self.request_refresh(bot)
+
+    def request_refresh(self, bot: commands.Bot):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._refresh_later(bot))
+
+    async def _refresh_later(self, bot: commands.Bot):
+        await asyncio.sleep(max(0.0, self.last_update + self.debounce - time.monotonic()))
+        self.last_update = time.monotonic()
+        try:
+            if Config.WORKER_PROCESSES > 1:
+                await queue_broker.publish_lobbies(bot.worker_index, self._snapshot())
+            if bot.owns_guild(Config.LOBBY_STATUS_GUILD_ID):
+                await self.refresh(bot)
+        except Exception as e:
+            logger.error(f"Failed to update the lobby status: {e}")
+
+    @staticmethod
+    def _snapshot() -> list[tuple]:
+        return [
+            (channel_id, match.game_phase, match.player1_id, match.player2_id)
+            for channel_id, match in match_registry.items()
+        ]
+
+    def _describe(self, snapshot: list[tuple]) -> str:
+        if not snapshot:
+            self._lines.clear()
+            return "*no actif lobby.*"
+
+        lines = {}
+        for i, (channel_id, phase, player1_id, player2_id) in enumerate(snapshot, start=1):
+            cached = self._lines.get(channel_id)
+            if cached and cached[:4] == (i, phase, player1_id, player2_id):
+                lines[channel_id] = cached
+                continue
             lobby_line = get_lobby_line(i, phase)
 
-            player1 = f"<@{match.player1_id}>" if match.player1_id else "👤 empty"
-            player2 = f"<@{match.player2_id}>" if match.player2_id else "👤 empty"
+            player1 = f"<@{player1_id}>" if player1_id else "👤 empty"
+            player2 = f"<@{player2_id}>" if player2_id else "👤 empty"
             players_text = f"{player1}\n{player2}"
 
             # Chaque lobby en une seule ligne + joueurs en dessous
-            lines.append(f"**{lobby_line}**\n{players_text}")
+            lines[channel_id] = (i, phase, player1_id, player2_id, f"**{lobby_line}**\n{players_text}")
+        self._lines = lines
+        return "\n\n".join(line[4] for line in lines.values())
+
+    async def _find_message(self, channel, bot: commands.Bot):
+        """Reuse the status message posted before a restart (one small history read, once)."""
+        async for message in channel.history(limit=20):
+            if message.author == bot.user and message.embeds and message.embeds[0].title == self.TITLE:
+                return message
+        return None
+
+    async def refresh(self, bot: commands.Bot):
+        channel = bot.get_channel(Config.LOBBY_STATUS_CHANNEL_ID)
+        if not channel:
+            print(f"❌ Channel with ID {Config.LOBBY_STATUS_CHANNEL_ID} not found.")
+            return
+
+        if Config.WORKER_PROCESSES > 1:
+            snapshot = await queue_broker.fetch_lobbies()  # the lobbies of every worker
+        else:
+            snapshot = self._snapshot()
+        description = self._describe(snapshot)
+        if description == self.last_description and self.message is not None:
+            return
+
+        embed = discord.Embed(
+            title=self.TITLE,
+            description=description,
+            color=0x00ff00
+        )
 
-        embed.description = "\n\n".join(lines)
+        if self.message is None:
+            self.message = await self._find_message(channel, bot)
+        if self.message is not None:
+            try:
+                await outbound.edit(self.message, PRIORITY_STATUS, embed=embed)
+                self.last_description = description
+                return
+            except discord.NotFound:
+                self.message = None
+        self.message = await outbound.send(channel, PRIORITY_STATUS, embed=embed)
+        self.last_description = description
 
-    await channel.send(embed=embed)
+
+lobby_status_board = LobbyStatusBoard()
+
+
+async def update_lobby_status_embed(bot: commands.Bot):
+    """Schedule a (debounced) update of the lobby status message."""
+    lobby_status_board.request_refresh(bot)
 
 def format_uptime(uptime_seconds):
     """Format uptime seconds into a readable string."""
@@ -196,9 +286,8 @@ def format_god_status(god):
     
     # Format effects
     effects = []
-    for effect_name, effect_list in god.effects.items():
-        for effect in effect_list:
-            effects.append(f"{effect_name}({effect.value},{effect.duration})")
+    for effect in god.active_effects():
+        effects.append(f"{effect.key}({god.effect_values[effect]},{god.effect_durations[effect]})")
     
     effects_str = ", ".join(effects[:2]) if effects else "None"
     if len(effects) > 2:
@@ -207,7 +296,7 @@ def format_god_status(god):
     return f"{status_icon} **{god.name}** - HP: {god.hp}/{god.max_hp} | DMG: {god.dmg} | Effects: {effects_str}"
 
 class BotStats:
-    """Simple bot statistics tracker."""
+    """Simple bot statistics tracker (the counters are also exported at /metrics)."""
     
     def __init__(self):
         self.commands_used = 0
@@ -219,18 +308,22 @@ class BotStats:
     def increment_command_usage(self):
         """Increment command usage counter."""
         self.commands_used += 1
+        COMMANDS_USED.inc()
     
     def increment_message_count(self):
         """Increment message count."""
         self.messages_seen += 1
+        MESSAGES_SEEN.inc()
     
     def increment_match_started(self):
         """Increment match started counter."""
         self.matches_started += 1
+        MATCHES_STARTED.inc()
     
     def increment_match_completed(self):
         """Increment match completed counter."""
         self.matches_completed += 1
+        MATCHES_COMPLETED.inc()
     
     def get_uptime(self):
         """Get bot uptime."""
@@ -245,5 +338,7 @@ class BotStats:
             'matches_started': self.matches_started,
             'matches_completed': self.matches_completed,
             'uptime_seconds': uptime.total_seconds(),
-            'uptime_formatted': format_uptime(uptime.total_seconds())
+            'uptime_formatted': format_uptime(uptime.total_seconds()),
+            'bot_decisions': bot_executor.get_stats_dict(),
+            'outbound': outbound.get_stats_dict(),
         }
@@ -2,17 +2,85 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from bot.config import Config
-from currency.money_manager import MoneyManager
+from currency.money_manager import money_manager
+from currency.leaderboard import leaderboard
+from bot.member_names import member_names
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+class LeaderboardView(discord.ui.View):
+    """Pages of the leaderboard; names are resolved for the shown page only."""
+
+    def __init__(self, interaction: discord.Interaction):
+        super().__init__(timeout=Config.SELECTION_TIMEOUT)
+        self.interaction = interaction
+        self.page = 0
+        self.message = None
+
+    async def render(self) -> discord.Embed:
+        user_id = self.interaction.user.id
+        pages = await leaderboard.page_count()
+        self.page = max(0, min(self.page, pages - 1))
+        rows = await leaderboard.get_page(self.page)
+        names = await member_names.resolve(self.interaction.guild, self.interaction.client,
+                                           [row["user_id"] for _, row in rows])
+
+        description_lines = []
+        for idx, user in rows:
+            uid = user["user_id"]
+            balance_str = f"{int(user['balance']):,d}".replace(",", " ")
+            if uid == user_id:
+                line = f"**{idx}. {names[uid]} — {balance_str} {Config.coin} 👈 You**"
+            else:
+                line = f"{idx}. {names[uid]} — {balance_str} {Config.coin}"
+            description_lines.append(line)
+
+        if all(row["user_id"] != user_id for _, row in rows):
+            rank = await leaderboard.get_rank(user_id)
+            if rank is not None:
+                balance = (await money_manager.get_balance(user_id))["balance"]
+                balance_str = f"{int(balance):,d}".replace(",", " ")
+                description_lines.append(f"\n**{rank}. {self.interaction.user.display_name} — {balance_str} {Config.coin} 👈 You**")
+
+        embed = discord.Embed(
+            title="💰 Leaderboard",
+            description="\n".join(description_lines),
+            color=discord.Color.gold()
+        )
+        embed.set_footer(text=f"Page {self.page + 1}/{pages} • Requested by {self.interaction.user.display_name}",
+                         icon_url=self.interaction.user.display_avatar.url)
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= pages - 1
+        return embed
+
+    async def _turn(self, interaction: discord.Interaction, step: int):
+        self.page += step
+        await interaction.response.edit_message(embed=await self.render(), view=self)
+
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._turn(interaction, -1)
+
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._turn(interaction, 1)
+
+    async def on_timeout(self):
+        if self.message is not None:
+            try:
+                await self.message.edit(view=None)
+            except discord.HTTPException:
+                pass
+
+
 class Balance(commands.Cog):
     """Cog for seeing player balances in Maggod Fight lobbies."""
  
     def __init__(self, bot):
         self.bot = bot
-        self.money_manager = MoneyManager()  # Initialize your MoneyManager
+        self.money_manager = money_manager  # shared async MoneyManager
 
     @app_commands.command(name="balance", description="See the leaderboard of all balances.")
     async def balance(self, interaction: discord.Interaction):
@@ -20,7 +88,6 @@ class Balance(commands.Cog):
 
         try:
             channel = interaction.channel
-            user_id = interaction.user.id
 
             if not isinstance(channel, discord.TextChannel):
                 await interaction.followup.send("❌ This command must be used in a text channel.", ephemeral=True)
@@ -34,48 +101,13 @@ class Balance(commands.Cog):
                 return
 
             # ⬇️ DB call here — if this fails, you'll catch it below
-            all_users = self.money_manager.get_balance(all=True)
-
-            if not all_users:
+            if not await leaderboard.get_page(0):
                 await interaction.followup.send("No balances found in the database.", ephemeral=True)
                 return
 
-            sorted_users = sorted(all_users, key=lambda x: x["balance"], reverse=True)
-
-            description_lines = []
-            for idx, user in enumerate(sorted_users, start=1):
-                uid = user["user_id"]
-                balance = user["balance"]
-
-                try:
-                    member = await interaction.guild.fetch_member(uid)
-                    name = member.display_name
-                except discord.NotFound:
-                    try:
-                        user_obj = await interaction.client.fetch_user(uid)
-                        name = str(user_obj)
-                    except discord.NotFound:
-                        name = f"User {uid}"
-
-                balance_str = f"{int(balance):,d}".replace(",", " ")
-
-                if uid == user_id:
-                    line = f"**{idx}. {name} — {balance_str} {Config.coin} 👈 You**"
-                else:
-                    line = f"{idx}. {name} — {balance_str} {Config.coin}"
-
-                description_lines.append(line)
-
-            description = "\n".join(description_lines)
-
-            embed = discord.Embed(
-                title="💰 Leaderboard",
-                description=description,
-                color=discord.Color.gold()
-            )
-            embed.set_footer(text=f"Requested by {interaction.user.display_name}", icon_url=interaction.user.avatar.url)
-
-            await interaction.followup.send(embed=embed, ephemeral=False)
+            view = LeaderboardView(interaction)
+            embed = await view.render()
+            view.message = await interaction.followup.send(embed=embed, view=view, ephemeral=False)
 
         except Exception as e:
             # Log the actual traceback to console so you see the real DB or logic error
@@ -2,15 +2,17 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import random
-import copy
 import logging
 import asyncio
 
-from utils.game_test_on_discord import gods as all_gods_template
+from utils.game_test_on_discord import new_gods
 from bot.utils import update_lobby_status_embed
 from bot.config import Config
 import asyncio
 from bot.bot_class import BotClass,bot_configs,TurnContext
+from bot.bot_executor import bot_executor
+from bot.outbound import outbound, PRIORITY_PROMPT
+from bot.locks import channel_locks
 
 logger = logging.getLogger(__name__)
 class StartChoiceView(discord.ui.View):
@@ -36,8 +38,8 @@ class StartChoiceView(discord.ui.View):
 
     @discord.ui.button(label="Skip Team Building", style=discord.ButtonStyle.red)
     async def skip_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        from bot.utils import matchmaking_dict
-        match = matchmaking_dict.get(interaction.channel.id)
+        from bot.match_registry import match_registry
+        match = match_registry.get(interaction.channel.id)
         match.DEBUG_SKIP_BUILD = True
 
         self.disable_all_buttons()
@@ -48,8 +50,8 @@ class StartChoiceView(discord.ui.View):
 
     @discord.ui.button(label="Do Team Building", style=discord.ButtonStyle.green)
     async def build_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        from bot.utils import matchmaking_dict
-        match = matchmaking_dict.get(interaction.channel.id)
+        from bot.match_registry import match_registry
+        match = match_registry.get(interaction.channel.id)
         match.DEBUG_SKIP_BUILD = False
 
         self.disable_all_buttons()
@@ -60,8 +62,8 @@ class StartChoiceView(discord.ui.View):
 
     @discord.ui.button(label="Gambling", style=discord.ButtonStyle.blurple)
     async def gambling_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        from bot.utils import matchmaking_dict
-        match = matchmaking_dict.get(interaction.channel.id)
+        from bot.match_registry import match_registry
+        match = match_registry.get(interaction.channel.id)
         if match.solo_mode: 
             match.game_phase = "gambling"
 
@@ -259,28 +261,30 @@ class BuildTeam(commands.Cog):
         #         ephemeral=True
         #     )
         #     return
-        from bot.utils import matchmaking_dict
-        match = matchmaking_dict.get(interaction.channel.id)
-        if not match or interaction.user.id not in [match.player1_id, match.player2_id]:
-            await interaction.response.send_message(
-                "❌ You are not a participant in this match.",
-                ephemeral=True
-            )
-            return
+        # checked and claimed under the lobby lock (concurrent commands of this lobby wait)
+        async with channel_locks.hold(interaction.channel.id):
+            from bot.match_registry import match_registry
+            match = match_registry.get(interaction.channel.id)
+            if not match or interaction.user.id not in [match.player1_id, match.player2_id]:
+                await interaction.response.send_message(
+                    "❌ You are not a participant in this match.",
+                    ephemeral=True
+                )
+                return
 
-        if not match or match.game_phase != "ready":
-            await interaction.response.send_message(
-                f"❌ You can't use this command now (required phase: ready).",
-                ephemeral=True
-            )
-            return
-        if match.start_view:
-            await interaction.response.send_message(
-                f"❌ You can't use this command now, opponent is choosing.",
-                ephemeral=True
-            )
-            return
-        match.start_view = True
+            if not match or match.game_phase != "ready":
+                await interaction.response.send_message(
+                    f"❌ You can't use this command now (required phase: ready).",
+                    ephemeral=True
+                )
+                return
+            if match.start_view:
+                await interaction.response.send_message(
+                    f"❌ You can't use this command now, opponent is choosing.",
+                    ephemeral=True
+                )
+                return
+            match.start_view = True
         # start
         await interaction.response.defer(ephemeral=False)  # or ephemeral=True if needed
 
@@ -288,15 +292,13 @@ class BuildTeam(commands.Cog):
         channel_id = channel.id
 
         # Import here to avoid circular imports
-        from bot.utils import matchmaking_dict
-        from utils.game_test_on_discord import gods as all_gods_template
+        from bot.match_registry import match_registry
 
-        match = matchmaking_dict.get(channel_id)
+        match = match_registry.get(channel_id)
 
-        # Common setup for both modes
-        match.gods = copy.deepcopy(all_gods_template)
-        match.gods = list(match.gods.values())
-        match.available_gods = copy.deepcopy(match.gods)
+        # Common setup for both modes (fresh gods, the template is never modified)
+        match.gods = new_gods()
+        match.available_gods = list(match.gods)
         if match.solo_mode:
             match.teams = {
                 match.player1_id: [],
@@ -314,12 +316,10 @@ class BuildTeam(commands.Cog):
         try:
             await asyncio.wait_for(view.choice_made.wait(), timeout=860)
         except asyncio.TimeoutError:
-            await channel.send("⏱️ Selection timed out. Match has been reset.")
-            match = matchmaking_dict[channel.id]
+            await outbound.send(channel, content="⏱️ Selection timed out. Match has been reset.")
             match.game_phase = "Waiting for first player"
             # Reset the match
-            if channel.id in matchmaking_dict:
-                del matchmaking_dict[channel.id]
+            match_registry.remove(channel.id)
             return None
         
          # 📱 Ask user what view mode they want (normal or compact)
@@ -392,7 +392,7 @@ class BuildTeam(commands.Cog):
         match.next_picker = random.choice([match.player1_id, match.player2_id])
         match.teams_initialized = True
         match.game_phase = "building"
-        #asyncio.create_task(update_lobby_status_embed(self.bot))
+        await update_lobby_status_embed(self.bot)
 
         logger.info(f"Team building started in channel {channel_id}")
 
@@ -426,8 +426,8 @@ class BuildTeam(commands.Cog):
         "current_player": match.next_picker,
         "turn_number": 1
         }
-        logger.info("Current matchmaking_dict:")
-        for cid, match in matchmaking_dict.items():
+        logger.info("Current matches:")
+        for cid, match in match_registry.items():
             logger.info(f"Channel {cid}: Player1={match.player1_name} ({match.player1_id}), "
                         f"Player2={match.player2_name} ({match.player2_id}), "
                         f"Phase={match.game_phase}")
@@ -456,55 +456,60 @@ class BuildTeam(commands.Cog):
         #         ephemeral=True
         #     )
         #     return
-        from bot.utils import matchmaking_dict
-        match = matchmaking_dict.get(interaction.channel.id)
-        if match is None:
-            logger.warning(f"Match not found for channel {interaction.channel.id} during /choose by {interaction.user.id}")
-            await interaction.response.send_message(
-                "❌ This match no longer exists in this channel.",
-                ephemeral=True
-            )
-            return
+        # checked and claimed under the lobby lock (concurrent commands of this lobby wait)
+        async with channel_locks.hold(interaction.channel.id):
+            from bot.match_registry import match_registry
+            match = match_registry.get(interaction.channel.id)
+            if match is None:
+                logger.warning(f"Match not found for channel {interaction.channel.id} during /choose by {interaction.user.id}")
+                await interaction.response.send_message(
+                    "❌ This match no longer exists in this channel.",
+                    ephemeral=True
+                )
+                return
 
-        if interaction.user.id not in [match.player1_id, match.player2_id]:
-            await interaction.response.send_message(
-                "❌ You are not a participant in this match.",
-                ephemeral=True
-            )
-            return
+            if interaction.user.id not in [match.player1_id, match.player2_id]:
+                await interaction.response.send_message(
+                    "❌ You are not a participant in this match.",
+                    ephemeral=True
+                )
+                return
 
-        if not match or match.game_phase != "building":
-            await interaction.response.send_message(
-                f"❌ You can't use this command now (required phase: building).",
-                ephemeral=True
-            )
-            return
+            if not match or match.game_phase != "building":
+                await interaction.response.send_message(
+                    f"❌ You can't use this command now (required phase: building).",
+                    ephemeral=True
+                )
+                return
         
-        if match and match.turn_in_progress:
-            await interaction.response.send_message(
-                "❌ A turn is already in progress. Please choose a god.",
-                ephemeral=True
-            )
-            return
+            if match and match.turn_in_progress:
+                await interaction.response.send_message(
+                    "❌ A turn is already in progress. Please choose a god.",
+                    ephemeral=True
+                )
+                return
 
-        # start
-        if not interaction.response.is_done():
-            try:
-                await interaction.response.defer(ephemeral=False)  # or ephemeral=True if needed
-            except discord.NotFound:
-                logger.warning("Interaction expired before defer in /choose")            
-        channel_id = channel.id
+            # start
+            if not interaction.response.is_done():
+                try:
+                    await interaction.response.defer(ephemeral=False)  # or ephemeral=True if needed
+                except discord.NotFound:
+                    logger.warning("Interaction expired before defer in /choose")            
+            channel_id = channel.id
  
-        # Import here to avoid circular imports
-        from bot.utils import matchmaking_dict
+            # Import here to avoid circular imports
+            from bot.match_registry import match_registry
 
-        match = matchmaking_dict.get(channel_id)
+            match = match_registry.get(channel_id)
 
-        match.turn_in_progress = True
+            match.turn_in_progress = True
 
         while match.turn_in_progress and match:
             if match.solo_mode and match.next_picker == 123:
-                chosen = BotClass(match.ai_bot_name).choose_god(TurnContext(match.available_gods))
+                chosen = await bot_executor.choose_god(
+                    match.ai_bot_name,
+                    TurnContext(match.available_gods, match.teams.get(123, []), match.teams.get(match.player1_id, []))
+                )
                 match.teams.setdefault(123, []).append(chosen)
                 match.picked_gods.setdefault(123, []).append(chosen.name)
                 match.available_gods = [g for g in match.available_gods if g.name != chosen.name]
@@ -532,7 +537,7 @@ class BuildTeam(commands.Cog):
                 )
                 
                 # Send the embed with the view
-                msg = await interaction.channel.send(embed=embed, view=view)
+                msg = await outbound.send(interaction.channel, PRIORITY_PROMPT, embed=embed, view=view)
 
                 # Set whether to delete the UI after selection
                 delete_UI = True
@@ -547,7 +552,7 @@ class BuildTeam(commands.Cog):
                 # Optionally delete the message
                 if delete_UI:
                     try:
-                        await msg.delete()
+                        await outbound.delete(msg)
                     except discord.NotFound:
                         pass
 
@@ -559,8 +564,8 @@ class BuildTeam(commands.Cog):
                         ephemeral=True
                     )
                     match.game_phase = "Waiting for first player"
-                    #asyncio.create_task(update_lobby_status_embed(self.bot))
-                    del matchmaking_dict[channel_id]
+                    await update_lobby_status_embed(self.bot)
+                    match_registry.remove(channel_id)
                     logger.info(f"Match timed out in channel {channel_id}")
                     return
 
@@ -582,13 +587,13 @@ class BuildTeam(commands.Cog):
 
             if len(p1_team) == 5 and len(p2_team) == 5:
                 match.game_phase = "playing"
-                #asyncio.create_task(update_lobby_status_embed(self.bot))
-                await channel.send("✅ **Both teams are complete! Let the battle begin!**")
+                await update_lobby_status_embed(self.bot)
+                await outbound.send(channel, content="✅ **Both teams are complete! Let the battle begin!**")
                 await self.show_teams(channel, match)
                 if match.solo_mode:
-                    await channel.send(f"<@{match.player1_id}>, use `/do` to start the fight.")
+                    await outbound.send(channel, content=f"<@{match.player1_id}>, use `/do` to start the fight.")
                 else:
-                    await channel.send(f"<@{match.next_picker}>, use `/do` to start the fight.")
+                    await outbound.send(channel, content=f"<@{match.next_picker}>, use `/do` to start the fight.")
                 match.turn_in_progress = False
                 # Create game save after finishing team building
                 
@@ -631,11 +636,11 @@ class BuildTeam(commands.Cog):
                 inline=False
             )
 
-            await channel.send(embed=embed)
+            await outbound.send(channel, embed=embed)
             
         except Exception as e:
             logger.error(f"Error showing teams: {e}")
-            await channel.send("✅ Teams are ready! Use `/do` to start the battle.")
+            await outbound.send(channel, content="✅ Teams are ready! Use `/do` to start the battle.")
 
 async def setup(bot):
     """Setup function for the cog."""
@@ -2,220 +2,18 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import random
-import copy
 import logging
 import asyncio
  
-from utils.game_test_on_discord import gods as all_gods_template
+from utils.game_test_on_discord import new_gods
+from utils.team_assign import NAME_ORDER, assign_gods  # noqa: F401 (NAME_ORDER kept importable here)
+from utils.odds import true_gain, get_odds_table, GAMBLING_BOTS
 from bot.utils import update_lobby_status_embed
 from bot.config import Config
 import asyncio
 logger = logging.getLogger(__name__)
 
-# canonical best->worst order you provided
-NAME_ORDER = [
-    "athena", "hephaestus", "hera", "megaera", "poseidon", "alecto", "hecate",
-    "aphrodite", "charon", "ares", "thanatos", "persephone", "artemis", "tisiphone",
-    "hades_uw", "apollo", "hermes", "cerberus", "zeus", "hades_ow"
-]
-
-def assign_gods(match, your_var: int, enemy_var: int, start_random: bool = True, rng=random):
-    """
-    Assigns gods to match.teams based on your_var and enemy_var.
-    - match.gods must be a list of God instances (match.gods = list(match.gods.values()))
-    - match.available_gods must be a copy of match.gods (mutable)
-    - your_var, enemy_var in [-5,5]. Positive -> that many good; negative -> that many bad.
-    - Returns (team_p1, team_p2) where each is a list of God instances (len == 5).
-    - Side: player1 = match.player1_id, player2 = match.player2_id.
-    - start_random: if True, starting picker is random between player1 and player2.
-    """
-    # --- validation ---
-    if not (-5 <= your_var <= 5 and -5 <= enemy_var <= 5):
-        raise ValueError("your_var and enemy_var must be between -5 and 5")
-
-    # Prepare ordered_all according to NAME_ORDER
-    all_objs = list(getattr(match, "gods", []))  # list of God instances
-    name_to_god = {g.name: g for g in all_objs}
-    ordered_all = []
-    for name in NAME_ORDER:
-        if name in name_to_god:
-            ordered_all.append(name_to_god[name])
-        else:
-            logger.warning("Expected god name '%s' missing from match.gods", name)
-    # append any gods that exist in match.gods but were not in NAME_ORDER
-    for g in all_objs:
-        if g.name not in NAME_ORDER:
-            ordered_all.append(g)
-
-    # Working pools
-    all_pool = ordered_all.copy()
-    good_pool = []
-    bad_pool = []
-
-    # Compute how many good/bad we need in pools (defaults to 7 each)
-    positive_sum = max(0, your_var) + max(0, enemy_var)
-    negative_sum = abs(min(0, your_var)) + abs(min(0, enemy_var))
-    good_size = max(7, positive_sum)
-    bad_size = max(7, negative_sum)
-
-    # Build good_pool from top (best) in order
-    i = 0
-    while len(good_pool) < good_size and i < len(ordered_all):
-        candidate = ordered_all[i]
-        if candidate not in good_pool:
-            good_pool.append(candidate)
-        i += 1
-
-    # Build bad_pool from bottom (worst) in order, skipping any already taken by good_pool
-    j = 1
-    while len(bad_pool) < bad_size and j <= len(ordered_all):
-        candidate = ordered_all[-j]
-        if candidate not in bad_pool and candidate not in good_pool:
-            bad_pool.append(candidate)
-        j += 1
-
-    # Sanity clamp: ensure pools don't exceed available gods
-    # (if pools cover almost all gods, it's okay — there are 20 total)
-    # NOTE: we do not remove pool elements from all_pool now; removals happen when a god is chosen.
-
-    # Prepare team containers (store God instances)
-    p1 = match.player1_id
-    p2 = match.player2_id
-    team_p1 = []
-    team_p2 = []
-
-    # Compute per-player special needs and types
-    def special_info(var):
-        if var > 0:
-            return ("good", var)
-        elif var < 0:
-            return ("bad", abs(var))
-        else:
-            return (None, 0)
-
-    p1_type, p1_need = special_info(your_var)
-    p2_type, p2_need = special_info(enemy_var)
-
-    # Helper: pick and remove from pools + all_pool
-    def pick_from_pool(pool_list):
-        """Pick random from pool_list; remove from pool_list and from all_pool; return picked instance or None."""
-        if not pool_list:
-            return None
-        chosen = rng.choice(pool_list)
-        # remove from pool_list
-        pool_list.remove(chosen)
-        # also remove from all_pool if present
-        if chosen in all_pool:
-            all_pool.remove(chosen)
-        # also ensure removed from the other pool if present
-        if chosen in good_pool:
-            try: good_pool.remove(chosen)
-            except ValueError: pass
-        if chosen in bad_pool:
-            try: bad_pool.remove(chosen)
-            except ValueError: pass
-        return chosen
-
-    def pick_from_all_pool():
-        if not all_pool:
-            return None
-        chosen = rng.choice(all_pool)
-        all_pool.remove(chosen)
-        # remove from special pools if present
-        if chosen in good_pool:
-            try: good_pool.remove(chosen)
-            except ValueError: pass
-        if chosen in bad_pool:
-            try: bad_pool.remove(chosen)
-            except ValueError: pass
-        return chosen
-
-    # Alternating picks to satisfy specials
-    current = rng.choice([p1, p2]) if start_random else p1
-    # Loop until both special needs are zero
-    while p1_need > 0 or p2_need > 0:
-        if current == p1:
-            if p1_need > 0:
-                if p1_type == "good":
-                    chosen = pick_from_pool(good_pool)
-                    if chosen is None:
-                        # fallback to all_pool
-                        chosen = pick_from_all_pool()
-                else:  # bad
-                    chosen = pick_from_pool(bad_pool)
-                    if chosen is None:
-                        chosen = pick_from_all_pool()
-                if chosen:
-                    team_p1.append(chosen)
-                    p1_need -= 1
-            # else: nothing this turn
-            current = p2
-        else:  # current == p2
-            if p2_need > 0:
-                if p2_type == "good":
-                    chosen = pick_from_pool(good_pool)
-                    if chosen is None:
-                        chosen = pick_from_all_pool()
-                else:  # bad
-                    chosen = pick_from_pool(bad_pool)
-                    if chosen is None:
-                        chosen = pick_from_all_pool()
-                if chosen:
-                    team_p2.append(chosen)
-                    p2_need -= 1
-            current = p1
-
-    # Now fill remaining slots until each team has 5, alternating
-    # (continue alternating from current)
-    while len(team_p1) < 5 or len(team_p2) < 5:
-        if current == p1:
-            if len(team_p1) < 5:
-                chosen = pick_from_all_pool()
-                if chosen is None:
-                    break  # no more gods
-                team_p1.append(chosen)
-            current = p2
-        else:
-            if len(team_p2) < 5:
-                chosen = pick_from_all_pool()
-                if chosen is None:
-                    break
-                team_p2.append(chosen)
-            current = p1
-
-    # Final shuffle of each team's order
-    rng.shuffle(team_p1)
-    rng.shuffle(team_p2)
-
-    # Save to match.teams (God instances)
-    match.teams = {
-        match.player1_id: team_p1,
-        match.player2_id: team_p2
-    }
-
-    # Remove assigned gods from match.available_gods if present
-    try:
-        remaining = [g for g in getattr(match, "available_gods", []) if g not in (team_p1 + team_p2)]
-        match.available_gods = remaining
-    except Exception:
-        # If match.available_gods doesn't exist or is not a list, ignore
-        logger.debug("Could not update match.available_gods; check structure.")
-
-    return team_p1, team_p2
-
-# --- Gain function ---
-def true_gain(v, bet, wealth, reduction_neg=0.5, reduction_pos=0.2):
-    fraction = bet / wealth
-    if v > 0:
-        base = bet * (89 - 8 * v) / 90.0
-        scale = 1 - fraction * reduction_pos
-    elif v == 0:
-        base = bet
-        scale = 1 - fraction * reduction_pos
-    else:  # v < 0
-        base = bet * (-v + 1)
-        scale = 1 - fraction * reduction_neg
-    return round((base * scale)+100)  # only the gain
+GAMBLING_BOT = GAMBLING_BOTS[0]  # the bot gambling matches are played against
 
 
 class GamblingView(discord.ui.View):
@@ -241,8 +39,9 @@ class GamblingView(discord.ui.View):
         self.add_item(self.StartButton(self))
 
     async def update_message(self, interaction: discord.Interaction):
-        v = self.your_var + self.enemy_var
-        gain = true_gain(v, self.bet, self.wealth)
+        gain = true_gain(self.your_var, self.enemy_var, self.bet, self.wealth, GAMBLING_BOT)
+        table = get_odds_table()
+        win_chance = table.win_probability(self.your_var, self.enemy_var, GAMBLING_BOT) if table else None
 
         embed = discord.Embed(
             title="🎲 Gambling Menu",
@@ -269,6 +68,8 @@ class GamblingView(discord.ui.View):
             value=f"{int(gain):,d}".replace(",", " "),
             inline=False
         )
+        if win_chance is not None:
+            embed.add_field(name="Win Chance", value=f"{win_chance:.0%}", inline=False)
         await interaction.response.edit_message(embed=embed, view=self)
 
     def add_button_row(self, values, team, positive, group_name, row):
@@ -393,8 +194,8 @@ class Gambling(commands.Cog):
         #         ephemeral=True
         #     )
         #     return
-        from bot.utils import matchmaking_dict
-        match = matchmaking_dict.get(interaction.channel.id)
+        from bot.match_registry import match_registry
+        match = match_registry.get(interaction.channel.id)
         if not match or interaction.user.id not in [match.player1_id, match.player2_id]:
             await interaction.response.send_message(
                 "❌ You are not a participant in this match.",
@@ -412,9 +213,9 @@ class Gambling(commands.Cog):
 
         channel = interaction.channel
         channel_id = channel.id
-        from currency.money_manager import MoneyManager
-        money_manager = MoneyManager()
-        wealth_data = money_manager.get_balance(user_id=match.player1_id)
+        from currency.money_manager import money_manager
+        # read from the store: another worker process may have changed the balance in the last MONEY_CACHE_TTL
+        wealth_data = await money_manager.get_balance(user_id=match.player1_id, fresh=True)
         wealth = wealth_data["balance"]
         if wealth<100:
             wealth =100
@@ -436,9 +237,8 @@ class Gambling(commands.Cog):
         await view.wait()
 
         # Import here to avoid circular imports
-        from bot.utils import matchmaking_dict
-        from utils.game_test_on_discord import gods as all_gods_template
-        match = matchmaking_dict.get(channel_id)
+        from bot.match_registry import match_registry
+        match = match_registry.get(channel_id)
 
         # Retrieve result
         result = getattr(view, "result", None)
@@ -448,22 +248,21 @@ class Gambling(commands.Cog):
             enemy_var = result["enemy_var"]
 
             # Compute gain
-            gain = true_gain(your_var + enemy_var, bet, wealth)
+            gain = true_gain(your_var, enemy_var, bet, wealth, GAMBLING_BOT)
 
             # Store in match
             match.gamb_bet = bet
             match.gamb_gain = gain
 
-        match.gods = copy.deepcopy(all_gods_template)
-        match.gods = list(match.gods.values())
-        match.available_gods = copy.deepcopy(match.gods)
+        match.gods = new_gods()
+        match.available_gods = list(match.gods)
         team_p1, team_p2 = assign_gods(match, your_var, -enemy_var, start_random=True)
 
         match.teams_initialized = True
         match.game_phase = "playing"
         match.money_sys_type = "gambling"
 
-        match.ai_bot_name = "bot_overloard"
+        match.ai_bot_name = GAMBLING_BOT
 
         match.turn_state = {
             "current_player": random.choice([match.player1_id, match.player2_id]),
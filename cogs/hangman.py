@@ -4,7 +4,7 @@ from discord.ext import commands
 from discord import app_commands
 import logging
 from bot.config import Config
-from currency.money_manager import MoneyManager
+from currency.money_manager import money_manager
 
 logger = logging.getLogger(__name__)
 
@@ -12,7 +12,7 @@ logger = logging.getLogger(__name__)
 class Hangman(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.manager = MoneyManager()
+        self.manager = money_manager
         self.last_messages = {}  # user_id -> discord.Message (to delete old ephemeral views)
 
     @app_commands.command(name="hangman", description="Open hangman menu")
@@ -29,9 +29,9 @@ class Hangman(commands.Cog):
             return
 
         user_id = interaction.user.id
-        player_data = self.manager.get_balance(user_id)
+        player_data = await self.manager.get_balance(user_id)
         player_word = player_data["words"] if isinstance(player_data, dict) and "words" in player_data else None
-        all_players = self.manager.get_balance(all=True)
+        all_players = await self.manager.get_balance(all=True)
         any_word_exists = any(u.get("words") not in (None, "", "none") for u in all_players)
 
         view = HangmanMainView(self.manager, player_word, any_word_exists, self.bot, self)
@@ -101,8 +101,8 @@ class WordModal(discord.ui.Modal, title="Create Your Hangman Word"):
             )
             return
 
-        self.manager.set_words(self.user_id, f"{word} : ")
-        self.manager.update_balance(self.user_id, 500)  # ✅ reward for creating a word
+        await self.manager.set_words(self.user_id, f"{word} : ")
+        await self.manager.update_balance(self.user_id, 500)  # ✅ reward for creating a word
         await interaction.response.send_message(f"✅ Your word **'{word}'** has been saved! (+500💰)", ephemeral=True)
 
 
@@ -120,7 +120,7 @@ class PlayButton(discord.ui.Button):
     async def callback(self, interaction: discord.Interaction):
         user_id = interaction.user.id
         # Prevent players who have not made a word from guessing
-        player_data = self.manager.get_balance(user_id)
+        player_data = await self.manager.get_balance(user_id)
         player_word = player_data.get("words") if isinstance(player_data, dict) else None
         if not player_word or player_word.lower() in ("none", ""):
             await interaction.response.send_message(
@@ -129,7 +129,7 @@ class PlayButton(discord.ui.Button):
             )
             return
 
-        all_players = self.manager.get_balance(all=True)
+        all_players = await self.manager.get_balance(all=True)
         valid_players = [
             u for u in all_players if u.get("words") not in (None, "", "none") and u["user_id"] != user_id
         ]
@@ -192,7 +192,7 @@ class PlayerWordButton(discord.ui.Button):
         super().__init__(label=label, style=discord.ButtonStyle.primary, row=row)
 
     async def callback(self, interaction: discord.Interaction):
-        data_text = self.manager.get_words(self.player_id)
+        data_text = await self.manager.get_words(self.player_id)
         if not data_text:
             await interaction.response.send_message("⚠️ That player has no word set.", ephemeral=True)
             return
@@ -278,7 +278,7 @@ class ChooseLetterButton(discord.ui.Button):
         user_id = self.parent_view.user_id
         manager = self.parent_view.manager
 
-        can_play, wait_seconds = manager.check_guess_rate_limit(user_id)
+        can_play, wait_seconds = await manager.check_guess_rate_limit(user_id)
 
         if not can_play:
             await interaction.response.send_message(
@@ -340,10 +340,10 @@ class LetterInputModal(discord.ui.Modal, title="Guess a Letter"):
 
         correct = any(normalize_letter(ch) == letter_lower for ch in word)
         reward = 2000 if correct else 1000
-        manager.update_balance(user_id, reward)
+        await manager.update_balance(user_id, reward)
 
         new_text = f"{word}:{''.join(self.parent_view.guessed_letters)}"
-        manager.set_words(player_id, new_text)
+        await manager.set_words(player_id, new_text)
 
         display_word = self.parent_view.get_display_word()
 
@@ -353,7 +353,7 @@ class LetterInputModal(discord.ui.Modal, title="Guess a Letter"):
         guesser_user = await self.parent_view.bot.fetch_user(user_id)
 
         # Record the guess in the cooldown system
-        self.parent_view.manager.add_player_guess_time(self.parent_view.user_id)
+        await self.parent_view.manager.add_player_guess_time(self.parent_view.user_id)
 
 
 
@@ -367,7 +367,7 @@ class LetterInputModal(discord.ui.Modal, title="Guess a Letter"):
         # ✅ If the word is completed
         if "_" not in display_word:
             # Mark the word as done
-            manager.set_words(player_id, None)
+            await manager.set_words(player_id, None)
 
             # Stop the view
             self.parent_view.stop()
@@ -491,10 +491,10 @@ class GuessWordModal(discord.ui.Modal, title="Guess the Word / Sentence"):
 
             correct = True
             reward = 1000 * len(guess_n)
-            manager.update_balance(user_id, reward)
+            await manager.update_balance(user_id, reward)
 
             # Update stored word with guessed letters
-            manager.set_words(player_id, f"{word}:{''.join(self.parent_view.guessed_letters)}")
+            await manager.set_words(player_id, f"{word}:{''.join(self.parent_view.guessed_letters)}")
 
             # Update display word
             display_word = self.parent_view.get_display_word()
@@ -504,7 +504,7 @@ class GuessWordModal(discord.ui.Modal, title="Guess the Word / Sentence"):
             display_word = self.parent_view.get_display_word()
             correct = False
             reward = -2000 * len(guess_n)
-            manager.update_balance(user_id, reward)
+            await manager.update_balance(user_id, reward)
 
         used_letters = self.parent_view.get_used_letters()
 
@@ -519,7 +519,7 @@ class GuessWordModal(discord.ui.Modal, title="Guess the Word / Sentence"):
 
         # Check if the full word is now revealed
         if "_" not in display_word:
-            manager.set_words(player_id, None)
+            await manager.set_words(player_id, None)
 
             # Stop the game UI
             self.parent_view.stop()
@@ -3,9 +3,8 @@ from discord.ext import commands
 from discord import app_commands
 from bot.config import Config
 import logging
-import asyncio
+from bot.locks import channel_locks
 logger = logging.getLogger(__name__)
-join_in_progress = False
 class Join(commands.Cog):
     """Cog for joining Maggod Fight lobbies."""
     
@@ -15,7 +14,6 @@ class Join(commands.Cog):
     @app_commands.command(name="join", description="Join a Maggod Lobby")
 
     async def join_lobby(self, interaction: discord.Interaction):
-        global join_in_progress
         """Join a Maggod lobby."""
         # At the start of your command
         if interaction.response.is_done():
@@ -41,34 +39,26 @@ class Join(commands.Cog):
         #         ephemeral=True
         #     )
         #     return
-        
-        if join_in_progress:
-            await interaction.response.send_message(
-                "❌ A turn is already in progress. Please choose a god.",
-                ephemeral=True
-            )
-            return
 
         if not interaction.response.is_done():
             await interaction.response.defer(ephemeral=False)
 
-        
-        join_in_progress = True
+        # joins of this lobby run one at a time, other lobbies aren't blocked
+        await channel_locks.acquire(channel.id)
         try:
             from bot.utils import update_lobby_status_embed
                 
             channel_id = channel.id
 
             # Import here to avoid circular imports
-            from main import  Match
-            from bot.utils import matchmaking_dict
+            from bot.bot_class import Match
+            from bot.match_registry import match_registry
 
             #start
-            match = matchmaking_dict.get(channel_id)
+            match = match_registry.get(channel_id)
             if not match:
                 # First player joins
-                matchmaking_dict[channel_id] = Match(player1_id=interaction.user.id)
-                match = matchmaking_dict[channel_id]
+                match = match_registry.add(channel_id, Match(player1_id=interaction.user.id))
                 match.player1_name = interaction.user.display_name
                 logger.info(f"Player {interaction.user.id} ({interaction.user.display_name}) joined in channel {channel_id}")
 
@@ -76,7 +66,7 @@ class Join(commands.Cog):
                 if hasattr(self.bot, 'stats'):
                     self.bot.stats.increment_match_started()
                 match.game_phase = "Waiting for second player"
-                #asyncio.create_task(update_lobby_status_embed(self.bot))
+                await update_lobby_status_embed(self.bot)
 
                 
                 
@@ -109,7 +99,7 @@ class Join(commands.Cog):
                     match.money_sys_type = "bot"
 
                     logger.info(f"Player {interaction.user.id} ({interaction.user.display_name}) joined as both players in channel {channel_id}")
-                    #asyncio.create_task(update_lobby_status_embed(self.bot))
+                    await update_lobby_status_embed(self.bot)
 
                     embed = discord.Embed(
                         title="🤖 Solo Match Ready!",
@@ -134,10 +124,9 @@ class Join(commands.Cog):
                 match.player2_id = interaction.user.id
                 match.started = True
                 match.game_phase = "ready"
-                match = matchmaking_dict[channel_id]
                 match.player2_name = interaction.user.display_name
                 logger.info(f"Player {interaction.user.id} ({interaction.user.display_name}) joined as Player 2 in channel {channel_id}")
-                #asyncio.create_task(update_lobby_status_embed(self.bot))
+                await update_lobby_status_embed(self.bot)
                 
                 embed = discord.Embed(
                     title="🔴 Match Ready!",
@@ -194,14 +183,13 @@ class Join(commands.Cog):
                         await interaction.followup.send(embed=embed)
                     except discord.HTTPException as e:
                         logger.warning(f"Failed to send followup: {e}")
-            logger.info("Current matchmaking_dict:")
-            for cid, match in matchmaking_dict.items():
+            logger.info("Current matches:")
+            for cid, match in match_registry.items():
                 logger.info(f"Channel {cid}: Player1={match.player1_name} ({match.player1_id}), "
                             f"Player2={match.player2_name} ({match.player2_id}), "
                             f"Phase={match.game_phase}")
         finally:
-            await asyncio.sleep(2)
-            join_in_progress = False
+            channel_locks.release(channel.id)
 
 
 async def setup(bot):
@@ -2,7 +2,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from bot.config import Config
-from bot.utils import matchmaking_dict
+from bot.match_registry import match_registry
 
 
 class LobbyManager(commands.Cog):
@@ -115,8 +115,7 @@ class LobbyManager(commands.Cog):
         lobby_channels = [ch for ch in category.channels if ch.name.startswith("⚔️-maggod-lobby-")]
 
         for ch in lobby_channels:
-            if ch.id in matchmaking_dict:
-                del matchmaking_dict[ch.id]
+            match_registry.remove(ch.id)
             await ch.delete()
 
         await interaction.followup.send(f"🗑️ Deleted {len(lobby_channels)} lobby channels and cleared matchmaking data.", ephemeral=True)
@@ -4,14 +4,16 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import logging
-from currency.money_manager import MoneyManager
+from bot.config import Config
+from currency.money_manager import money_manager
+from database.broker import queue_broker
 
 logger = logging.getLogger(__name__)
 
 # -------------------- GLOBAL STATE --------------------
-QUEUE: list[dict] = []  # {"user_id": int, "channel": TextChannel, "timeout_task": Task}
-ACTIVE_GAMES: dict[int, int] = {}  # player_id -> opponent_id
-MATCHMAKING_LOCK = asyncio.Lock()
+# The queue and the running pairs live in the queue broker, shared by every worker process
+GAME = "ttt"
+TIMEOUT_TASKS: dict[int, asyncio.Task] = {}  # user_id -> queue timeout of a player queued from this process
 
 # ======================================================
 #                        COG
@@ -19,7 +21,7 @@ MATCHMAKING_LOCK = asyncio.Lock()
 class GridGame(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.manager = MoneyManager()
+        self.manager = money_manager
 
     @app_commands.command(name="ttt", description="Play the 5×5 button game")
     async def gridgame(self, interaction: discord.Interaction):
@@ -30,9 +32,8 @@ class GridGame(commands.Cog):
         user_id = interaction.user.id
 
         # Remove from old game
-        if user_id in ACTIVE_GAMES:
-            opponent_id = ACTIVE_GAMES.pop(user_id)
-            ACTIVE_GAMES.pop(opponent_id, None)
+        opponent_id = await queue_broker.pop_active(GAME, user_id)
+        if opponent_id is not None:
             try:
                 await interaction.channel.send(
                     f"⚠️ <@{opponent_id}> has been removed from the current game because <@{user_id}> rejoined the queue."
@@ -40,38 +41,25 @@ class GridGame(commands.Cog):
             except:
                 pass
 
-        # Remove from queue if already waiting
-        for entry in QUEUE:
-            if entry["user_id"] == user_id:
-                QUEUE.remove(entry)
-                try:
-                    entry["timeout_task"].cancel()
-                except:
-                    pass
-                break
-
-        # Queue logic
-        async with MATCHMAKING_LOCK:
-            if not QUEUE:
-                timeout_task = asyncio.create_task(self.queue_timeout(user_id, interaction.channel))
-                QUEUE.append({"user_id": user_id, "channel": interaction.channel, "timeout_task": timeout_task})
-                await interaction.response.send_message("⏳ Waiting for an opponent...", ephemeral=True)
-                return
-
-            # Match found
-            entry = QUEUE.pop(0)
-            entry["timeout_task"].cancel()
-            opponent = entry["user_id"]
-
-            ACTIVE_GAMES[user_id] = opponent
-            ACTIVE_GAMES[opponent] = user_id
-
-            await interaction.response.send_message(
-                f"🎮 Match found! You're playing <@{opponent}>", ephemeral=True
-            )
-            await interaction.channel.send(
-                f"🎮 <@{opponent}> and <@{user_id}>, your 5×5 game is starting!"
-            )
+        # Queue logic (a previous queue entry of the player is replaced)
+        self.cancel_timeout(user_id)
+        entry = await queue_broker.pair_or_enqueue(GAME, user_id, interaction.channel.id)
+        if entry is None:
+            TIMEOUT_TASKS[user_id] = asyncio.create_task(self.queue_timeout(user_id, interaction.channel))
+            await interaction.response.send_message("⏳ Waiting for an opponent...", ephemeral=True)
+            return
+
+        # Match found
+        opponent = entry["user_id"]
+        self.cancel_timeout(opponent)  # no-op if the opponent queued from another process
+        await queue_broker.set_active(GAME, user_id, opponent)
+
+        await interaction.response.send_message(
+            f"🎮 Match found! You're playing <@{opponent}>", ephemeral=True
+        )
+        await interaction.channel.send(
+            f"🎮 <@{opponent}> and <@{user_id}>, your 5×5 game is starting!"
+        )
 
         # Start game
         players = [user_id, opponent]
@@ -81,16 +69,20 @@ class GridGame(commands.Cog):
         msg = await interaction.channel.send(view.get_status_text(), view=view)
         view.message = msg
 
+    @staticmethod
+    def cancel_timeout(user_id):
+        task = TIMEOUT_TASKS.pop(user_id, None)
+        if task is not None:
+            task.cancel()
+
     async def queue_timeout(self, user_id, channel):
-        await asyncio.sleep(120)
-        for entry in QUEUE:
-            if entry["user_id"] == user_id:
-                QUEUE.remove(entry)
-                try:
-                    await channel.send(f"⌛ <@{user_id}> was removed from the queue due to inactivity.")
-                except:
-                    pass
-                break
+        await asyncio.sleep(Config.ARCADE_QUEUE_TIMEOUT)
+        TIMEOUT_TASKS.pop(user_id, None)
+        if await queue_broker.leave_queue(GAME, user_id):
+            try:
+                await channel.send(f"⌛ <@{user_id}> was removed from the queue due to inactivity.")
+            except:
+                pass
 
 
 # ======================================================
@@ -200,8 +192,7 @@ class GridGameView(discord.ui.View):
             p1_money = scores[p1]
             p2_money = scores[p2]
 
-            self.manager.update_balance(p1, p1_money)
-            self.manager.update_balance(p2, p2_money)
+            await self.manager.apply_balance_deltas([(p1, p1_money), (p2, p2_money)])
 
             text = (
                 f"🏁 **Game Over!**\n\n"
@@ -209,8 +200,7 @@ class GridGameView(discord.ui.View):
                 f"<@{p2}> earns **{p2_money}**"
             )
 
-        ACTIVE_GAMES.pop(p1, None)
-        ACTIVE_GAMES.pop(p2, None)
+        await queue_broker.end_active(GAME, p1, p2)
 
         if self.message:
             await self.message.edit(content=text, view=self)
@@ -3,174 +3,179 @@ from discord.ext import commands
 from discord import app_commands
 import random
 import logging
-from typing import Optional
+from typing import Optional, NamedTuple
+from functools import lru_cache
 
 from database.manager import db_manager
-from utils.gameplay_tag import God
+from utils.gameplay_tag import (
+    God, EffectType, SHIELD_EFFECTS, DMG_BOOST_EFFECTS, MISC_EFFECTS, HP_BOOST_MASK,
+)
 from bot.utils import update_lobby_status_embed
 import asyncio
 import re
+import time
 import unicodedata
 from bot.config import Config
 from bot.bot_class import BotClass,TurnContext
-from currency.money_manager import MoneyManager
+from bot.mcts import TurnRecord
+from bot.bot_executor import bot_executor
+from bot.battle_board import BattleBoard
+from bot.outbound import outbound
+from bot.locks import channel_locks
+from bot.metrics import TURN_SECONDS, SELECTION_WAIT_SECONDS
+from currency.money_manager import money_manager
 
 logger = logging.getLogger(__name__)
 
-def apply_gambling_timeout_penalty(match, player_id: int):
+# Returned by Turn.execute_turn when a selection timed out: the match was reset and removed
+TURN_ABORTED = "aborted"
+
+async def apply_gambling_timeout_penalty(match, player_id: int):
     if match.money_sys_type != "gambling":
         return
 
     penalty = match.gamb_bet // 2
-    MoneyManager().update_balance(player_id, -penalty)
+    await money_manager.update_balance(player_id, -penalty)
     return penalty
 
 
-def create_team_embeds(team1: list, team2: list, player1_name: str, player2_name: str,action_text: str,allowed,player1_id:int,compact: bool = False) -> list[discord.Embed]:
+# ----------------- BOARD RENDERING -----------------
+# Teams are rendered from immutable snapshots of the gods, so identical boards (e.g. the
+# repeated prompts of a hermes turn) and unchanged gods come straight from the caches.
+_BOLD_DIGITS = str.maketrans("0123456789", "𝟬𝟭𝟮𝟯𝟰𝟱𝟲𝟳𝟴𝟵")
 
 
-    def visual_len(s: str) -> int:
-        """Estimate visual width of a string."""
-        width = 0
-        for c in s:
-            # Double-width for emojis and wide chars
-            if unicodedata.east_asian_width(c) in "WF":
-                width += 2
-            else:
-                width += 1
-        return width
-
-    def pad(s: str, width: int = 11) -> str:
-        """Pad string visually to match width, accounting for emoji width."""
-        vis_length = visual_len(s)
-        padding = max(0, width - vis_length)
-        return s + " " * padding
-
-    def get_shield(god) -> str:
-        icons = []
-        if "posi_shield" in god.effects:
-            icons.append(f"🔱{god.effects['posi_shield'].value}")
-        if "hep_shield" in god.effects:
-            icons.append(f"🛡️{god.effects['hep_shield'].value}")
-        if "hades_uw_shield" in god.effects:
-            icons.append(f"☠️{god.effects['hades_uw_shield'].value}")
-        return " ".join(icons)
-
-
-    def get_dmg_boost(god) -> str:
-        icons = []
-        if "ares_do_more_dmg" in god.effects:
-            val = god.effects["ares_do_more_dmg"].value
-            icons.append(f"+{val}🔥")
-        if "hades_ow_do_more_dmg" in god.effects:
-            val = god.effects["hades_ow_do_more_dmg"].value
-            icons.append(f"+{val}💥")
-        if "mega_do_less_dmg" in god.effects:
-            val = god.effects["mega_do_less_dmg"].value
-            icons.append(f"-{val}💚")
-        return " ".join(icons)
-
-
-    def get_hp_boost_icon(god) -> str:
-        icons = []
-        if "athena_more_max_hp" in god.effects:
-            icons.append("📯")
-        return " ".join(icons)
-
-
-    def get_misc_effects_icons(god) -> str:
-        icons = []
-        if "zeus_stun" in god.effects:
-            icons.append("💫")
-        if "aphro_charm" in god.effects:
-            icons.append("💘")
-        if "charon_invisible_duration" in god.effects:
-            icons.append("🧿")
-        if "tisi_freeze_timer" in god.effects:
-            icons.append("❄️")
-        if "cerberus_more_max_hp_per_visible_ally" in god.effects:
-            icons.append("🐶")
-        if "alecto_get_more_dmg" in god.effects:
-            icons.append("💢")
-        if god.reload>0:
-            icons.append(f"{god.reload}⏳")
-
-        return " ".join(icons)
-
-    def format_team(team: list) -> str:
-        if compact:
-            # shorter name, narrower column
-            max_name = 4
-            col_width = 6
-        else:
-            max_name = 10
-            col_width = 11
+class _GodView(NamedTuple):
+    name: str
+    hp: int
+    max_hp: int
+    dmg: int
+    reload: int
+    alive: bool
+    visible: bool
+    effect_mask: int
+    effect_values: tuple  # 0 for inactive effects so stale slots don't split the cache
 
-        names = [pad(god.name[:max_name], col_width) for god in team]
 
+def _god_view(god) -> _GodView:
+    mask = god.effect_mask
+    return _GodView(
+        god.name, god.hp, god.max_hp, god.dmg, god.reload, god.alive, god.visible, mask,
+        tuple(value if mask >> i & 1 else 0 for i, value in enumerate(god.effect_values)),
+    )
 
-        def bold_digits(s: str) -> str:
-            return s.translate(str.maketrans("0123456789", "𝟬𝟭𝟮𝟯𝟰𝟱𝟲𝟳𝟴𝟵"))
 
-        hp_numbers = []
-        hp_icons = []
+@lru_cache(maxsize=None)
+def _char_width(c: str) -> int:
+    # Double-width for emojis and wide chars
+    return 2 if unicodedata.east_asian_width(c) in "WF" else 1
 
-        dmg_numbers = []
-        dmg_icons = []
 
-        states = []
-        visions = []
+def visual_len(s: str) -> int:
+    """Estimate visual width of a string."""
+    return sum(map(_char_width, s))
 
-        for god in team:
-            # HP line
-            hp_str = f"{god.hp}/"
-            is_hp_boosted = (
-                "athena_more_max_hp" in god.effects or
-                "cerberus_more_max_hp_per_visible_ally" in god.effects
-            )
-            raw_max_hp = str(god.max_hp)
-            max_hp_str = bold_digits(raw_max_hp) if is_hp_boosted else raw_max_hp
-            hp_numbers.append(pad(hp_str + max_hp_str, col_width))
-            hp_icons.append(pad(get_hp_boost_icon(god) + get_shield(god), col_width))
 
-            # DMG line
-            dmg_numbers.append(pad(str(god.dmg), col_width))
-            dmg_icons.append(pad(get_dmg_boost(god), col_width))
+def pad(s: str, width: int = 11) -> str:
+    """Pad string visually to match width, accounting for emoji width."""
+    padding = max(0, width - visual_len(s))
+    return s + " " * padding
+
+
+def get_shield(god: _GodView) -> str:
+    mask = god.effect_mask
+    return " ".join(
+        f"{effect.icon}{god.effect_values[effect]}"
+        for effect in SHIELD_EFFECTS if mask & effect.bit
+    )
+
+
+def get_dmg_boost(god: _GodView) -> str:
+    mask = god.effect_mask
+    return " ".join(
+        f"{sign}{god.effect_values[effect]}{effect.icon}"
+        for effect, sign in DMG_BOOST_EFFECTS if mask & effect.bit
+    )
+
+
+def get_hp_boost_icon(god: _GodView) -> str:
+    if god.effect_mask & EffectType.ATHENA_MORE_HP.bit:
+        return EffectType.ATHENA_MORE_HP.icon
+    return ""
+
+
+def get_misc_effects_icons(god: _GodView) -> str:
+    mask = god.effect_mask
+    icons = [effect.icon for effect in MISC_EFFECTS if mask & effect.bit]
+    if god.reload>0:
+        icons.append(f"{god.reload}⏳")
+
+    return " ".join(icons)
+
+
+@lru_cache(maxsize=2048)
+def _god_cells(god: _GodView, compact: bool) -> tuple:
+    """Padded cells of one god column: name, hp, hp icons, dmg, dmg icons, state, vision, misc."""
+    if compact:
+        # shorter name, narrower column
+        max_name = 4
+        col_width = 6
+    else:
+        max_name = 10
+        col_width = 11
+
+    # HP line
+    hp_str = f"{god.hp}/"
+    is_hp_boosted = bool(god.effect_mask & HP_BOOST_MASK)
+    raw_max_hp = str(god.max_hp)
+    max_hp_str = raw_max_hp.translate(_BOLD_DIGITS) if is_hp_boosted else raw_max_hp
+
+    misc = get_misc_effects_icons(god)
+    return (
+        pad(god.name[:max_name], col_width),
+        pad(hp_str + max_hp_str, col_width),
+        pad(get_hp_boost_icon(god) + get_shield(god), col_width),
+        # DMG line
+        pad(str(god.dmg), col_width),
+        pad(get_dmg_boost(god), col_width),
+        # Status lines
+        pad("❤️" if god.alive else "💀", col_width),
+        pad("👁️" if god.visible else "👻", col_width),
+        pad(misc, col_width) if misc else "",
+    )
+
 
-            # Status lines
-            states.append(pad("❤️" if god.alive else "💀", col_width))
-            visions.append(pad("👁️" if god.visible else "👻", col_width))
+@lru_cache(maxsize=256)
+def _format_team(team: tuple, compact: bool) -> str:
+    cells = [_god_cells(god, compact) for god in team]
+    lines = ["".join(column[row] for column in cells) for row in range(7)]
 
-        misc_effects_line = "".join(pad(get_misc_effects_icons(god),width=col_width) for god in team)
+    if any(column[7] for column in cells):
+        col_width = 6 if compact else 11
+        lines.append("".join(column[7] or " " * col_width for column in cells))
 
-        lines = [
-            "".join(names),
-            "".join(hp_numbers),
-            "".join(hp_icons),
-            "".join(dmg_numbers),
-            "".join(dmg_icons),
-            "".join(states),
-            "".join(visions),
-        ]
+    return "```\n" + "\n".join(lines) + "\n```"
 
-        if any(get_misc_effects_icons(god) for god in team):
-            lines.append(misc_effects_line)
 
-        return "```\n" + "\n".join(lines) + "\n```"
+def format_team(team: list, compact: bool = False) -> str:
+    return _format_team(tuple(_god_view(god) for god in team), compact)
+
+
+def create_team_embeds(team1: list, team2: list, player1_name: str, player2_name: str,action_text: str,allowed,player1_id:int,compact: bool = False) -> list[discord.Embed]:
 
     if player2_name == "bot":
         if action_text == "attack":
             embed1 = discord.Embed(title=f"{player2_name}'s Team", color=discord.Color.red())
-            embed1.description = format_team(team1)
+            embed1.description = format_team(team1, compact)
 
             embed2 = discord.Embed(title=f"{player1_name}'s Team", color=discord.Color.green())
-            embed2.description = format_team(team2)
+            embed2.description = format_team(team2, compact)
         else:
             embed1 = discord.Embed(title=f"{player1_name}'s Team", color=discord.Color.green())
-            embed1.description = format_team(team1)
+            embed1.description = format_team(team1, compact)
 
             embed2 = discord.Embed(title=f"{player2_name}'s Team", color=discord.Color.red())
-            embed2.description = format_team(team2)
+            embed2.description = format_team(team2, compact)
         action_embed = discord.Embed(
             title=f"🎯 {player1_name} select God to {action_text.title()}",
             color=0x00ff00)
@@ -178,16 +183,16 @@ def create_team_embeds(team1: list, team2: list, player1_name: str, player2_name
         if allowed == player1_id:
             if action_text == "attack":
                 embed1 = discord.Embed(title=f"{player2_name}'s Team", color=discord.Color.red())
-                embed1.description = format_team(team1)
+                embed1.description = format_team(team1, compact)
 
                 embed2 = discord.Embed(title=f"{player1_name}'s Team", color=discord.Color.green())
-                embed2.description = format_team(team2)
+                embed2.description = format_team(team2, compact)
             else:
                 embed1 = discord.Embed(title=f"{player1_name}'s Team", color=discord.Color.green())
-                embed1.description = format_team(team1)
+                embed1.description = format_team(team1, compact)
 
                 embed2 = discord.Embed(title=f"{player2_name}'s Team", color=discord.Color.red())
-                embed2.description = format_team(team2)
+                embed2.description = format_team(team2, compact)
             action_embed = discord.Embed(
             title=f"🎯 {player1_name} select God to {action_text.title()}",
             color=0x00ff00)
@@ -195,16 +200,16 @@ def create_team_embeds(team1: list, team2: list, player1_name: str, player2_name
         else:
             if action_text == "attack":
                 embed1 = discord.Embed(title=f"{player1_name}'s Team", color=discord.Color.green())
-                embed1.description = format_team(team1)
+                embed1.description = format_team(team1, compact)
 
                 embed2 = discord.Embed(title=f"{player2_name}'s Team", color=discord.Color.red())
-                embed2.description = format_team(team2)
+                embed2.description = format_team(team2, compact)
             else:
                 embed1 = discord.Embed(title=f"{player2_name}'s Team", color=discord.Color.red())
-                embed1.description = format_team(team1)
+                embed1.description = format_team(team1, compact)
 
                 embed2 = discord.Embed(title=f"{player1_name}'s Team", color=discord.Color.green())
-                embed2.description = format_team(team2)
+                embed2.description = format_team(team2, compact)
             action_embed = discord.Embed(
                 title=f"🎯 {player2_name} select God to {action_text.title()}",
                 color=0x00ff00)
@@ -246,8 +251,8 @@ class GodSelectionView(discord.ui.View):
             for item in self.children:
                 item.disabled = True
 
-            # Edit the original message to update buttons state
-            await interaction.message.edit(view=self)
+            # Acknowledge the click and update the buttons in the same call
+            await interaction.response.edit_message(view=self)
 
             self.stop()
         button.callback = callback
@@ -265,6 +270,12 @@ class Turn(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    @staticmethod
+    def get_board(match) -> BattleBoard:
+        if match.board is None:
+            match.board = BattleBoard()
+        return match.board
+
     async def send_god_selection_prompt(
         self,
         channel: discord.TextChannel,
@@ -275,20 +286,24 @@ class Turn(commands.Cog):
         allowed_user: int
     ) -> Optional[God]:
         """Send a god selection prompt and return the selected god."""
-        from bot.utils import matchmaking_dict
+        from bot.match_registry import match_registry
 
-        match = matchmaking_dict.get(channel.id)
+        match = match_registry.get(channel.id)
         if not match:
-            await channel.send("❌ No ongoing match.")
-            del matchmaking_dict[channel.id]
+            await outbound.send(channel, content="❌ No ongoing match.")
+            match_registry.remove(channel.id)
             return None
 
 
         # Auto-select if in solo mode and it's the bot's turn
         if match.solo_mode and  match.turn_state["current_player"] == 123:
-           selected = BotClass(match.ai_bot_name).choose_god(
-    TurnContext(selectable_gods, team1, team2, action_text)
-)
+           # Decide in the bot executor so a searching bot doesn't stall the other lobbies
+           selected = await bot_executor.choose_god(
+               match.ai_bot_name,
+               TurnContext(selectable_gods, team1, team2, action_text, record=match.turn_record)
+           )
+           if match.turn_record is not None:
+               match.turn_record.add_pick(team1, selected)
            return selected
         
         compact = match.compact_mode
@@ -299,50 +314,45 @@ class Turn(commands.Cog):
         # Create selection view
         view = GodSelectionView(all_gods= team1 + team2,selectable_gods=selectable_gods, allowed_user=allowed_user,team_1=team1,compact=compact)
 
-        # Send the embed with the view
-        msg = await channel.send(embeds=embeds, view=view)
-
-        # Set whether to delete the UI after selection
-        delete_UI = True
+        # Show the prompt on the match's board message (edited in place, not re-sent)
+        await self.get_board(match).show(channel, embeds, view)
 
+        wait_start = time.perf_counter()
         try:
             # Wait for selection, timeout after 15 minutes (900s)
             await asyncio.wait_for(view.wait(), timeout=900)
         except asyncio.TimeoutError:
             # Handle timeout: no selection made
             view.selected_god = None
+        SELECTION_WAIT_SECONDS.observe(time.perf_counter() - wait_start)
 
 
-        # Optionally delete the message
-        if delete_UI:
-            try:
-                await msg.delete()
-            except discord.NotFound:
-                pass
-
+        if view.selected_god is not None and match.turn_record is not None:
+            match.turn_record.add_pick(team1, view.selected_god)
 
         if view.selected_god is None:
             # Timeout occurred
-            await channel.send("⏱️ Selection timed out. Match has been reset.")
-            match = matchmaking_dict[channel.id]
+            await outbound.send(channel, content="⏱️ Selection timed out. Match has been reset.")
             if match.money_sys_type == "gambling":
                 timed_out_player = allowed_user  # the one who failed to pick
-                loss = apply_gambling_timeout_penalty(match, timed_out_player)
+                loss = await apply_gambling_timeout_penalty(match, timed_out_player)
 
-                await channel.send(
-                    f"<@{timed_out_player}> lost {loss}{Config.coin} due to timeout."
+                await outbound.send(
+                    channel, content=f"<@{timed_out_player}> lost {loss}{Config.coin} due to timeout."
                 )
             match.game_phase = "Waiting for first player"
-            #asyncio.create_task(update_lobby_status_embed(self.bot))
+            await update_lobby_status_embed(self.bot)
             # Reset the match
-            if channel.id in matchmaking_dict:
-                del matchmaking_dict[channel.id]
+            match_registry.remove(channel.id)
             return None
 
         return view.selected_god
 
     async def execute_turn(self, channel: discord.TextChannel, attack_team: list, defend_team: list, current_player: int):
-        """Execute a complete turn for the attacking team."""
+        """
+        Execute a complete turn for the attacking team. Returns True if the game ended, False if
+        it continues and TURN_ABORTED if a selection timed out (the match is already removed).
+        """
         from utils.game_test_on_discord import (
             get_visible, get_alive, get_dead, set_first_god_visible,
             became_visible_gain_effect, action_befor_delete_effect, action_befor_die,
@@ -352,12 +362,18 @@ class Turn(commands.Cog):
         set_first_god_visible(attack_team)
         set_first_god_visible(defend_team)
 
+        # Snapshot the turn so a searching bot can replay it
+        from bot.match_registry import match_registry
+        match = match_registry.get(channel.id)
+        if match:
+            match.turn_record = TurnRecord(attack_team, defend_team)
+
         # Check if any gods are available to attack
         visible_attackers = get_visible(attack_team)
         alive_attackers = get_alive(attack_team,True)
         if not visible_attackers:
-            await channel.send("❌ No gods available to attack with. This issue is not normal please repport it")
-            return
+            await outbound.send(channel, content="❌ No gods available to attack with. This issue is not normal please repport it")
+            return False
 
         # Select attacker
         attacker = await self.send_god_selection_prompt(
@@ -365,7 +381,7 @@ class Turn(commands.Cog):
         )
         
         if not attacker:
-            return
+            return TURN_ABORTED
 
         # Select target
         visible_defenders = get_visible(defend_team)
@@ -373,18 +389,18 @@ class Turn(commands.Cog):
         # Check if any alive & visible ally has the special Cerberus effect
         buffed_ally = next(
             (god for god in defend_team
-            if "cerberus_more_max_hp_per_visible_ally" in god.effects and god.alive),
+            if god.has_effect(EffectType.CERBERUS_MORE_MAX_HP) and god.alive),
             None
             )
         attacked = buffed_ally # add message to say it was auto selected
         if buffed_ally:
-            from bot.utils import matchmaking_dict
-            match = matchmaking_dict.get(channel.id)
+            from bot.match_registry import match_registry
+            match = match_registry.get(channel.id)
             BotClass(match.ai_bot_name).choose_god(TurnContext(attack_cerbs=True))
         else:
             if not visible_defenders:
-                await channel.send("❌ No visible targets available. Turn skipped.")
-                return
+                await outbound.send(channel, content="❌ No visible targets available. Turn skipped.")
+                return False
             if attacker.name == "aphrodite":
                 alive_ennemy = get_alive(defend_team)
                 attacked = await self.send_god_selection_prompt(
@@ -396,7 +412,7 @@ class Turn(commands.Cog):
                     )
             
             if not attacked:
-                return
+                return TURN_ABORTED
 
         # Make attacker visible if not already
         if not attacker.visible:
@@ -454,6 +470,11 @@ class Turn(commands.Cog):
                                 channel, attack_team, defend_team, remaining_gods, "attack with (2nd)", current_player
                             )
 
+        if match_registry.get(channel.id) is not match:
+            return TURN_ABORTED  # an ability prompt timed out
+
+        board = self.get_board(match)
+
         # Execute the ability
         try:
             # Store HP before attack
@@ -482,17 +503,15 @@ class Turn(commands.Cog):
             else:
                 ability_message = f"{attacker.name.capitalize()} abillity is on cooldown you can use it in {attacker.reload} turns"
              
-            from bot.utils import matchmaking_dict
-            match = matchmaking_dict.get(channel.id)
+            from bot.match_registry import match_registry
+            match = match_registry.get(channel.id)
             if match.solo_mode and  match.turn_state["current_player"] == 123:
-                color = discord.Color.red()
+                marker = "🟥"
             else:
                 if current_player == match.player1_id:
-                    color = discord.Color.green()
+                    marker = "🟩"
                 else:
-                    color = discord.Color.red()
-
-            embed = discord.Embed(color=color)
+                    marker = "🟥"
 
             desc = ""
             # Case: Cerberus forces attacker
@@ -506,29 +525,32 @@ class Turn(commands.Cog):
             if ability_message:
                 desc += ability_message
 
-            embed.description = desc
-
-            await channel.send(embed=embed)
+            board.log_action(f"{marker} **Turn {match.turn_state['turn_number']}**\n{desc}")
         except Exception as e:
             logger.error(f"Error executing ability for {attacker.name}: {e}")
-            await channel.send(f"⚠️ Error executing {attacker.name}'s ability.")
+            board.log_action(f"⚠️ Error executing {attacker.name}'s ability.")
 
         # Clean up effects and handle deaths
         action_befor_delete_effect(attack_team)
         action_befor_delete_effect(defend_team)
         msg = action_befor_die(defend_team, attack_team)
         if msg:
-            await channel.send(msg)
+            board.log_action(msg)
         action_befor_delete_effect(defend_team)
         msg = action_befor_die(attack_team, defend_team)
         if msg:
-            await channel.send(msg)
+            board.log_action(msg)
         
 
         # Update effects
         for god in attack_team + defend_team:
             god.update_effects()
 
+        # One edit shows the results and the new state of both teams (prompt and buttons removed)
+        embeds = create_team_embeds(attack_team, defend_team, match.player1_name, match.player2_name,
+                                    "attack with", current_player, match.player1_id, compact=match.compact_mode)
+        await board.show(channel, embeds[1:])
+
         # Check for winner
         team1_alive = any(god.alive for god in match.teams[match.player1_id])
         team2_alive = any(god.alive for god in match.teams[match.player2_id])
@@ -541,9 +563,9 @@ class Turn(commands.Cog):
 
     async def end_game(self, channel: discord.TextChannel, team1_alive: bool, team2_alive: bool):
         """End the game and declare winner."""
-        from bot.utils import matchmaking_dict
+        from bot.match_registry import match_registry
 
-        match = matchmaking_dict.get(channel.id)
+        match = match_registry.get(channel.id)
         if not match:
             return None,True
  
@@ -611,12 +633,12 @@ class Turn(commands.Cog):
             value="Use `/join` in any lobby to start a new match!",
             inline=False
         )
-        await channel.send(embed=embed)
 
         #calculate_money:
-        money = MoneyManager()
+        money = money_manager
         gain = 0
         loss = 0
+        deltas = []  # paid out together in one atomic request
         if match.money_sys_type == "bot":
             if winner_id == 123:
                 gain -= 1000
@@ -630,10 +652,12 @@ class Turn(commands.Cog):
                 gain *= 0.5
             elif match.bot_type == "best_bot":
                 gain *= 2
+            elif match.bot_type == "mcts":
+                gain *= 15  # beats a random player 96% of the time (bot_overloard: 88%)
             else:
                 gain *= 5
             gain = round(gain)
-            p1_new_bal = money.update_balance(match.player1_id,gain)
+            deltas.append((match.player1_id, gain))
 
         elif match.money_sys_type == "2 players":
             if winner_id == match.player1_id:
@@ -641,19 +665,19 @@ class Turn(commands.Cog):
                 gain += team1_survivors * 1000
                 loss -= 2500
                 loss += (5 - team1_survivors) * 850
-                p1_new_bal = money.update_balance(match.player1_id,gain)
-                p2_new_bal = money.update_balance(match.player2_id,loss)
+                deltas.append((match.player1_id, gain))
+                deltas.append((match.player2_id, loss))
             elif winner_id == match.player2_id:
                 gain += 5000
                 gain += team2_survivors * 1000
                 loss -= 2500
                 loss += (5 - team2_survivors) * 850
-                p2_new_bal = money.update_balance(match.player2_id,gain)
-                p1_new_bal = money.update_balance(match.player1_id,loss)
+                deltas.append((match.player2_id, gain))
+                deltas.append((match.player1_id, loss))
             else:
                 gain += 5000
-                p2_new_bal = money.update_balance(match.player2_id,gain)
-                p1_new_bal = money.update_balance(match.player1_id,gain)
+                deltas.append((match.player2_id, gain))
+                deltas.append((match.player1_id, gain))
 
 
         elif match.money_sys_type == "gambling":
@@ -661,9 +685,12 @@ class Turn(commands.Cog):
                 gain = match.gamb_gain
             else:
                 gain = -match.gamb_bet
-            p1_new_bal = money.update_balance(match.player1_id,gain)
+            deltas.append((match.player1_id, gain))
+
+        balances = await money.apply_balance_deltas(deltas)
+        p1_new_bal = balances.get(match.player1_id)
+        p2_new_bal = balances.get(match.player2_id)
 
-        
         # --- Second embed: Rewards/Balance ---
         rewards_embed = discord.Embed(
             title="💰 Battle Rewards",
@@ -717,11 +744,11 @@ class Turn(commands.Cog):
             )
 
 
-        await channel.send(embed=rewards_embed)
+        await outbound.send(channel, embeds=[embed, rewards_embed])
 
 
-        del matchmaking_dict[channel.id]
-        #asyncio.create_task(update_lobby_status_embed(self.bot))
+        match_registry.remove(channel.id)
+        await update_lobby_status_embed(self.bot)
 
 
     @app_commands.command(name="do", description="Make your turn in the ongoing Maggod Fight battle.")
@@ -750,42 +777,44 @@ class Turn(commands.Cog):
         #     )
         #     return
         
-        from bot.utils import matchmaking_dict
-        match = matchmaking_dict.get(interaction.channel.id)
-        if not match or interaction.user.id not in [match.player1_id, match.player2_id]:
-            await interaction.response.send_message(
-                "❌ You are not a participant in this match.",
-                ephemeral=True
-            )
-            return
+        # checked and claimed under the lobby lock (concurrent commands of this lobby wait)
+        async with channel_locks.hold(interaction.channel.id):
+            from bot.match_registry import match_registry
+            match = match_registry.get(interaction.channel.id)
+            if not match or interaction.user.id not in [match.player1_id, match.player2_id]:
+                await interaction.response.send_message(
+                    "❌ You are not a participant in this match.",
+                    ephemeral=True
+                )
+                return
 
-        if not match or match.game_phase != "playing":
-            await interaction.response.send_message(
-                f"❌ You can't use this command now (required phase: playing).",
-                ephemeral=True
-            )
-            return
+            if not match or match.game_phase != "playing":
+                await interaction.response.send_message(
+                    f"❌ You can't use this command now (required phase: playing).",
+                    ephemeral=True
+                )
+                return
         
-        if match and match.turn_in_progress:
-            await interaction.response.send_message(
-                "❌ A turn is already in progress. Please choose a god.",
-                ephemeral=True
-            )
-            return
+            if match and match.turn_in_progress:
+                await interaction.response.send_message(
+                    "❌ A turn is already in progress. Please choose a god.",
+                    ephemeral=True
+                )
+                return
         
-        # start
-        #db_manager.create_game_save(channel.id, match)
-        # Check if it's the player's turn
-        current_player_id = match.turn_state["current_player"]
-        if interaction.user.id != current_player_id and not(match.solo_mode):
-            await interaction.response.send_message(
-                "⏳ It is not your turn yet. Please wait for your opponent.",
-                ephemeral=True
-            )
-            return
+            # start
+            db_manager.queue_game_save(channel.id, match)
+            # Check if it's the player's turn
+            current_player_id = match.turn_state["current_player"]
+            if interaction.user.id != current_player_id and not(match.solo_mode):
+                await interaction.response.send_message(
+                    "⏳ It is not your turn yet. Please wait for your opponent.",
+                    ephemeral=True
+                )
+                return
 
-        await interaction.response.defer()
-        match.turn_in_progress = True
+            await interaction.response.defer()
+            match.turn_in_progress = True
         while match.turn_in_progress and match:
             if not match:
                 break
@@ -803,7 +832,15 @@ class Turn(commands.Cog):
                     defend_team = match.teams[match.player1_id]
 
                 # Execute the turn
+                turn_start = time.perf_counter()
                 game_ended = await self.execute_turn(channel, attack_team, defend_team, match.next_picker)
+                TURN_SECONDS.observe(time.perf_counter() - turn_start,
+                                     player="bot" if match.turn_state["current_player"] == 123 else "human")
+
+                if game_ended is TURN_ABORTED or match_registry.get(channel.id) is not match:
+                    # Timed out (or the lobby was reset): the match and its save are gone, don't save it again
+                    match.turn_in_progress = False
+                    break
 
                 if not game_ended:
                     # Switch turns
@@ -814,12 +851,11 @@ class Turn(commands.Cog):
                     match.next_picker = match.player1_id if match.next_picker == match.player2_id else match.player2_id
 
                     # Update game save after each turn
-                    #db_manager.update_game_save(channel.id, match) #database
+                    db_manager.queue_game_save(channel.id, match)
                     await asyncio.sleep(4)
                 else:
                     # Delete game save after match is over
-                    pass #database
-                    #db_manager.delete_game_save(channel.id, match)
+                    db_manager.queue_delete_game_save(channel.id)
                     match.turn_in_progress = False
                     break
                 
@@ -830,15 +866,12 @@ class Turn(commands.Cog):
                     f"Both players get 5000 {Config.coin} in compensation",
                     ephemeral=True
                 )
-                #db_manager.delete_game_save(channel.id, match)
-                money = MoneyManager()
-                money.update_balance(match.player1_id,5000)
-                money.update_balance(match.player2_id,5000)
+                db_manager.queue_delete_game_save(channel.id)
+                await money_manager.apply_balance_deltas([(match.player1_id, 5000), (match.player2_id, 5000)])
                 match.turn_in_progress = False
                 #remove the match
-                del matchmaking_dict[channel.id]
+                match_registry.remove(channel.id)
                 break
-        #db_manager.delete_game_save(channel.id, match)                   
 
 async def setup(bot):
     """Setup function for the cog."""
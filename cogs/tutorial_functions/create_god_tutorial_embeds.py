@@ -1,6 +1,9 @@
 import discord
 import unicodedata
-from utils.game_test_on_discord import gods, Effect
+from utils.game_test_on_discord import gods
+from utils.gameplay_tag import (
+    EffectType, SHIELD_EFFECTS, DMG_BOOST_EFFECTS, MISC_EFFECTS, HP_BOOST_MASK,
+)
 
 def simple_embed(message: str) -> discord.Embed:
     """Returns a simple Discord Embed with a purple border and the given message as the title."""
@@ -23,22 +26,16 @@ def create_god_tutorial_embeds(god_names: list[str], success: bool = True, overr
 
     for name in god_names:
         god = gods[name.lower()]
-        # Make a copy
-        god_copy = god.__class__(god.name, god.hp, god.dmg, None, god.reload_max)
-        god_copy.max_hp = god.max_hp
-        # Copy effects as new Effect instances
-        god_copy.effects = {k: Effect(v.value, v.duration) for k, v in god.effects.items()}
-        god_copy.visible = god.visible
-        god_copy.alive = god.alive
-        god_copy.reload = god.reload
+        # Make an independent copy of the template god
+        god_copy = god.clone()
 
         # Apply overrides
         if name.lower() in overrides:
             for attr, val in overrides[name.lower()].items():
                 if attr == "effects":
-                    # Convert plain dict to proper Effect objects
+                    # Convert the effect names to registry slots
                     for effect_name, effect_val in val.items():
-                        god_copy.effects[effect_name] = Effect(effect_val, 2)  # default duration 2 for tutorial
+                        god_copy.set_effect(EffectType.from_key(effect_name), effect_val, 2)  # default duration 2 for tutorial
                 else:
                     setattr(god_copy, attr, val)
 
@@ -51,38 +48,27 @@ def create_god_tutorial_embeds(god_names: list[str], success: bool = True, overr
         return s + " " * max(0, width - visual_len(s))
 
     def get_shield(god):
-        icons = []
-        for effect in ["posi_shield", "hep_shield", "hades_uw_shield"]:
-            if effect in god.effects:
-                icons.append(f"{'🔱' if effect=='posi_shield' else '🛡️' if effect=='hep_shield' else '☠️'}{god.effects[effect].value}")
-        return " ".join(icons)
+        return " ".join(
+            f"{effect.icon}{god.effect_values[effect]}"
+            for effect in SHIELD_EFFECTS if god.has_effect(effect)
+        )
 
     def get_dmg_boost(god):
-        icons = []
-        for effect, icon in [("ares_do_more_dmg","🔥"), ("hades_ow_do_more_dmg","💥"), ("mega_do_less_dmg","💚")]:
-            if effect in god.effects:
-                prefix = "+" if "more" in effect else "-"
-                icons.append(f"{prefix}{god.effects[effect].value}{icon}")
-        return " ".join(icons)
+        return " ".join(
+            f"{sign}{god.effect_values[effect]}{effect.icon}"
+            for effect, sign in DMG_BOOST_EFFECTS if god.has_effect(effect)
+        )
 
     def get_hp_boost_icon(god):
         icons = []
-        if "athena_more_max_hp" in god.effects:
-            icons.append("📯")
-        if "cerberus_more_max_hp_per_visible_ally" in god.effects:
+        if god.has_effect(EffectType.ATHENA_MORE_HP):
+            icons.append(EffectType.ATHENA_MORE_HP.icon)
+        if god.has_effect(EffectType.CERBERUS_MORE_MAX_HP):
             icons.append("⛑️")
         return " ".join(icons)
 
     def get_misc_effects_icons(god):
-        icons_map = {
-            "zeus_stun": "💫",
-            "aphro_charm": "💘",
-            "charon_invisible_duration": "🧿",
-            "tisi_freeze_timer": "❄️",
-            "cerberus_more_max_hp_per_visible_ally": "🐶",
-            "alecto_get_more_dmg": "💢"
-        }
-        icons = [icons_map[effect] for effect in god.effects if effect in icons_map]
+        icons = [effect.icon for effect in MISC_EFFECTS if god.has_effect(effect)]
         if god.reload > 0:
             icons.append(f"{god.reload}⏳")
         return " ".join(icons)
@@ -102,7 +88,7 @@ def create_god_tutorial_embeds(god_names: list[str], success: bool = True, overr
 
         for god in team:
             hp_str = f"{god.hp}/"
-            is_hp_boosted = "athena_more_max_hp" in god.effects or "cerberus_more_max_hp_per_visible_ally" in god.effects
+            is_hp_boosted = bool(god.effect_mask & HP_BOOST_MASK)
             max_hp_str = bold_digits(str(god.max_hp)) if is_hp_boosted else str(god.max_hp)
             hp_numbers.append(pad(hp_str + max_hp_str))
             hp_icons.append(pad(get_hp_boost_icon(god) + get_shield(god)))
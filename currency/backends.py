@@ -0,0 +1,337 @@
+import asyncio
+import os
+import sqlite3
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from bot.metrics import timed_store_call
+
+logger = logging.getLogger(__name__)
+
+MONEY_COLUMNS = ("user_id", "balance", "words", "player_time")
+DEFAULT_ROW = {"balance": 0, "words": "none", "player_time": ""}
+
+
+class MoneyBackend:
+    """
+    Storage of the `money` table (user_id, balance, words, player_time) used by MoneyManager.
+    Rows are plain dicts; missing players are created with DEFAULT_ROW by increment().
+    """
+
+    async def fetch_row(self, user_id) -> dict | None:
+        raise NotImplementedError
+
+    async def fetch_all(self) -> list[dict]:
+        raise NotImplementedError
+
+    async def insert_row(self, user_id, row: dict):
+        raise NotImplementedError
+
+    async def upsert_row(self, user_id, fields: dict):
+        raise NotImplementedError
+
+    async def update_fields(self, user_id, fields: dict):
+        """Update columns of an existing row (no-op if the player has no row)."""
+        raise NotImplementedError
+
+    async def increment(self, user_id, amount) -> float:
+        """Atomically add amount to the balance (creating the row) and return the new balance."""
+        raise NotImplementedError
+
+    async def apply_deltas(self, deltas: dict) -> dict:
+        """Atomically add {user_id: amount} to the balances (creating rows) and return the new balances."""
+        raise NotImplementedError
+
+    async def fetch_top(self, limit: int, offset: int = 0) -> list[dict]:
+        """Rows {user_id, balance} in leaderboard order (balance desc, ties by user_id), sorted by the store."""
+        raise NotImplementedError
+
+    async def count_rows(self) -> int:
+        raise NotImplementedError
+
+    async def fetch_rank(self, user_id) -> int | None:
+        """1-based leaderboard position of the player (None if the player has no row)."""
+        raise NotImplementedError
+
+    async def delete_all(self):
+        raise NotImplementedError
+
+    async def reset_all(self, fields: dict):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class SupabaseBackend(MoneyBackend):
+    """The production `money` table on Supabase (needs SUPABASE_URL/SUPABASE_KEY)."""
+
+    def __init__(self, url: str | None = None, key: str | None = None):
+        self.url = url or os.getenv("SUPABASE_URL")
+        self.key = key or os.getenv("SUPABASE_KEY")
+        self.client = None
+        self._client_lock = asyncio.Lock()
+
+    async def _table(self):
+        if self.client is None:
+            async with self._client_lock:
+                if self.client is None:
+                    from supabase import acreate_client
+                    self.client = await acreate_client(self.url, self.key)
+        return self.client.table("money")
+
+    async def fetch_row(self, user_id):
+        data = await (await self._table()).select("balance, words, player_time").eq("user_id", user_id).execute()
+        return data.data[0] if data.data else None
+
+    async def fetch_all(self):
+        data = await (await self._table()).select("user_id, balance, words, player_time").execute()
+        return data.data
+
+    async def insert_row(self, user_id, row):
+        await (await self._table()).insert({"user_id": user_id, **row}).execute()
+
+    async def upsert_row(self, user_id, fields):
+        await (await self._table()).upsert({"user_id": user_id, **fields}).execute()
+
+    async def update_fields(self, user_id, fields):
+        await (await self._table()).update(fields).eq("user_id", user_id).execute()
+
+    async def increment(self, user_id, amount):
+        await self._table()
+        data = await self.client.rpc("increment_balance", {"p_user_id": user_id, "p_amount": amount}).execute()
+        return data.data
+
+    async def apply_deltas(self, deltas):
+        await self._table()
+        data = await self.client.rpc("apply_balance_deltas", {
+            "p_user_ids": list(deltas.keys()),
+            "p_amounts": list(deltas.values()),
+        }).execute()
+        return {row["user_id"]: row["balance"] for row in data.data}
+
+    async def fetch_top(self, limit, offset=0):
+        data = await (await self._table()).select("user_id, balance").order("balance", desc=True) \
+            .order("user_id").range(offset, offset + limit - 1).execute()
+        return data.data
+
+    async def count_rows(self):
+        data = await (await self._table()).select("user_id", count="exact").limit(1).execute()
+        return data.count or 0
+
+    async def fetch_rank(self, user_id):
+        await self._table()
+        data = await self.client.rpc("leaderboard_rank", {"p_user_id": user_id}).execute()
+        return data.data
+
+    async def delete_all(self):
+        await (await self._table()).delete().neq("user_id", 0).execute()
+
+    async def reset_all(self, fields):
+        await (await self._table()).update(fields).neq("user_id", 0).execute()
+
+
+class SQLiteBackend(MoneyBackend):
+    """
+    Local stand-in for the Supabase table: one SQLite file in WAL mode with the same columns.
+    All queries run on a single worker thread that owns the connection.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="money-sqlite")
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS money (
+                    user_id INTEGER PRIMARY KEY,
+                    balance REAL NOT NULL DEFAULT 0,
+                    words TEXT DEFAULT 'none',
+                    player_time TEXT DEFAULT ''
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS money_leaderboard ON money (balance DESC, user_id)")
+            self._conn.commit()
+        return self._conn
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    @staticmethod
+    def _row(row: sqlite3.Row | None) -> dict | None:
+        if row is None:
+            return None
+        data = dict(row)
+        balance = data.get("balance")
+        if isinstance(balance, float) and balance.is_integer():
+            data["balance"] = int(balance)
+        return data
+
+    async def fetch_row(self, user_id):
+        def query():
+            cur = self._connect().execute(
+                "SELECT balance, words, player_time FROM money WHERE user_id = ?", (user_id,)
+            )
+            return self._row(cur.fetchone())
+        return await self._run(query)
+
+    async def fetch_all(self):
+        def query():
+            cur = self._connect().execute("SELECT user_id, balance, words, player_time FROM money")
+            return [self._row(row) for row in cur.fetchall()]
+        return await self._run(query)
+
+    async def insert_row(self, user_id, row):
+        def query():
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT INTO money (user_id, balance, words, player_time) VALUES (?, ?, ?, ?)",
+                    (user_id, row["balance"], row["words"], row["player_time"]),
+                )
+        await self._run(query)
+
+    async def upsert_row(self, user_id, fields):
+        columns = [c for c in fields if c in MONEY_COLUMNS[1:]]
+
+        def query():
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    f"INSERT INTO money (user_id, {', '.join(columns)}) VALUES (?{', ?' * len(columns)}) "
+                    f"ON CONFLICT(user_id) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in columns)}",
+                    (user_id, *(fields[c] for c in columns)),
+                )
+        await self._run(query)
+
+    async def update_fields(self, user_id, fields):
+        columns = [c for c in fields if c in MONEY_COLUMNS[1:]]
+
+        def query():
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    f"UPDATE money SET {', '.join(f'{c} = ?' for c in columns)} WHERE user_id = ?",
+                    (*(fields[c] for c in columns), user_id),
+                )
+        await self._run(query)
+
+    _INCREMENT = (
+        "INSERT INTO money (user_id, balance, words, player_time) VALUES (?, ?, 'none', '') "
+        "ON CONFLICT(user_id) DO UPDATE SET balance = balance + excluded.balance "
+        "RETURNING balance"
+    )
+
+    async def increment(self, user_id, amount):
+        def query():
+            conn = self._connect()
+            with conn:
+                cur = conn.execute(self._INCREMENT, (user_id, amount))
+                return self._row(cur.fetchone())["balance"]
+        return await self._run(query)
+
+    async def apply_deltas(self, deltas):
+        def query():
+            conn = self._connect()
+            balances = {}
+            with conn:  # one transaction: every delta or none
+                for user_id, amount in deltas.items():
+                    cur = conn.execute(self._INCREMENT, (user_id, amount))
+                    balances[user_id] = self._row(cur.fetchone())["balance"]
+            return balances
+        return await self._run(query)
+
+    async def fetch_top(self, limit, offset=0):
+        def query():
+            cur = self._connect().execute(
+                "SELECT user_id, balance FROM money ORDER BY balance DESC, user_id LIMIT ? OFFSET ?",
+                (limit, offset),
+            )
+            return [self._row(row) for row in cur.fetchall()]
+        return await self._run(query)
+
+    async def count_rows(self):
+        def query():
+            return self._connect().execute("SELECT COUNT(*) FROM money").fetchone()[0]
+        return await self._run(query)
+
+    async def fetch_rank(self, user_id):
+        def query():
+            cur = self._connect().execute(
+                "SELECT (SELECT COUNT(*) FROM money m WHERE m.balance > me.balance "
+                "OR (m.balance = me.balance AND m.user_id < me.user_id)) + 1 "
+                "FROM money me WHERE me.user_id = ?",
+                (user_id,),
+            )
+            row = cur.fetchone()
+            return row[0] if row else None
+        return await self._run(query)
+
+    async def delete_all(self):
+        def query():
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM money")
+        await self._run(query)
+
+    async def reset_all(self, fields):
+        columns = [c for c in fields if c in MONEY_COLUMNS[1:]]
+
+        def query():
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    f"UPDATE money SET {', '.join(f'{c} = ?' for c in columns)}",
+                    tuple(fields[c] for c in columns),
+                )
+        await self._run(query)
+
+    async def close(self):
+        def query():
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        await self._run(query)
+
+
+class TimedBackend:
+    """
+    Wraps a MoneyBackend and records the latency of every call in maggod_store_call_seconds,
+    labelled with the backend name and the method (other attributes are passed through).
+    """
+
+    def __init__(self, backend: MoneyBackend, store: str):
+        self.backend = backend
+        self.store = store
+
+    def __getattr__(self, name):
+        attr = getattr(self.backend, name)
+        if name == "close" or not asyncio.iscoroutinefunction(attr):
+            return attr
+
+        async def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await attr(*args, **kwargs)
+            finally:
+                timed_store_call(self.store, name, start)
+        return timed
+
+
+def create_backend(name: str, sqlite_path: str) -> MoneyBackend:
+    """Build the backend selected in the config ("supabase" or "sqlite"), timed for /metrics."""
+    if name == "sqlite":
+        logger.info(f"Using local SQLite money backend at {sqlite_path}")
+        return TimedBackend(SQLiteBackend(sqlite_path), "sqlite")
+    if name == "supabase":
+        return TimedBackend(SupabaseBackend(), "supabase")
+    raise ValueError(f"Unknown money backend: {name}")
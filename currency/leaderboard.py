@@ -0,0 +1,68 @@
+import asyncio
+import math
+import time
+import logging
+
+from bot.config import Config
+from currency.backends import MoneyBackend
+from currency.money_manager import money_manager
+
+logger = logging.getLogger(__name__)
+
+
+class Leaderboard:
+    """
+    Balance ranking for /balance (use the `leaderboard` instance). The store does the sorting
+    (ORDER BY balance DESC LIMIT/OFFSET); the top `cache_size` rows and the player count are
+    kept for `ttl` seconds, pages past the cached rows are read on demand.
+    """
+
+    def __init__(self, backend: MoneyBackend, page_size: int = Config.LEADERBOARD_PAGE_SIZE,
+                 cache_size: int = Config.LEADERBOARD_CACHE_SIZE, ttl: float = Config.LEADERBOARD_TTL):
+        self.backend = backend
+        self.page_size = page_size
+        self.cache_size = cache_size
+        self.ttl = ttl
+        self._top = []  # [{user_id, balance}] of ranks 1..cache_size
+        self._total = 0
+        self._loaded_at = None
+        self._lock = asyncio.Lock()
+
+    async def _refresh(self):
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return
+        async with self._lock:  # one reload for concurrent /balance calls
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+                return
+            self._top = await self.backend.fetch_top(self.cache_size)
+            self._total = await self.backend.count_rows()
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    async def page_count(self) -> int:
+        await self._refresh()
+        return max(1, math.ceil(self._total / self.page_size))
+
+    async def get_page(self, page: int) -> list[tuple[int, dict]]:
+        """[(rank, {user_id, balance}), ...] of a 0-based page."""
+        await self._refresh()
+        start = page * self.page_size
+        if start + self.page_size <= len(self._top) or len(self._top) >= self._total:
+            rows = self._top[start:start + self.page_size]
+        else:
+            rows = await self.backend.fetch_top(self.page_size, start)
+        return [(start + i + 1, row) for i, row in enumerate(rows)]
+
+    async def get_rank(self, user_id) -> int | None:
+        await self._refresh()
+        for i, row in enumerate(self._top):
+            if row["user_id"] == user_id:
+                return i + 1
+        if len(self._top) >= self._total:
+            return None  # every player is cached
+        return await self.backend.fetch_rank(user_id)
+
+
+leaderboard = Leaderboard(money_manager.backend)
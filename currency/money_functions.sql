@@ -0,0 +1,45 @@
+-- Functions used by currency/money_manager.py.
+-- Run once in the Supabase SQL editor (or psql) on the database holding the `money` table.
+
+-- Atomically add p_amount to a player's balance, creating the row if needed.
+-- Returns the new balance (one round trip, no read-then-write race).
+create or replace function increment_balance(p_user_id bigint, p_amount numeric)
+returns numeric
+language sql
+as $$
+    insert into money (user_id, balance, words, player_time)
+    values (p_user_id, p_amount, 'none', '')
+    on conflict (user_id) do update set balance = money.balance + excluded.balance
+    returning balance;
+$$;
+
+-- Apply several balance deltas in one statement (all or nothing).
+-- Deltas for the same player are summed. Returns the new balance of every player touched.
+create or replace function apply_balance_deltas(p_user_ids bigint[], p_amounts numeric[])
+returns table (user_id bigint, balance numeric)
+language sql
+as $$
+    insert into money (user_id, balance, words, player_time)
+    select d.user_id, sum(d.amount), 'none', ''
+    from unnest(p_user_ids, p_amounts) as d(user_id, amount)
+    group by d.user_id
+    on conflict (user_id) do update set balance = money.balance + excluded.balance
+    returning money.user_id, money.balance;
+$$;
+
+-- Leaderboard order (balance desc, ties by user_id): served by this index, paged with ORDER BY/LIMIT.
+create index if not exists money_leaderboard_idx on money (balance desc, user_id);
+
+-- 1-based leaderboard position of a player (null if the player has no row).
+create or replace function leaderboard_rank(p_user_id bigint)
+returns bigint
+language sql
+stable
+as $$
+    select (
+        select count(*) from money m
+        where m.balance > me.balance or (m.balance = me.balance and m.user_id < me.user_id)
+    ) + 1
+    from money me
+    where me.user_id = p_user_id;
+$$;
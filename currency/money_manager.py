@@ -1,88 +1,163 @@
-from supabase import create_client
 from datetime import datetime, timezone
-import os
+import time
+import logging
+
+from bot.config import Config
+from currency.backends import MoneyBackend, DEFAULT_ROW, create_backend
+from currency.rate_limiter import GuessRateLimiter
+
+logger = logging.getLogger(__name__)
 
 
 class MoneyManager:
-    def __init__(self):
-        url = os.getenv("SUPABASE_URL")
-        key = os.getenv("SUPABASE_KEY")
-        self.client = create_client(url, key)
+    """
+    Async access to the `money` table, shared by the whole bot (use the `money_manager` instance).
+    Storage goes through a MoneyBackend picked from Config.MONEY_BACKEND: Supabase in
+    production (one pooled client, atomic `increment_balance` function from
+    currency/money_functions.sql) or a local SQLite file. Rows are cached write-through and
+    hangman guess limits are checked in memory by a GuessRateLimiter. The cache belongs to
+    one process: with several worker processes, reads that gate a bet use fresh=True.
+    """
+
+    def __init__(self, backend: MoneyBackend | None = None):
+        self.backend = backend or create_backend(Config.MONEY_BACKEND, Config.MONEY_DB_PATH)
+        self._cache = {}  # user_id -> (row dict, time cached)
+        self.cache_ttl = Config.MONEY_CACHE_TTL
+        self.guess_limiter = GuessRateLimiter(self.backend, Config.GUESS_FLUSH_INTERVAL)
+
+    # ----------------- CACHE -----------------
+    def _cached(self, user_id):
+        entry = self._cache.get(user_id)
+        if entry and time.monotonic() - entry[1] < self.cache_ttl:
+            return entry[0]
+        return None
+
+    def _store(self, user_id, **fields):
+        row = dict(self._cached(user_id) or {})
+        row.update(fields)
+        self._cache[user_id] = (row, time.monotonic())
+
+    def _store_row(self, row: dict):
+        self._cache[row["user_id"]] = (
+            {k: row[k] for k in ("balance", "words", "player_time") if k in row},
+            time.monotonic(),
+        )
 
     # ----------------- BALANCE -----------------
-    def get_balance(self, user_id=None, all=False):
+    async def get_balance(self, user_id=None, all=False, fresh=False):
+        """Row of user_id (or every row with all=True); fresh=True skips the cache (balance sizing a bet)."""
         if all:
-            data = self.client.table("money").select("user_id, balance, words, player_time").execute()
-            return data.data
-
-        data = self.client.table("money").select("balance, words, player_time").eq("user_id", user_id).execute()
-        if not data.data:
-            self.client.table("money").insert({
-                "user_id": user_id,
-                "balance": 0,
-                "words": "none",
-                "player_time": ""
-            }).execute()
-            return {"balance": 0, "words": "none", "player_time": ""}
-        return data.data[0]
-
-    def set_balance(self, user_id, value, words=None):
+            rows = await self.backend.fetch_all()
+            for row in rows:
+                self._store_row(row)
+            return rows
+
+        row = None if fresh else self._cached(user_id)
+        if row is not None and {"balance", "words", "player_time"} <= row.keys():
+            return dict(row)
+
+        row = await self.backend.fetch_row(user_id)
+        if row is None:
+            row = dict(DEFAULT_ROW)
+            await self.backend.insert_row(user_id, row)
+        self._store(user_id, **row)
+        return dict(row)
+
+    async def set_balance(self, user_id, value, words=None):
         update_data = {
-            "user_id": user_id,
             "balance": value,
         }
         if words is not None:
             update_data["words"] = words
 
-        self.client.table("money").upsert(update_data).execute()
+        await self.backend.upsert_row(user_id, update_data)
+        self._store(user_id, **update_data)
 
-    def update_balance(self, user_id, amount, words=None):
-        current_data = self.get_balance(user_id)
-        current_balance = current_data["balance"] if isinstance(current_data, dict) else current_data
-        new_balance = current_balance + amount
-        self.set_balance(user_id, new_balance, words=words)
+    async def update_balance(self, user_id, amount, words=None):
+        """Atomically add amount to the balance (creating the row if needed) and return the new balance."""
+        new_balance = await self.backend.increment(user_id, amount)
+        self._store(user_id, balance=new_balance)
+        if words is not None:
+            await self.set_words(user_id, words)
         return new_balance
-        # ----------------- ADMIN -----------------
-    def delete_database(self):
-        self.client.table("money").delete().neq("user_id", 0).execute()
-
-    def reset_currency(self):
-        all_users = self.get_balance(all=True)
-        for user in all_users:
-            self.client.table("money").update({
-                "balance": 0,
-                "words": "reset",
-                "player_time": "",
-            }).eq("user_id", user["user_id"]).execute()
+
+    async def apply_balance_deltas(self, deltas: list[tuple]) -> dict:
+        """
+        Apply [(user_id, amount), ...] in one atomic request (amounts of the same player are summed).
+        Returns {user_id: new balance}.
+        """
+        totals = {}
+        for user_id, amount in deltas:
+            totals[user_id] = totals.get(user_id, 0) + amount
+        if not totals:
+            return {}
+        balances = await self.backend.apply_deltas(totals)
+        for user_id, balance in balances.items():
+            self._store(user_id, balance=balance)
+        return balances
+
+    # ----------------- ADMIN -----------------
+    async def delete_database(self):
+        await self.backend.delete_all()
+        self._cache.clear()
+        self.guess_limiter.clear()
+
+    async def reset_currency(self):
+        await self.backend.reset_all({
+            "balance": 0,
+            "words": "reset",
+            "player_time": "",
+        })
+        self._cache.clear()
+        self.guess_limiter.clear()
 
     # ----------------- WORDS -----------------
-    def get_words(self, user_id):
-        data = self.client.table("money").select("words").eq("user_id", user_id).execute()
-        if data.data:
-            return data.data[0]["words"]
+    async def get_words(self, user_id):
+        row = self._cached(user_id)
+        if row is not None and "words" in row:
+            return row["words"]
+        row = await self.backend.fetch_row(user_id)
+        if row is not None:
+            self._store(user_id, **row)
+            return row["words"]
         return None
 
-    def set_words(self, user_id, words):
-        self.client.table("money").update({
+    async def set_words(self, user_id, words):
+        await self.backend.update_fields(user_id, {
             "words": words,
-        }).eq("user_id", user_id).execute()
+        })
+        self._store(user_id, words=words)
 
 
     # ----------------- PLAYER_TIME (rate limit) -----------------
-    def set_player_times(self, user_id, times):
+    async def set_player_times(self, user_id, times):
         text = "!".join(t.isoformat() for t in times)
-        self.client.table("money").update({
+        await self.backend.update_fields(user_id, {
             "player_time": text
-        }).eq("user_id", user_id).execute()
-
-
-    def get_player_times(self, user_id):
-        data = self.client.table("money").select("player_time").eq("user_id", user_id).execute()
-        if not data.data or not data.data[0].get("player_time"):
+        })
+        self._store(user_id, player_time=text)
+        self.guess_limiter.set_times(user_id, times)
+
+
+    async def get_player_times(self, user_id):
+        times = self.guess_limiter.get_times(user_id)
+        if times is not None:
+            return times  # the limiter's window is newer than the column between flushes
+
+        row = self._cached(user_id)
+        if row is not None and "player_time" in row:
+            text = row["player_time"]
+        else:
+            row = await self.backend.fetch_row(user_id)
+            if row is None:
+                return []
+            self._store(user_id, **row)
+            text = row.get("player_time") or ""
+        if not text:
             return []
 
         times = []
-        for t in data.data[0]["player_time"].split("!"):
+        for t in text.split("!"):
             try:
                 times.append(datetime.fromisoformat(t))
             except Exception:
@@ -90,37 +165,20 @@ class MoneyManager:
         return times
 
 
-    def add_player_guess_time(self, user_id):
-        times = self.get_player_times(user_id)
-        times.append(datetime.now(timezone.utc))
-        self.set_player_times(user_id, times)
+    async def add_player_guess_time(self, user_id):
+        await self.guess_limiter.record(user_id)
 
 
-    def check_guess_rate_limit(self, user_id, max_guesses=10, window_seconds=600):
+    async def check_guess_rate_limit(self, user_id, max_guesses=10, window_seconds=600):
         """
         Returns:
         (can_play: bool, wait_seconds: int)
         """
-        now = datetime.now(timezone.utc)
-        times = self.get_player_times(user_id)
-        if not times : 
-            self.set_player_times(user_id, [])
-            return True, 0
-
-        # Remove old timestamps
-        valid_times = [
-            t for t in times
-            if (now - t).total_seconds() <= window_seconds
-        ]
-
-        # Save cleaned list
-        self.set_player_times(user_id, valid_times)
-
-        if len(valid_times) >= max_guesses:
-            oldest = min(valid_times)
-            wait_seconds = int(
-                window_seconds - (now - oldest).total_seconds()
-            )
-            return False, max(wait_seconds, 1)
-
-        return True, 0
+        return await self.guess_limiter.check(user_id, max_guesses, window_seconds)
+
+    async def close(self):
+        await self.guess_limiter.close()
+        await self.backend.close()
+
+
+money_manager = MoneyManager()
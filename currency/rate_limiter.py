@@ -0,0 +1,141 @@
+import asyncio
+import time
+import logging
+from collections import deque
+from datetime import datetime, timezone
+
+from currency.backends import MoneyBackend
+
+logger = logging.getLogger(__name__)
+
+
+class GuessRateLimiter:
+    """
+    Sliding-window limit on hangman guesses, kept in memory (one deque of timestamps per player).
+    A player's window is read from the `player_time` column once, then checks and new guesses
+    are local; changed windows are written back in the background every `flush_interval`
+    seconds (same "!"-joined ISO format) and on close(). The periodic flush also forgets the
+    saved windows with no guess inside the longest window checked so far, so idle players
+    don't keep a deque forever (the column is read again on their next guess).
+    """
+
+    def __init__(self, backend: MoneyBackend, flush_interval: float = 30.0):
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self._windows: dict[int, deque] = {}  # user_id -> deque of unix timestamps, oldest first
+        self._dirty = set()
+        self._window_seconds = 0  # longest window_seconds passed to check()
+        self._flush_task = None
+
+    # ----------------- WINDOWS -----------------
+    async def _window(self, user_id) -> deque:
+        window = self._windows.get(user_id)
+        if window is None:
+            row = await self.backend.fetch_row(user_id)
+            window = deque(sorted(self._parse(row.get("player_time") if row else "")))
+            self._windows[user_id] = window
+            self._schedule_flush()
+        return window
+
+    @staticmethod
+    def _parse(text: str | None) -> list[float]:
+        times = []
+        for t in (text or "").split("!"):
+            try:
+                times.append(datetime.fromisoformat(t).timestamp())
+            except Exception:
+                continue
+        return times
+
+    @staticmethod
+    def _format(window: deque) -> str:
+        return "!".join(datetime.fromtimestamp(t, timezone.utc).isoformat() for t in window)
+
+    @staticmethod
+    def _prune(window: deque, now: float, window_seconds: int):
+        while window and now - window[0] > window_seconds:
+            window.popleft()
+
+    # ----------------- API -----------------
+    async def check(self, user_id, max_guesses=10, window_seconds=600):
+        """
+        Returns:
+        (can_play: bool, wait_seconds: int)
+        """
+        window = await self._window(user_id)
+        now = time.time()
+        self._window_seconds = max(self._window_seconds, window_seconds)
+        self._prune(window, now, window_seconds)
+
+        if len(window) >= max_guesses:
+            wait_seconds = int(window_seconds - (now - window[0]))
+            return False, max(wait_seconds, 1)
+        return True, 0
+
+    async def record(self, user_id):
+        window = await self._window(user_id)
+        window.append(time.time())
+        self._mark_dirty(user_id)
+
+    def get_times(self, user_id) -> list[datetime] | None:
+        """Loaded window of a player as datetimes (None if it was never read)."""
+        window = self._windows.get(user_id)
+        if window is None:
+            return None
+        return [datetime.fromtimestamp(t, timezone.utc) for t in window]
+
+    def set_times(self, user_id, times: list[datetime]):
+        self._windows[user_id] = deque(sorted(t.timestamp() for t in times))
+        self._dirty.discard(user_id)  # caller wrote the column itself
+        self._schedule_flush()
+
+    def clear(self):
+        self._windows.clear()
+        self._dirty.clear()
+
+    # ----------------- PERSISTENCE -----------------
+    def _mark_dirty(self, user_id):
+        self._dirty.add(user_id)
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self):
+        # keep flushing while windows are loaded, so the expired ones get dropped
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+            self._drop_expired()
+            if not self._windows and not self._dirty:
+                break
+
+    def _drop_expired(self):
+        """Forget the saved windows that are empty or whose newest guess is out of every window."""
+        now = time.time()
+        expired = [
+            user_id for user_id, window in self._windows.items()
+            if user_id not in self._dirty and (not window or now - window[-1] > self._window_seconds)
+        ]
+        for user_id in expired:
+            del self._windows[user_id]
+
+    async def flush(self):
+        """Write the windows changed since the last flush to `player_time`."""
+        dirty, self._dirty = self._dirty, set()
+        for user_id in dirty:
+            window = self._windows.get(user_id)
+            if window is None:
+                continue
+            try:
+                await self.backend.update_fields(user_id, {"player_time": self._format(window)})
+            except Exception as e:
+                logger.error(f"Failed to save guess times of {user_id}: {e}")
+                self._dirty.add(user_id)
+
+    async def close(self):
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        self._flush_task = None
+        await self.flush()
@@ -0,0 +1,114 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from database.codec import encode_match, decode_match, GOD_NAMES
+from database.manager import DB_Manager, Match_Loaded
+from simulation.engine import TEAM_SIZE, new_roster, bot_chooser, execute_turn
+
+
+def _legacy_encode_team(team) -> str:
+    """The string encoder the codec replaced (kept here only as the baseline of the benchmark)."""
+    encrypted = []
+    for god in team:
+        text = "a" + str(GOD_NAMES.index(god.name)).zfill(2)
+        text += str(god.hp).zfill(2) + str(god.max_hp).zfill(2) + str(god.dmg).zfill(2)
+        text += str(int(god.visible)) + str(int(god.alive))
+        text += "-".join(
+            f"{int(effect)}|{god.effect_values[effect]}|{god.effect_durations[effect]}"
+            for effect in god.active_effects()
+        )
+        encrypted.append(text)
+    return ".".join(encrypted)
+
+
+def sample_states(games: int, seed: int) -> list[Match_Loaded]:
+    """Match states after every turn of `games` random games."""
+    random.seed(seed)
+    choose = bot_chooser("random")
+    states = []
+    for _ in range(games):
+        roster = new_roster()
+        random.shuffle(roster)
+        team1, team2 = roster[:TEAM_SIZE], roster[TEAM_SIZE:2 * TEAM_SIZE]
+        teams = (team1, team2)
+        for turn in range(200):
+            try:
+                ended = execute_turn(teams[turn % 2], teams[1 - turn % 2], choose)
+            except Exception:
+                break
+            match = Match_Loaded(1, 2)
+            match.teams = {1: [god.clone() for god in team1], 2: [god.clone() for god in team2]}
+            match.turn_number = turn + 1
+            match.turn_state = {"current_player": 1 + turn % 2, "turn_number": turn + 1}
+            states.append(match)
+            if ended:
+                break
+    return states
+
+
+# Match fields the binary state must bring back unchanged
+ROUND_TRIP_FIELDS = (
+    "turn_number", "turn_state", "solo_mode", "started", "teams_initialized", "compact_mode",
+    "gamb_bet", "gamb_gain", "game_phase", "ai_bot_name", "money_sys_type", "bot_type",
+    "player1_name", "player2_name",
+)
+
+
+def check_round_trip(db: DB_Manager, match):
+    """Save a match and load it back through the database, failing on any field that changed."""
+    db.update_game_save(1, match)
+    loaded = db.load_game(1)
+    for field in ROUND_TRIP_FIELDS:
+        assert getattr(loaded, field) == getattr(match, field), f"{field}: {getattr(loaded, field)!r} != {getattr(match, field)!r}"
+        assert type(getattr(loaded, field)) is type(getattr(match, field)), f"{field} changed type"
+    for player in (1, 2):
+        before = [(g.name, g.hp, g.max_hp, g.dmg, g.reload, g.visible, g.alive, g.effect_mask) for g in match.teams[player]]
+        after = [(g.name, g.hp, g.max_hp, g.dmg, g.reload, g.visible, g.alive, g.effect_mask) for g in loaded.teams[player]]
+        assert before == after, f"team of player {player} changed"
+
+
+def _per_call_us(func, items) -> float:
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    return (time.perf_counter() - start) / len(items) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the per-turn cost of saving a match.")
+    parser.add_argument("--games", type=int, default=200, help="random games sampled for match states")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    states = sample_states(args.games, args.seed)
+    blobs = [encode_match(match) for match in states]
+    legacy = [_legacy_encode_team(match.teams[1]) + _legacy_encode_team(match.teams[2]) for match in states]
+
+    legacy_us = _per_call_us(lambda m: (_legacy_encode_team(m.teams[1]), _legacy_encode_team(m.teams[2])), states)
+    encode_us = _per_call_us(encode_match, states)
+    decode_us = _per_call_us(lambda blob: decode_match(blob, Match_Loaded(1, 2)), blobs)
+
+    with tempfile.TemporaryDirectory() as folder:
+        db = DB_Manager(folder_path=os.path.join(folder, "saves"))
+        sample = states[len(states) // 2]
+        sample.player1_name, sample.player2_name = "Zoë", "bot"
+        sample.compact_mode, sample.solo_mode, sample.started, sample.teams_initialized = True, True, True, True
+        sample.game_phase, sample.ai_bot_name, sample.money_sys_type = "playing", "mcts", "gambling"
+        sample.gamb_bet, sample.gamb_gain = 300, 457
+        check_round_trip(db, sample)
+        db.create_game_save(1, states[0])
+        save_us = _per_call_us(lambda m: db.update_game_save(1, m), states)
+        db.close()
+
+    print(f"{len(states)} match states from {args.games} games (save/load round trip ok)")
+    print(f"legacy strings : {legacy_us:8.1f} us/encode  {sum(map(len, legacy)) / len(legacy):6.1f} bytes")
+    print(f"binary codec   : {encode_us:8.1f} us/encode  {sum(map(len, blobs)) / len(blobs):6.1f} bytes")
+    print(f"binary decode  : {decode_us:8.1f} us/match")
+    print(f"update_game_save (encode + SQLite commit): {save_us:8.1f} us/turn")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import asyncio
+import os
+import sqlite3
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from bot.config import Config
+from bot.metrics import timed_store_call
+
+logger = logging.getLogger(__name__)
+
+
+class QueueBroker:
+    """
+    State shared by every bot process (use the `queue_broker` instance): the waiting queue and the
+    running pairs of each arcade game, and the lobby summaries each worker publishes for the lobby
+    status message, in one SQLite file in WAL mode. Pairing
+    runs in a single BEGIN IMMEDIATE transaction, so two processes never take the same waiting
+    player. Queue entries older than `queue_timeout` are ignored (their process may be gone).
+    All queries run on a single worker thread that owns the connection.
+    """
+
+    def __init__(self, path: str, queue_timeout: float = Config.ARCADE_QUEUE_TIMEOUT):
+        self.path = path
+        self.queue_timeout = queue_timeout
+        self._conn = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="queue-broker")
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS arcade_queue (
+                    game TEXT NOT NULL,
+                    user_id INTEGER NOT NULL,
+                    channel_id INTEGER NOT NULL,
+                    queued_at REAL NOT NULL,
+                    PRIMARY KEY (game, user_id)
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS arcade_active (
+                    game TEXT NOT NULL,
+                    user_id INTEGER NOT NULL,
+                    opponent_id INTEGER NOT NULL,
+                    PRIMARY KEY (game, user_id)
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS lobby_status (
+                    channel_id INTEGER PRIMARY KEY,
+                    worker INTEGER NOT NULL,
+                    position INTEGER NOT NULL,
+                    phase TEXT NOT NULL,
+                    player1_id INTEGER,
+                    player2_id INTEGER
+                )
+            """)
+        return self._conn
+
+    async def _run(self, operation: str, query):
+        """Run query(conn) in one transaction on the worker thread."""
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            return await loop.run_in_executor(self._executor, self._transaction, query)
+        finally:
+            timed_store_call("sqlite_broker", operation, start)
+
+    def _transaction(self, func):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = func(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return result
+
+    # ----------------- QUEUE -----------------
+    async def pair_or_enqueue(self, game: str, user_id: int, channel_id: int) -> dict | None:
+        """
+        Take the oldest other player waiting for `game` ({"user_id", "channel_id"}), or queue
+        user_id and return None. A previous queue entry of user_id is replaced.
+        """
+        def query(conn):
+            now = time.time()
+            conn.execute("DELETE FROM arcade_queue WHERE game = ? AND (user_id = ? OR queued_at < ?)",
+                         (game, user_id, now - self.queue_timeout))
+            row = conn.execute(
+                "SELECT user_id, channel_id FROM arcade_queue WHERE game = ? ORDER BY queued_at LIMIT 1", (game,)
+            ).fetchone()
+            if row is None:
+                conn.execute("INSERT INTO arcade_queue (game, user_id, channel_id, queued_at) VALUES (?, ?, ?, ?)",
+                             (game, user_id, channel_id, now))
+                return None
+            conn.execute("DELETE FROM arcade_queue WHERE game = ? AND user_id = ?", (game, row[0]))
+            return {"user_id": row[0], "channel_id": row[1]}
+        return await self._run("pair_or_enqueue", query)
+
+    async def leave_queue(self, game: str, user_id: int) -> bool:
+        """Remove user_id from the queue of `game`; False if they were not waiting (already paired)."""
+        def query(conn):
+            return conn.execute("DELETE FROM arcade_queue WHERE game = ? AND user_id = ?", (game, user_id)).rowcount > 0
+        return await self._run("leave_queue", query)
+
+    # ----------------- RUNNING GAMES -----------------
+    async def set_active(self, game: str, player1: int, player2: int):
+        def query(conn):
+            conn.executemany("INSERT OR REPLACE INTO arcade_active (game, user_id, opponent_id) VALUES (?, ?, ?)",
+                             [(game, player1, player2), (game, player2, player1)])
+        await self._run("set_active", query)
+
+    async def pop_active(self, game: str, user_id: int) -> int | None:
+        """End the running game of user_id; returns the opponent (None if user_id was not playing)."""
+        def query(conn):
+            row = conn.execute("SELECT opponent_id FROM arcade_active WHERE game = ? AND user_id = ?",
+                               (game, user_id)).fetchone()
+            if row is None:
+                return None
+            conn.execute("DELETE FROM arcade_active WHERE game = ? AND user_id IN (?, ?)", (game, user_id, row[0]))
+            return row[0]
+        return await self._run("pop_active", query)
+
+    async def end_active(self, game: str, *players: int):
+        def query(conn):
+            conn.executemany("DELETE FROM arcade_active WHERE game = ? AND user_id = ?",
+                             [(game, player) for player in players])
+        await self._run("end_active", query)
+
+    # ----------------- LOBBY STATUS -----------------
+    async def publish_lobbies(self, worker: int, lobbies: list[tuple]):
+        """Replace the lobby summaries (channel_id, phase, player1_id, player2_id) of one worker process."""
+        def query(conn):
+            conn.execute("DELETE FROM lobby_status WHERE worker = ?", (worker,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO lobby_status (channel_id, worker, position, phase, player1_id, player2_id) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(cid, worker, i, phase, p1, p2) for i, (cid, phase, p1, p2) in enumerate(lobbies)],
+            )
+        await self._run("publish_lobbies", query)
+
+    async def fetch_lobbies(self) -> list[tuple]:
+        """Lobby summaries of every worker, (channel_id, phase, player1_id, player2_id) in worker order."""
+        def query(conn):
+            return [tuple(row) for row in conn.execute(
+                "SELECT channel_id, phase, player1_id, player2_id FROM lobby_status ORDER BY worker, position"
+            )]
+        return await self._run("fetch_lobbies", query)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+queue_broker = QueueBroker(Config.BROKER_DB_PATH)
@@ -0,0 +1,170 @@
+"""
+Binary save format of a running match (stored in the `state` BLOB of the saves table).
+
+Match fields covered: turn_number, turn_state (current_player, turn_number), solo_mode,
+started, teams_initialized, compact_mode, gamb_bet, gamb_gain, game_phase, ai_bot_name,
+money_sys_type, bot_type, player1_name, player2_name and both teams. player1_id/player2_id have
+their own columns in the saves table; the other fields (views, board message, turn_record...)
+are rebuilt when the match is played on.
+
+Layout (little endian):
+    header  "MF" + format version (B)
+    meta    turn_number (H), turn_state turn_number (H), current player id (q, -1 = none),
+            flags (B: solo_mode, started, teams_initialized, compact_mode), gamb_bet (q), gamb_gain (q)
+    texts   game_phase, ai_bot_name, money_sys_type, bot_type, player1_name, player2_name
+            (B length + utf-8 each)
+    teams   player1 team, player2 team: god count (B) then one record per god
+    god     template index (B), hp, max_hp, dmg (h), reload, reload_max (b),
+            flags (B: visible, alive), effect_mask (H), then value, duration (h, h)
+            for every set bit of the mask in EffectType order
+
+decode_legacy_team() reads the old "a<id><hp><max_hp><dmg>..." team strings.
+"""
+import re
+import struct
+
+from utils.gameplay_tag import EFFECT_COUNT, EffectType
+from utils.game_test_on_discord import gods
+
+SAVE_VERSION = 1
+_MAGIC = b"MF"
+
+_HEADER = struct.Struct("<2sB")
+_META = struct.Struct("<HHqBqq")
+_GOD = struct.Struct("<BhhhbbBH")
+_EFFECT = struct.Struct("<hh")
+_COUNT = struct.Struct("<B")
+
+GOD_NAMES = tuple(gods)  # template order, also the god ids of the legacy strings
+GOD_INDEX = {name: index for index, name in enumerate(GOD_NAMES)}
+
+_META_TEXTS = ("game_phase", "ai_bot_name", "money_sys_type", "bot_type", "player1_name", "player2_name")
+_EFFECT_BITS = tuple((effect, 1 << effect) for effect in EffectType)
+
+_SOLO, _STARTED, _TEAMS_INITIALIZED, _COMPACT = 1, 2, 4, 8
+_VISIBLE, _ALIVE = 1, 2
+
+
+def _new_god(index: int):
+    """Fresh god from the template (never the shared template object itself)."""
+    god = gods[GOD_NAMES[index]].clone()
+    god.clear_effects()
+    god.reload = 0
+    return god
+
+
+# ----------------- TEAMS -----------------
+def encode_team(team: list, out: bytearray):
+    out += _COUNT.pack(len(team))
+    for god in team:
+        mask = god.effect_mask
+        out += _GOD.pack(
+            GOD_INDEX[god.name], god.hp, god.max_hp, god.dmg, god.reload, god.reload_max,
+            (_VISIBLE if god.visible else 0) | (_ALIVE if god.alive else 0), mask,
+        )
+        for effect, bit in _EFFECT_BITS:
+            if mask & bit:
+                out += _EFFECT.pack(god.effect_values[effect], god.effect_durations[effect])
+
+
+def decode_team(data: bytes, offset: int) -> tuple[list, int]:
+    (count,) = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    team = []
+    for _ in range(count):
+        index, hp, max_hp, dmg, reload, reload_max, flags, mask = _GOD.unpack_from(data, offset)
+        offset += _GOD.size
+        god = _new_god(index)
+        god.hp, god.max_hp, god.dmg = hp, max_hp, dmg
+        god.reload, god.reload_max = reload, reload_max
+        god.visible = bool(flags & _VISIBLE)
+        god.alive = bool(flags & _ALIVE)
+        god.effect_mask = mask
+        for effect, bit in _EFFECT_BITS:
+            if mask & bit:
+                god.effect_values[effect], god.effect_durations[effect] = _EFFECT.unpack_from(data, offset)
+                offset += _EFFECT.size
+        team.append(god)
+    return team, offset
+
+
+# ----------------- MATCH -----------------
+def encode_match(match) -> bytes:
+    """Encode the teams and the turn state of a match (player ids are stored in their own columns)."""
+    current_player = match.turn_state.get("current_player")
+    out = bytearray(_HEADER.pack(_MAGIC, SAVE_VERSION))
+    out += _META.pack(
+        match.turn_number, match.turn_state.get("turn_number", 1),
+        -1 if current_player is None else int(current_player),
+        (_SOLO if match.solo_mode else 0)
+        | (_STARTED if match.started else 0)
+        | (_TEAMS_INITIALIZED if match.teams_initialized else 0)
+        | (_COMPACT if getattr(match, "compact_mode", False) else 0),
+        int(getattr(match, "gamb_bet", 0)), int(getattr(match, "gamb_gain", 0)),
+    )
+    for name in _META_TEXTS:
+        text = str(getattr(match, name, "")).encode()
+        out += _COUNT.pack(len(text)) + text
+    encode_team(match.teams[match.player1_id], out)
+    encode_team(match.teams[match.player2_id], out)
+    return bytes(out)
+
+
+def decode_match(data: bytes, match):
+    """Restore a match encoded by encode_match (match.player1_id/player2_id must already be set)."""
+    magic, version = _HEADER.unpack_from(data, 0)
+    if magic != _MAGIC:
+        raise ValueError("Not a Maggod Fight save")
+    if version != SAVE_VERSION:
+        raise ValueError(f"Unsupported save version {version}")
+    offset = _HEADER.size
+
+    turn_number, state_turn, current_player, flags, gamb_bet, gamb_gain = _META.unpack_from(data, offset)
+    offset += _META.size
+    match.turn_number = turn_number
+    match.turn_state = {"current_player": None if current_player == -1 else current_player, "turn_number": state_turn}
+    match.solo_mode = bool(flags & _SOLO)
+    match.started = bool(flags & _STARTED)
+    match.teams_initialized = bool(flags & _TEAMS_INITIALIZED)
+    match.compact_mode = bool(flags & _COMPACT)
+    match.gamb_bet = gamb_bet
+    match.gamb_gain = gamb_gain
+
+    for name in _META_TEXTS:
+        (length,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        setattr(match, name, data[offset:offset + length].decode())
+        offset += length
+
+    team1, offset = decode_team(data, offset)
+    team2, offset = decode_team(data, offset)
+    match.teams = {match.player1_id: team1, match.player2_id: team2}
+    return match
+
+
+# ----------------- LEGACY STRINGS -----------------
+_LEGACY_EFFECT = re.compile(r"(\d+)\|(-?\d+)\|(-?\d+)")
+
+
+def decode_legacy_team(team_string: str) -> list:
+    """
+    Read a team saved by the old encrypt_team. That encoder never reset its buffer, so
+    segment i is segment i-1 followed by god i; only the new part of each segment is read.
+    """
+    team = []
+    previous = "a"
+    for segment in str(team_string).split("."):
+        record = segment[len(previous):] if segment.startswith(previous) else segment.removeprefix("a")
+        previous = segment
+
+        god = _new_god(int(record[:2]))
+        god.hp = int(record[2:4])
+        god.max_hp = int(record[4:6])
+        god.dmg = int(record[6:8])
+        god.visible = bool(int(record[8]))
+        god.alive = bool(int(record[9]))
+        for effect, value, duration in _LEGACY_EFFECT.findall(record[10:]):
+            if int(effect) < EFFECT_COUNT:
+                god.set_effect(EffectType(int(effect)), int(value), int(duration))
+        team.append(god)
+    return team
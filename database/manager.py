@@ -4,31 +4,28 @@ Update game_save ungefähr in Zeile 540
 Löschen ungefähr in Zeile
 """
 import time
+import logging
 
 SAVE_TABLE_NAME = "saves"
 
 import os
 import sqlite3
 
-from utils.abilities_tag import *
-from utils.gameplay_tag import God, Effect
-from utils.game_test_on_discord import gods
-
-effects = [
-    "posi_shield",
-    "hep_shield",
-    "ares_do_more_dmg",
-    "aphro_charm",
-    "zeus_stun",
-    "athena_more_max_hp",
-    "hades_ow_do_more_dmg",
-    "cerberus_more_max_hp_per_visible_ally",
-    "charon_invisible_duration",
-    "hades_uw_shield",
-    "tisi_freeze_timer",
-    "alecto_get_more_dmg",
-    "mega_do_less_dmg"
-]
+from database.codec import encode_match, decode_match, decode_legacy_team
+from database.save_writer import SaveWriter
+
+logger = logging.getLogger(__name__)
+
+# One statement per save: rows of the old string format lose their team strings on their first update
+_UPSERT_SAVE = f"""
+    INSERT INTO {SAVE_TABLE_NAME}(channel, player1, player2, current_turn_player_id, turn_nr, game_phase, solo_mode, state)
+    VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(channel) DO UPDATE SET
+        player1=excluded.player1, player2=excluded.player2, player1_team=NULL, player2_team=NULL,
+        current_turn_player_id=excluded.current_turn_player_id, turn_nr=excluded.turn_nr,
+        game_phase=excluded.game_phase, solo_mode=excluded.solo_mode, state=excluded.state
+"""
+_DELETE_SAVE = f"DELETE FROM {SAVE_TABLE_NAME} WHERE channel=?"
 
 
 class Match_Loaded:
@@ -57,6 +54,19 @@ class Match_Loaded:
         self.solo_mode = False              # bool
         self.turn_in_progress = False       # bool?
 
+        # Same defaults as bot.bot_class.Match so a restored match can be played on
+        self.picked_gods = {}
+        self.start_view = False
+        self.DEBUG_SKIP_BUILD = False
+        self.ai_bot_name = "random"
+        self.money_sys_type = "2 players"
+        self.bot_type = "random"
+        self.gamb_bet = 0
+        self.gamb_gain = 0
+        self.turn_record = None
+        self.board = None
+        self.compact_mode = False
+
 
 class DB_Manager:
     def __init__(self, db_name: str = "save", db_extension: str = "db", folder_path: str = "database/database"):
@@ -73,6 +83,7 @@ class DB_Manager:
 
         self.conn = sqlite3.connect(f"{self.folder_path}/{self.db_file_name}")
         self.cursor = self.conn.cursor()
+        self.cursor.execute("PRAGMA journal_mode=WAL")  # the save writer thread has its own connection
 
         self.cursor.execute(f"""
             CREATE TABLE IF NOT EXISTS {SAVE_TABLE_NAME} (
@@ -84,159 +95,110 @@ class DB_Manager:
                 current_turn_player_id STRING,
                 turn_nr INTEGER,
                 game_phase STRING,
-                solo_mode BOOLEAN
+                solo_mode BOOLEAN,
+                state BLOB
             );
         """)
-
-    def encrypt_team(self, player_team):
-        encrypted_player_team = []
-
-        encrypted_god = "a"
-        gods_number = list(gods.keys())
-
-        for god in player_team:
-            encrypted_god += str(gods_number.index(god.name)).zfill(2)
-            encrypted_god += str(god.hp).zfill(2)
-            encrypted_god += str(god.max_hp).zfill(2)
-            encrypted_god += str(god.dmg).zfill(2)
-            encrypted_god += str(int(god.visible))
-            encrypted_god += str(int(god.alive))
-
-            effects_ = []
-            for effect in god.effects.keys():
-                effect_str = str(effects.index(effect))
-                effect_str += "|"
-                effect_str += str(god.effects[effect].value)
-                effect_str += "|"
-                effect_str += str(god.effects[effect].duration)
-                effects_.append(effect_str)
-            encrypted_god += "-".join(effects_)
-
-            encrypted_player_team.append(encrypted_god)
-
-        return ".".join(encrypted_player_team)
-
-    def decrypt_team(self, team_string: str):
-        team = []
-
-        team_string = str(team_string)
-        team_string = team_string.split(".")
-
-        for god_string in team_string:
-            god_string = god_string.removeprefix("a")
-            god = gods[list(gods.keys())[int(god_string[:2])]]
-            god.hp = int(god_string[2:4])
-            god.max_hp = int(god_string[4:6])
-            god.dmg = int(god_string[6:8])
-            god.visible = bool(int(god_string[8]))
-            god.alive = bool(int(god_string[9]))
-
-            effects_ = god_string[10:]
-            if effects_ != "":
-                effects_ = effects_.split("-")
-
-                for effect in effects_:
-                    effect = effect.split("|")
-                    name = effects[int(effect[0])]
-                    value = int(effect[1])
-                    duration = int(effect[2])
-
-                    god.add_effect(name, value, duration)
-
-            team.append(god)
-
-        return team
+        self._migrate()
+        self.writer = SaveWriter(f"{self.folder_path}/{self.db_file_name}", _UPSERT_SAVE, _DELETE_SAVE)
+
+    def _migrate(self):
+        """Add the columns of newer versions to an existing save table."""
+        columns = {row[1] for row in self.cursor.execute(f"PRAGMA table_info({SAVE_TABLE_NAME})")}
+        if "state" not in columns:
+            self.cursor.execute(f"ALTER TABLE {SAVE_TABLE_NAME} ADD COLUMN state BLOB")
+            self.conn.commit()
+
+    @staticmethod
+    def _save_row(channel, match) -> tuple:
+        """Values of _UPSERT_SAVE for the current state of a match."""
+        return (
+            channel, match.player1_id, match.player2_id, match.turn_state["current_player"],
+            match.turn_number, match.game_phase, match.solo_mode, encode_match(match),
+        )
 
     def create_game_save(self, channel, match):
-        player1_id = match.player1_id
-        player2_id = match.player2_id
-        player1_team = match.teams[player1_id]
-        player2_team = match.teams[player2_id]
-        current_turn_player_id = match.turn_state["current_player"]
-        turn_nr = match.turn_number
-        game_phase = match.game_phase
-        solo_mode = match.solo_mode
-
-        player1_team_string = self.encrypt_team(player1_team)
-        player2_team_string = self.encrypt_team(player2_team)
-
-        self.cursor.execute(f"""
-            INSERT INTO {SAVE_TABLE_NAME}(channel, player1, player1_team, player2, player2_team, current_turn_player_id, turn_nr, game_phase, solo_mode) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?);
-        """, [channel, player1_id, player1_team_string, player2_id, player2_team_string, current_turn_player_id, turn_nr, game_phase, solo_mode])
-
-        self.conn.commit()
+        self.update_game_save(channel, match)
 
     def update_game_save(self, channel, match):
-        player1_id = match.player1_id
-        player2_id = match.player2_id
-        player1_team = match.teams[player1_id]
-        player2_team = match.teams[player2_id]
-        current_turn_player_id = match.turn_state["current_player"]
-        turn_nr = match.turn_number
-
-        player1_team_string = self.encrypt_team(player1_team)
-        player2_team_string = self.encrypt_team(player2_team)
-
-        self.cursor.execute(f"""
-            UPDATE {SAVE_TABLE_NAME} SET player1_team=? WHERE channel=? AND player1=? AND player2=?
-        """, [player1_team_string, channel, player1_id, player2_id])
-        self.cursor.execute(f"""
-            UPDATE {SAVE_TABLE_NAME} SET player2_team=? WHERE channel=? AND player1=? AND player2=?
-        """, [player2_team_string, channel, player1_id, player2_id])
-        self.cursor.execute(f"""
-            UPDATE {SAVE_TABLE_NAME} SET current_turn_player_id=? WHERE channel=? AND player1=? AND player2=?
-        """, [current_turn_player_id, channel, player1_id, player2_id])
-        self.cursor.execute(f"""
-            UPDATE {SAVE_TABLE_NAME} SET turn_nr=? WHERE channel=? AND player1=? AND player2=?
-        """, [turn_nr, channel, player1_id, player2_id])
-
+        """Synchronous save (tools/benchmarks); the bot uses queue_game_save."""
+        self.cursor.execute(_UPSERT_SAVE, self._save_row(channel, match))
         self.conn.commit()
 
-    def delete_game_save(self, channel, match):
-        player1_id = match.player1_id
-        player2_id = match.player2_id
-
-        self.cursor.execute(f"""
-            DELETE FROM {SAVE_TABLE_NAME} WHERE channel=? AND player1=? AND player2=?
-        """, [channel, player1_id, player2_id])
-
+    def delete_game_save(self, channel, match=None):
+        self.cursor.execute(_DELETE_SAVE, [channel])
         self.conn.commit()
 
-    def load_all(self):
-        data = self.cursor.execute(f"""
-            SELECT * FROM {SAVE_TABLE_NAME}
-        """)
-
+    # ----------------- WRITE-BEHIND -----------------
+    def queue_game_save(self, channel, match):
+        """Save the match in the background (the latest queued state of a channel wins)."""
+        self.writer.put(channel, self._save_row(channel, match))
+
+    def queue_delete_game_save(self, channel):
+        self.writer.delete(channel)
+
+    _SELECT_SAVES = f"""
+        SELECT channel, player1, player1_team, player2, player2_team, current_turn_player_id,
+               turn_nr, game_phase, solo_mode, state
+        FROM {SAVE_TABLE_NAME}
+    """
+
+    @staticmethod
+    def _restore(game, match_factory):
+        """Build a match from a saves row (binary state or old team strings). None if unreadable."""
+        channel = game[0]
+        player_1_id = game[1]
+        player_2_id = game[3]
+        game_phase = game[7]
+        state = game[9]
+
+        match = match_factory(player_1_id, player_2_id)
+        try:
+            if state is not None:
+                decode_match(state, match)
+            else:
+                # Save of the old string format
+                match.teams = {player_1_id: decode_legacy_team(game[2]), player_2_id: decode_legacy_team(game[4])}
+                match.turn_number = game[6]
+                match.turn_state = {"current_player": game[5], "turn_number": game[6]}
+                match.solo_mode = game[8]
+        except Exception as e:
+            logger.error(f"Skipping unreadable save of channel {channel}: {e}")
+            return None
+
+        match.started = True
+        match.game_phase = game_phase
+        match.turn_in_progress = False
+        match.next_picker = match.turn_state["current_player"]
+        return match
+
+    def load_game(self, channel, match_factory=Match_Loaded):
+        """Restore the saved match of one channel (None if there is no usable save)."""
+        queued, row = self.writer.queued(channel)
+        if queued:
+            # the latest state is still in the write-behind queue (same values as the row it will write)
+            if row is None:
+                return None
+            channel, player1, player2, current_player, turn_nr, game_phase, solo_mode, state = row
+            game = (channel, player1, None, player2, None, current_player, turn_nr, game_phase, solo_mode, state)
+            return self._restore(game, match_factory)
+        game = self.cursor.execute(self._SELECT_SAVES + " WHERE channel=?", [channel]).fetchone()
+        if game is None:
+            return None
+        return self._restore(game, match_factory)
+
+    def load_all(self, match_factory=Match_Loaded):
         matches = {}
 
-        for game in data:
-            channel = game[0]
-            player_1_id = game[1]
-            player_1_team = self.decrypt_team(game[2])
-            player_2_id = game[3]
-            player_2_team = self.decrypt_team(game[4])
-            current_turn_player_id = game[5]
-
-            turn_nr = game[6]
-            game_phase = game[7]
-            solo_mode = game[8]
-            turn_in_progress = False
-
-            match = Match_Loaded(player_1_id, player_2_id)
-            match.started = True
-            match.teams = {player_1_id: player_1_team, player_2_id: player_2_team}
-            match.turn_number = turn_nr
-            match.game_phase = game_phase
-
-            match.turn_state = {"current_player": current_turn_player_id, "turn_number": turn_nr}
-            match.solo_mode = solo_mode
-            match.turn_in_progress = turn_in_progress
-
-            matches[channel] = match
+        for game in self.cursor.execute(self._SELECT_SAVES).fetchall():
+            match = self._restore(game, match_factory)
+            if match is not None:
+                matches[game[0]] = match
 
         return matches
 
     def close(self):
+        self.writer.close()
         self.conn.close()
 
 db_manager = DB_Manager()
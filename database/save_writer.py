@@ -0,0 +1,104 @@
+import sqlite3
+import threading
+import time
+import logging
+
+from bot.metrics import timed_store_call
+
+logger = logging.getLogger(__name__)
+
+_DELETE = object()  # pending marker of a deleted save
+
+
+class SaveWriter:
+    """
+    Write-behind queue for the saves table, drained by one daemon thread with its own connection.
+    Only the latest pending write of a channel is kept, so a burst of turns costs one
+    UPSERT per channel; the event loop only pays for encoding the row.
+    """
+
+    def __init__(self, db_path: str, upsert_sql: str, delete_sql: str):
+        self.db_path = db_path
+        self.upsert_sql = upsert_sql
+        self.delete_sql = delete_sql
+        self._pending = {}  # channel -> row tuple or _DELETE
+        self._writing = {}  # batch being written by the thread
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+        self._thread = None
+        self.writes = 0
+        self.coalesced = 0
+
+    def put(self, channel, row: tuple):
+        self._queue(channel, row)
+
+    def delete(self, channel):
+        self._queue(channel, _DELETE)
+
+    def _queue(self, channel, item):
+        with self._cond:
+            if self._closed:
+                logger.warning(f"Save writer closed, dropping write of channel {channel}")
+                return
+            if channel in self._pending:
+                self.coalesced += 1
+            self._pending[channel] = item
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def queued(self, channel) -> tuple[bool, tuple | None]:
+        """(True, row) or (True, None) for a delete if a write of channel is not on disk yet, else (False, None)."""
+        with self._cond:
+            for writes in (self._pending, self._writing):
+                if channel in writes:
+                    item = writes[channel]
+                    return True, None if item is _DELETE else item
+        return False, None
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every queued write is on disk. Returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def close(self, timeout: float | None = 10):
+        """Write what is still queued, then stop the thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        try:
+            while True:
+                with self._cond:
+                    self._cond.wait_for(lambda: self._pending or self._closed)
+                    if not self._pending:
+                        break
+                    batch, self._pending = self._pending, {}
+                    self._writing = batch
+                    self._busy = True
+                start = time.perf_counter()
+                try:
+                    with conn:  # one transaction per batch
+                        for channel, item in batch.items():
+                            if item is _DELETE:
+                                conn.execute(self.delete_sql, (channel,))
+                            else:
+                                conn.execute(self.upsert_sql, item)
+                    self.writes += len(batch)
+                    timed_store_call("sqlite_saves", "write_batch", start)
+                except Exception as e:
+                    logger.error(f"Failed to write {len(batch)} game saves: {e}")
+                finally:
+                    with self._cond:
+                        self._writing = {}
+                        self._busy = False
+                        self._cond.notify_all()
+        finally:
+            conn.close()
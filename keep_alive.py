@@ -1,7 +1,10 @@
-from flask import Flask, render_template_string
+from flask import Flask, Response, render_template_string
 import threading
 import logging
 
+from bot.config import Config
+from bot.metrics import metrics
+
 # Configure logging for Flask
 logging.getLogger('werkzeug').setLevel(logging.WARNING)
 
@@ -108,12 +111,17 @@ def health():
     """Health check endpoint."""
     return {'status': 'healthy', 'service': 'maggod-fight-bot'}
 
-def run():
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus metrics of this bot process."""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+def run(port=Config.KEEP_ALIVE_PORT):
     """Run the Flask app."""
-    app.run(host='0.0.0.0', port=5000, debug=False, use_reloader=False)
+    app.run(host='0.0.0.0', port=port, debug=False, use_reloader=False)
 
-def keep_alive():
+def keep_alive(port=Config.KEEP_ALIVE_PORT):
     """Start the keep alive server in a separate thread."""
-    t = threading.Thread(target=run)
+    t = threading.Thread(target=run, args=(port,))
     t.daemon = True
     t.start()
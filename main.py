@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import multiprocessing
 import os
 import discord
 from discord.ext import commands
@@ -8,70 +9,63 @@ from datetime import timezone
 
 # Import bot components
 from bot.config import Config
-from bot.utils import setup_logging, BotStats
+from bot.utils import setup_logging, BotStats, lobby_status_board
+from bot.bot_class import Match  # noqa: F401 (kept importable from main)
+from bot.bot_executor import bot_executor
+from bot.outbound import outbound
+from bot.match_registry import match_registry
+from bot.metrics import metrics, discord_http_trace
+from utils.matchups import get_matchup_table
+from utils.odds import schedule_odds_refresh
+from currency.money_manager import money_manager
+from database.manager import db_manager
+from database.broker import queue_broker
 from bot.events import setup_events
 from bot.commands import setup_commands
 
 # Import keep alive
 from keep_alive import keep_alive
 
-from currency.money_manager import MoneyManager
-
 # Initialize logging
 setup_logging()
 logger = logging.getLogger(__name__)
  
-class Match:
-    """Represents a single Maggod Fight match."""
-    def __init__(self, player1_id=None, player2_id=None):
-        self.player1_id = player1_id #str
-        self.player1_name = "Player 1" #str
-        self.player2_id = player2_id #str
-        self.player2_name = "Player 2" #str
-        self.started = False #bool
-        self.teams = {} #List in dict {Player_id : [Gods]}
-        self.gods = {} # copy of all the gods (no modification of the initial dict)
-        self.available_gods = [] # list of all the remaining gods (used during team building)
-        self.picked_gods = {}
-        self.next_picker = None # str (player id or "bot")
-        self.current_turn_player = None 
-        self.turn_number = 0
-        self.teams_initialized = False
-        self.game_phase = "Waiting for first player"  # Waiting for second player,ready, building, playing, finished
-
-        self.current_attacking_team = None
-        self.turn_state = {
-            "current_player": None,
-            "turn_number": 1
-        }
-        self.solo_mode = False
-        self.turn_in_progress = False
-        self.start_view = False
-        self.DEBUG_SKIP_BUILD = False
-        self.ai_bot_name = "random" 
-        self.money_sys_type = "2 players"
-        self.bot_type = "random"
-        self.gamb_bet = 0
-        self.gamb_gain = 0
-
-        self.compact_mode = False # whether to use compact display mode
-
-class MaggodFightBot(commands.Bot):
-    """Main bot class for Maggod Fight."""
+def shard_plan(worker_index: int = 0) -> tuple[list[int] | None, int | None]:
+    """
+    (shard_ids, shard_count) of one worker process. Worker i runs shards i, i + n, i + 2n...
+    of the n = WORKER_PROCESSES processes; one process runs every shard (None lets Discord pick the count).
+    """
+    workers = Config.WORKER_PROCESSES
+    if workers <= 1:
+        return None, Config.SHARD_COUNT or None
+    shard_count = max(Config.SHARD_COUNT, workers)
+    return list(range(worker_index, shard_count, workers)), shard_count
+
+
+class MaggodFightBot(commands.AutoShardedBot):
+    """
+    Main bot class for Maggod Fight. Discord sends the events of a guild to one shard only, so the
+    worker process running that shard owns the matches of the guild's channels.
+    """
     
-    def __init__(self):
+    def __init__(self, worker_index: int = 0):
         # Configure intents
         intents = discord.Intents.default()
         intents.message_content = True
         intents.guilds = True
         intents.guild_messages = True
         
+        shard_ids, shard_count = shard_plan(worker_index)
         super().__init__(
             command_prefix=Config.COMMAND_PREFIX,
             intents=intents,
             help_command=None,
-            case_insensitive=True
+            case_insensitive=True,
+            shard_ids=shard_ids,
+            shard_count=shard_count,
+            http_trace=discord_http_trace()  # Discord request and 429 counters of /metrics
         )
+        self.worker_index = worker_index
         
         # Bot statistics
         self.stats = BotStats()
@@ -79,11 +73,25 @@ class MaggodFightBot(commands.Bot):
 
         # Guard so we only sync commands once, even if on_ready fires again
         # (e.g. after a reconnect), since resyncing repeatedly wastes rate limit.
-        self._commands_synced = False
+        # Global commands are synced by the first worker only.
+        self._commands_synced = worker_index != 0 and not Config.SYNC_GUILD_ONLY
+
+    def owns_guild(self, guild_id: int) -> bool:
+        """Whether the guild's events reach this process (Discord routes a guild to shard (id >> 22) % shard_count)."""
+        if self.shard_ids is None:
+            return True
+        return (guild_id >> 22) % self.shard_count in self.shard_ids
         
     async def setup_hook(self):
         """Setup hook called when bot is starting."""
         logger.info("Bot is starting up...")
+        get_matchup_table()  # read the precomputed matchup table once
+        if self.worker_index == 0:
+            schedule_odds_refresh()  # re-simulates the gambling odds if the god stats changed
+        match_registry.start_sweeper(self)  # evicts matches idle for Config.MATCH_IDLE_TTL
+        metrics.collectors.append(match_registry.export_metrics)
+        metrics.start_collector()  # event loop lag and active matches of /metrics
+        lobby_status_board.start(self)  # shares the lobby status between worker processes
         
     
         # Load all cogs
@@ -123,7 +131,7 @@ class MaggodFightBot(commands.Bot):
     async def on_ready(self):
         self.start_time = datetime.now(timezone.utc)
         logger.info(f"{self.user} has connected to Discord!")
-        logger.info(f"Bot is in {len(self.guilds)} guilds")
+        logger.info(f"Bot is in {len(self.guilds)} guilds (worker {self.worker_index}, shards {sorted(self.shards)})")
 
         # Sync the command tree now that guild data has actually arrived.
         if Config.SYNC_COMMANDS and not self._commands_synced:
@@ -154,6 +162,8 @@ class MaggodFightBot(commands.Bot):
         try:
             # Wait until bot is ready (self is already the bot)
             # await self.wait_until_ready()  # optional, on_ready implies ready
+            if not self.owns_guild(Config.ANNOUNCE_GUILD_ID):
+                return  # announced by the worker running that guild's shard
 
             guild = self.get_guild(Config.ANNOUNCE_GUILD_ID)
             if guild is None:
@@ -169,8 +179,8 @@ class MaggodFightBot(commands.Bot):
         except Exception as e:
             logger.error(f"Failed to send online message: {e}")
 
-async def main():
-    """Main function to run the bot."""
+async def main(worker_index: int = 0):
+    """Main function to run the bot (one worker process)."""
     # Validate configuration
     try:
         Config.validate()
@@ -178,11 +188,11 @@ async def main():
         logger.error(f"Configuration error: {e}")
         return
     
-    # Start keep alive server
-    keep_alive()
+    # Start keep alive server (each worker serves its own /metrics on the next port)
+    keep_alive(Config.KEEP_ALIVE_PORT + worker_index)
     
     # Create and run bot
-    bot = MaggodFightBot()
+    bot = MaggodFightBot(worker_index)
     
     try:
         await bot.start(Config.DISCORD_TOKEN)
@@ -192,6 +202,28 @@ async def main():
         logger.error(f"Bot encountered an error: {e}")
     finally:
         await bot.close()
+        bot_executor.shutdown()
+        outbound.shutdown()
+        await money_manager.close()
+        queue_broker.close()
+        db_manager.close()  # flushes the queued game saves
+
+
+def run_worker(worker_index: int):
+    asyncio.run(main(worker_index))
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    if Config.WORKER_PROCESSES > 1:
+        # one process per core, each running its share of the shards (see shard_plan)
+        context = multiprocessing.get_context("spawn")
+        workers = [
+            context.Process(target=run_worker, args=(i,), name=f"maggod-worker-{i}")
+            for i in range(Config.WORKER_PROCESSES)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    else:
+        asyncio.run(main())
\ No newline at end of file
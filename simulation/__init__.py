@@ -0,0 +1,13 @@
+"""
+Simulation package for the Maggod Fight Discord bot.
+
+This package runs full matches without Discord so the god roster can be
+balanced from data:
+
+- engine: Headless turn/match execution on top of the game utilities
+- tournament: Multiprocess runner playing every 5-god team (python -m simulation.tournament)
+- matchups: Builds the god matchup table used at runtime (python -m simulation.matchups)
+- odds: Simulates the gambling configurations for the payouts (python -m simulation.odds)
+- report: CSV/XLSX writers for simulation results
+- __main__: Command line entry point (python -m simulation)
+"""
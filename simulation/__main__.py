@@ -0,0 +1,20 @@
+import argparse
+
+from bot.bot_class import bot_configs
+from simulation.engine import simulate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless Maggod Fight matches and report per-god win rates.")
+    parser.add_argument("--games", type=int, default=10000, help="number of matches to play")
+    parser.add_argument("--bot1", default="random", choices=list(bot_configs), help="bot driving team 1")
+    parser.add_argument("--bot2", default="random", choices=list(bot_configs), help="bot driving team 2")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for reproducible runs")
+    args = parser.parse_args()
+
+    stats = simulate(args.games, args.bot1, args.bot2, seed=args.seed)
+    print(stats.format_table())
+
+
+if __name__ == "__main__":
+    main()
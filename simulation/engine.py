@@ -0,0 +1,251 @@
+import random
+import logging
+import time
+
+from bot.bot_class import BotClass, TurnContext
+from utils.gameplay_tag import God, EffectType
+from utils.game_test_on_discord import (
+    gods as all_gods_template, new_gods,
+    get_visible, get_alive, get_dead, set_first_god_visible,
+    became_visible_gain_effect, action_befor_delete_effect, action_befor_die,
+)
+
+logger = logging.getLogger(__name__)
+
+TEAM_SIZE = 5
+MAX_TURNS = 400  # safety cap, a match that runs longer is counted as a draw
+
+
+def new_roster() -> list[God]:
+    """Return fresh God instances for every god of the template (no shared state)."""
+    return new_gods()
+
+
+def bot_chooser(bot_name: str):
+    """Build a chooser that picks like the bot does in cogs.turn (fresh BotClass per prompt)."""
+    def choose(team1, team2, selectable, action_text):
+        if not selectable:
+            return None
+        return BotClass(bot_name).choose_god(TurnContext(selectable, team1, team2, action_text))
+    return choose
+
+
+def execute_turn(attack_team: list, defend_team: list, choose) -> bool:
+    """
+    Play one turn for the attacking team, mirroring Turn.execute_turn without Discord.
+    choose(team1, team2, selectable, action_text) returns the picked god (or None).
+    Returns True if the game ended.
+    """
+    # Ensure at least one god is visible on each team
+    set_first_god_visible(attack_team)
+    set_first_god_visible(defend_team)
+
+    visible_attackers = get_visible(attack_team)
+    alive_attackers = get_alive(attack_team, True)
+    if not visible_attackers:
+        return False
+
+    # Select attacker (a fully stunned team can't pick anyone and skips its turn)
+    attacker = choose(attack_team, defend_team, alive_attackers, "attack with")
+    if not attacker:
+        return False
+
+    # Select target
+    visible_defenders = get_visible(defend_team)
+    buffed_ally = next(
+        (god for god in defend_team
+         if god.has_effect(EffectType.CERBERUS_MORE_MAX_HP) and god.alive),
+        None
+    )
+    attacked = buffed_ally
+    if not buffed_ally:
+        if not visible_defenders:
+            return False
+        if attacker.name == "aphrodite":
+            attacked = choose(defend_team, attack_team, get_alive(defend_team), "attack")
+        else:
+            attacked = choose(defend_team, attack_team, visible_defenders, "attack")
+        if not attacked:
+            return False
+
+    # Make attacker visible if not already
+    if not attacker.visible:
+        attacker.visible = True
+        became_visible_gain_effect(attack_team, attacker)
+
+    # Handle god-specific ability targeting
+    target = attacked
+    attacker_1 = None
+    attacker_2 = None
+
+    if attacker.name == "charon":
+        visible_allies = get_visible(attack_team)
+        if visible_allies:
+            target = choose(attack_team, defend_team, visible_allies, "protect")
+    elif attacker.name == "persephone":
+        if attack_team:
+            target = choose(attack_team, defend_team, attack_team, "revive/heal")
+    elif attacker.name == "hecate":
+        visible_allies = get_visible(attack_team)
+        if visible_allies:
+            target = choose(attack_team, defend_team, visible_allies, "make invisible")
+    elif attacker.name == "cerberus":
+        visible_allies = get_visible(attack_team)
+        if visible_allies:
+            target = choose(attack_team, defend_team, visible_allies, "give attract⛑️")
+    elif attacker.name == "hermes":
+        visible_allies = get_visible(attack_team, True)
+        if len(visible_allies) > 1:
+            other_gods = [g for g in visible_allies if g.name != "hermes"]
+            if other_gods:
+                attacker_1 = choose(attack_team, defend_team, other_gods, "attack with (1st)")
+                if len(other_gods) > 1:
+                    remaining_gods = [g for g in other_gods if g != attacker_1]
+                    if remaining_gods:
+                        attacker_2 = choose(attack_team, defend_team, remaining_gods, "attack with (2nd)")
+
+    # Execute the attack and the ability
+    try:
+        damage = attacker.do_damage()
+        attacker.visible = True
+        attacked.get_dmg(value=damage)
+
+        ability_params = {
+            "visible_gods": get_visible(attack_team),
+            "target": target,
+            "ennemy_team": get_alive(defend_team),
+            "visible_ennemy_team": get_visible(defend_team),
+            "self": attacker,
+            "ally_team": get_alive(attack_team),
+            "attacker_1": attacker_1,
+            "attacker_2": attacker_2,
+            "dead_ally": get_dead(attack_team),
+        }
+        if attacker.check_abillity():
+            attacker.ability(ability_params)
+    except Exception as e:
+        logger.debug(f"Error executing ability for {attacker.name}: {e}")
+
+    # Clean up effects and handle deaths
+    action_befor_delete_effect(attack_team)
+    action_befor_delete_effect(defend_team)
+    action_befor_die(defend_team, attack_team)
+    action_befor_delete_effect(defend_team)
+    action_befor_die(attack_team, defend_team)
+
+    # Update effects
+    for god in attack_team + defend_team:
+        god.update_effects()
+
+    team1_alive = any(god.alive for god in attack_team)
+    team2_alive = any(god.alive for god in defend_team)
+    return not team1_alive or not team2_alive
+
+
+def play_match(team1: list, team2: list, choose1, choose2, first: int | None = None, rng=random) -> int:
+    """
+    Play a full match between two teams, mirroring the /do loop in cogs.turn.
+    Returns 1 if team1 wins, 2 if team2 wins, 0 for a draw.
+    """
+    current = first if first in (1, 2) else rng.choice([1, 2])
+    for _ in range(MAX_TURNS):
+        if current == 1:
+            game_ended = execute_turn(team1, team2, choose1)
+        else:
+            game_ended = execute_turn(team2, team1, choose2)
+        if game_ended:
+            break
+        current = 2 if current == 1 else 1
+
+    team1_alive = any(god.alive for god in team1)
+    team2_alive = any(god.alive for god in team2)
+    if team1_alive and not team2_alive:
+        return 1
+    if team2_alive and not team1_alive:
+        return 2
+    return 0
+
+
+class SimulationStats:
+    """Per-god appearance/win counters collected over many simulated matches."""
+
+    def __init__(self):
+        self.games = 0
+        self.draws = 0
+        self.errors = 0
+        self.wins_by_side = {1: 0, 2: 0}
+        self.appearances = {name: 0 for name in all_gods_template}
+        self.wins = {name: 0 for name in all_gods_template}
+        self.elapsed = 0.0
+
+    def record(self, team1: list, team2: list, result: int):
+        """Record the outcome of one match."""
+        self.games += 1
+        for god in team1 + team2:
+            self.appearances[god.name] += 1
+        if result == 0:
+            self.draws += 1
+            return
+        self.wins_by_side[result] += 1
+        for god in (team1 if result == 1 else team2):
+            self.wins[god.name] += 1
+
+    def merge(self, other: "SimulationStats"):
+        """Add the counters of another run to this one."""
+        self.games += other.games
+        self.draws += other.draws
+        self.errors += other.errors
+        self.elapsed = max(self.elapsed, other.elapsed)
+        for side in self.wins_by_side:
+            self.wins_by_side[side] += other.wins_by_side[side]
+        for name in self.appearances:
+            self.appearances[name] += other.appearances.get(name, 0)
+            self.wins[name] += other.wins.get(name, 0)
+
+    def win_rates(self) -> dict[str, float]:
+        """Win rate of every god over the matches it played in (draws count as non-wins)."""
+        return {
+            name: (self.wins[name] / self.appearances[name]) if self.appearances[name] else 0.0
+            for name in self.appearances
+        }
+
+    def format_table(self) -> str:
+        """Return a text table of gods sorted best->worst."""
+        rates = self.win_rates()
+        lines = [f"{'god':<12}{'games':>8}{'wins':>8}{'win%':>8}"]
+        for name, rate in sorted(rates.items(), key=lambda kv: kv[1], reverse=True):
+            lines.append(f"{name:<12}{self.appearances[name]:>8}{self.wins[name]:>8}{rate * 100:>7.1f}%")
+        speed = self.games / self.elapsed * 60 if self.elapsed else 0
+        lines.append(
+            f"\n{self.games} games, team1 {self.wins_by_side[1]} / team2 {self.wins_by_side[2]} / "
+            f"draws {self.draws}, errors {self.errors} ({speed:,.0f} games/min)"
+        )
+        return "\n".join(lines)
+
+
+def simulate(games: int, bot1: str = "random", bot2: str = "random", seed: int | None = None) -> SimulationStats:
+    """
+    Play `games` matches between random 5-god teams (drawn like the skip-build mode).
+    team1 is driven by bot1 and team2 by bot2.
+    """
+    if seed is not None:
+        random.seed(seed)
+    choose1 = bot_chooser(bot1)
+    choose2 = bot_chooser(bot2)
+    stats = SimulationStats()
+    start = time.perf_counter()
+    for _ in range(games):
+        roster = new_roster()
+        random.shuffle(roster)
+        team1 = roster[:TEAM_SIZE]
+        team2 = roster[TEAM_SIZE:TEAM_SIZE * 2]
+        try:
+            result = play_match(team1, team2, choose1, choose2)
+        except Exception as e:
+            # Same situation as the /do error path: the match is abandoned
+            logger.debug(f"Simulated match crashed: {e}")
+            stats.errors += 1
+            continue
+        stats.record(team1, team2, result)
+    stats.elapsed = time.perf_counter() - start
+    return stats
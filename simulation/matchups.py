@@ -0,0 +1,106 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from bot.bot_class import bot_configs
+from simulation.engine import TEAM_SIZE, new_roster, bot_chooser, play_match
+from utils.game_test_on_discord import gods as all_gods_template
+from utils.matchups import MATCHUP_TABLE_PATH, MatchupTable, roster_signature
+
+GOD_NAMES = list(all_gods_template.keys())
+SHARD_GAMES = 2000  # fixed so shard seeds don't depend on the number of CPU cores
+
+
+def run_shard(spec: dict) -> dict:
+    """Play random 5v5 matches and count games/wins per god, god pair and god-vs-god."""
+    rng = random.Random(f"{spec['seed']}-{spec['shard_id']}")
+    random.seed(f"{spec['seed']}-{spec['shard_id']}")  # the bots use the global generator
+    choose1 = bot_chooser(spec["bot1"])
+    choose2 = bot_chooser(spec["bot2"])
+    n = len(GOD_NAMES)
+
+    games = np.zeros(n)
+    wins = np.zeros(n)
+    duel_games = np.zeros((n, n))
+    duel_wins = np.zeros((n, n))
+    pair_games = np.zeros((n, n))
+    pair_wins = np.zeros((n, n))
+    errors = 0
+    for game in range(spec["games"]):
+        ids = rng.sample(range(n), 2 * TEAM_SIZE)
+        ids1, ids2 = ids[:TEAM_SIZE], ids[TEAM_SIZE:]
+        roster = new_roster()
+        try:
+            result = play_match([roster[i] for i in ids1], [roster[i] for i in ids2],
+                                choose1, choose2, first=1 + game % 2, rng=rng)
+        except Exception:
+            errors += 1
+            continue
+        score1 = 1.0 if result == 1 else 0.5 if result == 0 else 0.0
+        for team, other, score in ((ids1, ids2, score1), (ids2, ids1, 1.0 - score1)):
+            games[team] += 1
+            wins[team] += score
+            duel_games[np.ix_(team, other)] += 1
+            duel_wins[np.ix_(team, other)] += score
+            pair_games[np.ix_(team, team)] += 1
+            pair_wins[np.ix_(team, team)] += score
+    return {"games": games, "wins": wins, "duel_games": duel_games, "duel_wins": duel_wins,
+            "pair_games": pair_games, "pair_wins": pair_wins, "errors": errors}
+
+
+def build_table(games: int, bot1: str = "random", bot2: str = "random", seed: int = 0,
+                workers: int | None = None) -> tuple[MatchupTable, dict]:
+    """Simulate `games` matches over a process pool and turn the counters into a MatchupTable."""
+    specs = [
+        {"shard_id": shard_id, "games": min(SHARD_GAMES, games - start), "bot1": bot1, "bot2": bot2, "seed": seed}
+        for shard_id, start in enumerate(range(0, games, SHARD_GAMES))
+    ]
+    totals = None
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        for shard in executor.map(run_shard, specs):
+            if totals is None:
+                totals = shard
+            else:
+                for key in totals:
+                    totals[key] = totals[key] + shard[key]
+    totals["elapsed"] = time.perf_counter() - start
+
+    def rate(wins, played):
+        return np.divide(wins, played, out=np.full_like(wins, 0.5), where=played > 0)
+
+    table = MatchupTable(
+        GOD_NAMES,
+        strength=rate(totals["wins"], totals["games"]),
+        duel=rate(totals["duel_wins"], totals["duel_games"]),
+        synergy=rate(totals["pair_wins"], totals["pair_games"]),
+        games=games - totals["errors"],
+        signature=roster_signature(),
+    )
+    return table, totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the god matchup table used by the bot at runtime.")
+    parser.add_argument("--games", type=int, default=200_000, help="random 5v5 matches to simulate")
+    parser.add_argument("--bot1", default="random", choices=list(bot_configs), help="bot driving team 1")
+    parser.add_argument("--bot2", default="random", choices=list(bot_configs), help="bot driving team 2")
+    parser.add_argument("--seed", type=int, default=0, help="base seed (each shard derives its own)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--out", default=MATCHUP_TABLE_PATH, help="output .npz file")
+    args = parser.parse_args()
+
+    table, totals = build_table(args.games, args.bot1, args.bot2, seed=args.seed, workers=args.workers)
+    table.save(args.out)
+
+    for name in table.name_order():
+        print(f"{name:<12}{table.strength[table.index[name]] * 100:>6.1f}%")
+    print(f"\n{table.games} games ({totals['errors']} errors) in {totals['elapsed']:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+
+from bot.bot_class import bot_configs
+from simulation.engine import new_roster, bot_chooser, play_match
+from utils.odds import ODDS_TABLE_PATH, VAR_VALUES, GAMBLING_BOTS, PLAYER_BOT, OddsTable, odds_signature, true_gain
+from utils.team_assign import assign_gods
+
+PLAYER_ID, BOT_ID = 1, 2
+
+
+def run_config(spec: dict) -> tuple[int, int, int]:
+    """Deal teams like the gambling menu does and count the player's wins for one configuration."""
+    rng = random.Random(f"{spec['seed']}-{spec['bot']}-{spec['your_var']}-{spec['enemy_var']}")
+    random.seed(f"{spec['seed']}-{spec['bot']}-{spec['your_var']}-{spec['enemy_var']}")  # the bots use the global generator
+    choose_player = bot_chooser(spec["player_bot"])
+    choose_bot = bot_chooser(spec["bot"])
+    wins = errors = 0
+    for game in range(spec["games"]):
+        roster = new_roster()
+        match = SimpleNamespace(gods=roster, available_gods=list(roster), teams={},
+                                player1_id=PLAYER_ID, player2_id=BOT_ID)
+        # same call as cogs.gambling: the enemy slider is from the player's point of view
+        team_player, team_bot = assign_gods(match, spec["your_var"], -spec["enemy_var"], rng=rng)
+        try:
+            result = play_match(team_player, team_bot, choose_player, choose_bot, first=1 + game % 2, rng=rng)
+        except Exception:
+            errors += 1
+            continue
+        wins += result == 1  # a draw loses the bet
+    return wins, spec["games"] - errors, errors
+
+
+def build_odds_table(games_per_config: int, bot_types: list[str] = GAMBLING_BOTS, seed: int = 0,
+                     workers: int | None = None, player_bot: str = PLAYER_BOT) -> OddsTable:
+    """Simulate every (bot, your_var, enemy_var) configuration; workers=1 runs in this process."""
+    specs = [
+        {"bot": bot, "your_var": your_var, "enemy_var": enemy_var, "games": games_per_config,
+         "player_bot": player_bot, "seed": seed}
+        for bot in bot_types for your_var in VAR_VALUES for enemy_var in VAR_VALUES
+    ]
+    if workers == 1:
+        results = list(map(run_config, specs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            results = list(executor.map(run_config, specs, chunksize=4))
+
+    wins = np.array([r[0] for r in results], dtype=np.float64)
+    played = np.array([r[1] for r in results], dtype=np.float64)
+    # add-one smoothing: a configuration never (or always) won still gets a finite price
+    win_prob = ((wins + 1) / (played + 2)).reshape(len(bot_types), len(VAR_VALUES), len(VAR_VALUES))
+    return OddsTable(bot_types, win_prob, games_per_config, odds_signature())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate the win probability of every gambling configuration.")
+    parser.add_argument("--games", type=int, default=1000, help="games per (bot, your_var, enemy_var) configuration")
+    parser.add_argument("--bots", nargs="+", default=GAMBLING_BOTS, choices=list(bot_configs), help="opponent bots")
+    parser.add_argument("--player-bot", default=PLAYER_BOT, choices=list(bot_configs), help="bot playing the human side")
+    parser.add_argument("--seed", type=int, default=0, help="base seed (each configuration derives its own)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--out", default=ODDS_TABLE_PATH, help="output .npz file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    table = build_odds_table(args.games, args.bots, seed=args.seed, workers=args.workers, player_bot=args.player_bot)
+    table.save(args.out)
+
+    for bot in table.bot_types:
+        print(f"\n{bot}: win chance / gain for a 100 bet at 1000 wealth (rows your_var, columns enemy_var)")
+        print("    " + "".join(f"{e:>13}" for e in VAR_VALUES))
+        for y in VAR_VALUES:
+            cells = (f"{table.win_probability(y, e, bot) * 100:>5.1f}%/{true_gain(y, e, 100, 1000, bot, table):>6}"
+                     for e in VAR_VALUES)
+            print(f"{y:>4}" + "".join(f"{c:>13}" for c in cells))
+    print(f"\n{len(table.bot_types) * len(VAR_VALUES) ** 2 * args.games} games in "
+          f"{time.perf_counter() - start:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import argparse
+import json
+import math
+import os
+import random
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+from bot.bot_class import bot_configs
+from simulation.engine import TEAM_SIZE, new_roster, bot_chooser, play_match
+from simulation.report import write_csv, write_xlsx
+from utils.game_test_on_discord import gods as all_gods_template
+
+GOD_NAMES = list(all_gods_template.keys())
+ALL_TEAMS = list(combinations(range(len(GOD_NAMES)), TEAM_SIZE))  # C(20,5) = 15504 teams
+SHARD_SIZE = 256  # fixed so shard seeds don't depend on the number of CPU cores
+
+
+def sample_opponents(count: int, seed: int) -> list[tuple]:
+    """Deterministically sample the opponent set every team plays against."""
+    rng = random.Random(f"opponents-{seed}")
+    return rng.sample(ALL_TEAMS, count)
+
+
+def run_shard(spec: dict) -> dict:
+    """
+    Play every team of the shard against every disjoint opponent.
+    Runs in a worker process; seeding is per shard so any run can be reproduced.
+    """
+    random.seed(f"{spec['seed']}-{spec['shard_id']}")
+    choose1 = bot_chooser(spec["bot1"])
+    choose2 = bot_chooser(spec["bot2"])
+    opponents = spec["opponents"]
+    games_per_pair = spec["games_per_pair"]
+    n = len(GOD_NAMES)
+
+    god_games = [[0] * n for _ in range(n)]
+    god_wins = [[0.0] * n for _ in range(n)]
+    rows = []
+    for team_id in spec["team_ids"]:
+        team_ids = ALL_TEAMS[team_id]
+        scores = []
+        for opp_ids in opponents:
+            if set(team_ids) & set(opp_ids):
+                scores.append(None)
+                continue
+            score = 0.0
+            for game in range(games_per_pair):
+                roster = new_roster()
+                team1 = [roster[i] for i in team_ids]
+                team2 = [roster[i] for i in opp_ids]
+                random.shuffle(team1)
+                random.shuffle(team2)
+                try:
+                    result = play_match(team1, team2, choose1, choose2, first=1 + game % 2)
+                except Exception:
+                    result = 0
+                score += 1.0 if result == 1 else 0.5 if result == 0 else 0.0
+            scores.append(score / games_per_pair)
+            for a in team_ids:
+                for b in opp_ids:
+                    god_games[a][b] += games_per_pair
+                    god_wins[a][b] += score
+        rows.append((team_id, scores))
+    return {"rows": rows, "god_games": god_games, "god_wins": god_wins}
+
+
+def run_tournament(opponents: int = 16, games_per_pair: int = 2, bot1: str = "random", bot2: str = "random",
+                   seed: int = 0, workers: int | None = None, limit_teams: int | None = None) -> dict:
+    """Shard all teams over a process pool and merge the shard results."""
+    opponent_set = sample_opponents(opponents, seed)
+    team_ids = list(range(len(ALL_TEAMS)))[:limit_teams]
+    specs = [
+        {
+            "shard_id": shard_id,
+            "team_ids": team_ids[start:start + SHARD_SIZE],
+            "opponents": opponent_set,
+            "games_per_pair": games_per_pair,
+            "bot1": bot1,
+            "bot2": bot2,
+            "seed": seed,
+        }
+        for shard_id, start in enumerate(range(0, len(team_ids), SHARD_SIZE))
+    ]
+
+    n = len(GOD_NAMES)
+    merged = {
+        "opponents": opponent_set,
+        "rows": [],
+        "god_games": [[0] * n for _ in range(n)],
+        "god_wins": [[0.0] * n for _ in range(n)],
+    }
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        for shard in executor.map(run_shard, specs):
+            merged["rows"].extend(shard["rows"])
+            for a in range(n):
+                for b in range(n):
+                    merged["god_games"][a][b] += shard["god_games"][a][b]
+                    merged["god_wins"][a][b] += shard["god_wins"][a][b]
+    merged["elapsed"] = time.perf_counter() - start
+    merged["games"] = sum(
+        games_per_pair for _, scores in merged["rows"] for s in scores if s is not None
+    )
+    return merged
+
+
+def god_win_rates(result: dict) -> dict[str, float]:
+    """Average win rate of the teams each god was part of."""
+    rates = {}
+    for a, name in enumerate(GOD_NAMES):
+        games = sum(result["god_games"][a])
+        wins = sum(result["god_wins"][a])
+        rates[name] = wins / games if games else 0.0
+    return rates
+
+
+def mmr_from_rate(rate: float) -> int:
+    """Elo-style rating for a win rate against the field (1500 = average)."""
+    rate = min(max(rate, 0.01), 0.99)
+    return round(1500 + 400 * math.log10(rate / (1 - rate)))
+
+
+def write_results(result: dict, out_dir: str) -> list[str]:
+    """Write the win-rate matrices, the name order and the MMR sheet. Returns the new name order."""
+    os.makedirs(out_dir, exist_ok=True)
+    rates = god_win_rates(result)
+    name_order = sorted(GOD_NAMES, key=lambda name: rates[name], reverse=True)
+
+    opp_labels = ["+".join(GOD_NAMES[i] for i in opp) for opp in result["opponents"]]
+    team_rows = [["team"] + opp_labels]
+    for team_id, scores in sorted(result["rows"]):
+        label = "+".join(GOD_NAMES[i] for i in ALL_TEAMS[team_id])
+        team_rows.append([label] + ["" if s is None else round(s, 3) for s in scores])
+    write_csv(os.path.join(out_dir, "team_matrix.csv"), team_rows)
+
+    god_rows = [["god"] + GOD_NAMES]
+    for a, name in enumerate(GOD_NAMES):
+        row = [name]
+        for b in range(len(GOD_NAMES)):
+            games = result["god_games"][a][b]
+            row.append(round(result["god_wins"][a][b] / games, 3) if games else "")
+        god_rows.append(row)
+    write_csv(os.path.join(out_dir, "god_matrix.csv"), god_rows)
+
+    with open(os.path.join(out_dir, "name_order.json"), "w", encoding="utf-8") as f:
+        json.dump({"name_order": name_order, "win_rates": rates}, f, indent=2)
+
+    write_xlsx(os.path.join(out_dir, "MMR_balance.xlsx"), mmr_rows(name_order, rates), sheet_name="MMR")
+    return name_order
+
+
+def mmr_rows(name_order: list[str], rates: dict[str, float]) -> list[list]:
+    rows = [["Name", "HP", "DMG", "Win %", "MMR"]]
+    for name in name_order:
+        god = all_gods_template[name]
+        rows.append([name, god.max_hp, god.dmg, round(rates[name] * 100, 1), mmr_from_rate(rates[name])])
+    return rows
+
+
+def apply_name_order(name_order: list[str], rates: dict[str, float], root: str = "."):
+    """Rewrite NAME_ORDER in utils/team_assign.py and the MMR_balance.xlsx sheet in the repo."""
+    path = os.path.join(root, "utils", "team_assign.py")
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    lines = []
+    for i in range(0, len(name_order), 7):
+        lines.append("    " + ", ".join(f'"{name}"' for name in name_order[i:i + 7]))
+    literal = "NAME_ORDER = [\n" + ",\n".join(lines) + "\n]"
+    source = re.sub(r"NAME_ORDER = \[.*?\]", literal, source, count=1, flags=re.S)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(source)
+    write_xlsx(os.path.join(root, "MMR_balance.xlsx"), mmr_rows(name_order, rates), sheet_name="MMR")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play every 5-god team against a sampled opponent set.")
+    parser.add_argument("--opponents", type=int, default=16, help="size of the sampled opponent set")
+    parser.add_argument("--games-per-pair", type=int, default=2, help="matches per team/opponent pair")
+    parser.add_argument("--bot1", default="random", choices=list(bot_configs), help="bot driving the teams")
+    parser.add_argument("--bot2", default="random", choices=list(bot_configs), help="bot driving the opponents")
+    parser.add_argument("--seed", type=int, default=0, help="base seed (each shard derives its own)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--limit-teams", type=int, default=None, help="only play the first N teams (quick runs)")
+    parser.add_argument("--out", default="simulation/results", help="output directory")
+    parser.add_argument("--apply", action="store_true",
+                        help="also rewrite NAME_ORDER in utils/team_assign.py and MMR_balance.xlsx")
+    args = parser.parse_args()
+
+    result = run_tournament(args.opponents, args.games_per_pair, args.bot1, args.bot2,
+                            seed=args.seed, workers=args.workers, limit_teams=args.limit_teams)
+    name_order = write_results(result, args.out)
+    if args.apply:
+        apply_name_order(name_order, god_win_rates(result))
+
+    rates = god_win_rates(result)
+    for name in name_order:
+        print(f"{name:<12}{rates[name] * 100:>6.1f}%  MMR {mmr_from_rate(rates[name])}")
+    print(f"\n{result['games']} games in {result['elapsed']:.1f}s -> results in {args.out}")
+    print("NAME_ORDER = " + json.dumps(name_order))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,10 @@ Utilities package for the Maggod Fight Discord bot.
 
 This package contains utility modules for game mechanics:
 
-- gameplay_tag: Core game classes (God, Effect, EffectType)
+- gameplay_tag: Core game classes (God, EffectType) and the effect registry
 - abilities_tag: God ability implementations
 - game_test_on_discord: Game state management and helper functions
+- matchups: Precomputed god matchup table (strength, duels, synergy)
+- team_assign: God order and the gambling team assignment (assign_gods)
+- odds: Simulated gambling win probabilities and the payout (true_gain)
 """
@@ -1,4 +1,4 @@
-from utils.gameplay_tag import God, Effect, EffectType
+from utils.gameplay_tag import God, EffectType, NEGATIVE_MASK
 import random as r
 import math
  
@@ -11,15 +11,15 @@ def poseidon(kwargs):
     if attacking_with_hermes:
         # Weaker shields when used with Hermes
         for god in visible_gods:
-            god.add_effect("posi_shield", value=2, duration=1)
+            god.add_effect(EffectType.POSI_SHIELD, value=2, duration=1)
     else:
         # Strong permanent shield if no shields exist
         
-        if not any("posi_shield" in god.effects for god in alive_ally):
-            eligible = [g for g in visible_gods if g.name.lower() != "poseidon" and "posi_shield" not in g.effects]
+        if not any(god.has_effect(EffectType.POSI_SHIELD) for god in alive_ally):
+            eligible = [g for g in visible_gods if g.name.lower() != "poseidon" and not g.has_effect(EffectType.POSI_SHIELD)]
             if eligible:
                 target = r.choice(eligible)
-                target.add_effect("posi_shield", value=5, duration=100)
+                target.add_effect(EffectType.POSI_SHIELD, value=5, duration=100)
     return ""
     
 
@@ -31,7 +31,7 @@ def hephaestus(kwargs):
     duration = 1 if attacking_with_hermes else 2
     msg = f" Hephaestus gives {value} HP {duration}-turn shield to:\n ✨gods : "
     for god in visible_gods:
-        god.add_effect("hep_shield", value=value, duration=duration)
+        god.add_effect(EffectType.HEP_SHIELD, value=value, duration=duration)
         msg += f",{god.name.capitalize()} "
     return msg
   
@@ -47,7 +47,7 @@ def aphrodite(kwargs):
         msg += f"does 1 dmg to {target.name.capitalize()} and heal herself by 1"
     else:
         msg += f"gives charm 💘 to {target.name.capitalize()} for 3 turns"
-        target.add_effect("aphro_charm", value=0, duration=3) #under charm heal opponent by 1
+        target.add_effect(EffectType.APHRO_CHARM, value=0, duration=3) #under charm heal opponent by 1
     return msg
 
 def ares(kwargs):
@@ -57,11 +57,11 @@ def ares(kwargs):
     if attacking_with_hermes:
         # Temporary boost when used with Hermes
         for god in visible_gods:
-            god.add_effect("ares_do_more_dmg", value=1, duration=1)
+            god.add_effect(EffectType.ARES_MORE_DMG, value=1, duration=1)
     else:
         # Permanent boost if not already active
         for god in visible_gods:
-            god.add_effect("ares_do_more_dmg", value=1, duration=100)
+            god.add_effect(EffectType.ARES_MORE_DMG, value=1, duration=100)
     return ""
 
 def hera(kwargs):
@@ -84,7 +84,7 @@ def zeus(kwargs):
     duration = 2 if attacking_with_hermes else 3
     msg = "Zeus "
     if len(alive_ennemy) > 2:
-        target.add_effect("zeus_stun", value=0, duration=duration)
+        target.add_effect(EffectType.ZEUS_STUN, value=0, duration=duration)
         msg += f"stuns 💫 {target.name.capitalize()} for {duration} turns,"
             # Lightning damages all visible allies
         msg += "and does 1 dmg (friendly dmg) to ✨gods : "
@@ -107,15 +107,15 @@ def athena(kwargs):
     if attacking_with_hermes:
         # Temporary HP boost when used with Hermes
         for god in visible_gods:
-            if "athena_more_max_hp" not in god.effects:
-                god.add_effect("athena_more_max_hp", value=1, duration=1)
+            if not god.has_effect(EffectType.ATHENA_MORE_HP):
+                god.add_effect(EffectType.ATHENA_MORE_HP, value=1, duration=1)
                 god.max_hp += 1
                 god.hp += 1
     else:
         # Permanent HP boost if not already active
         for god in visible_gods:
-            if "athena_more_max_hp" not in god.effects:
-                god.add_effect("athena_more_max_hp", value=2, duration=100)
+            if not god.has_effect(EffectType.ATHENA_MORE_HP):
+                god.add_effect(EffectType.ATHENA_MORE_HP, value=2, duration=100)
                 god.max_hp += 2
                 god.hp += 2
     return ""
@@ -187,7 +187,7 @@ def hades_ow(kwargs):
         dmg = math.floor(0.5 + dead_ally_nb/2)
         msg = f"Hades_ow gives +{dmg}💥 dmg boost for 2 turns to ✨gods : "
         for god in visible_gods:
-            god.add_effect("hades_ow_do_more_dmg", value= dmg, duration=2)
+            god.add_effect(EffectType.HADES_OW_MORE_DMG, value= dmg, duration=2)
             msg += f"{god.name.capitalize()}, "
         return msg
     return ""
@@ -207,7 +207,7 @@ def cerberus(kwargs):
     self = kwargs["self"]
     if not kwargs.get("attacking_with_hermes", False):
         msg = f"cerberus gives attract⛑️ to {target.name.capitalize()}, but looses 1 hp and gives it to {target.name.capitalize()}"
-        target.add_effect("cerberus_more_max_hp_per_visible_ally", value=1, duration=2)
+        target.add_effect(EffectType.CERBERUS_MORE_MAX_HP, value=1, duration=2)
         self.hp -= 1
         target.heal(1)
         return msg
@@ -224,13 +224,10 @@ def charon(kwargs):
             msg += f"and gains {heal} hp"
         elif heal < 0:
             msg += f"but losses {heal} hp"
-        target.add_effect("charon_invisible_duration", value=target.hp, duration=2)
-        bad_effects = ["aphro_charm", "zeus_stun", "tisi_freeze_timer","alecto_get_more_dmg", "mega_do_less_dmg"]
+        target.add_effect(EffectType.CHARON_INVISIBLE, value=target.hp, duration=2)
         # Remove negative effects from visible gods
         for god in kwargs["visible_gods"]:
-            for effect in bad_effects:
-                if effect in god.effects:
-                    del god.effects[effect]
+            god.effect_mask &= ~NEGATIVE_MASK
         return msg
     return ""
 
@@ -267,7 +264,7 @@ def hades_uw(kwargs):
         msg = f"Hades_uw gives {dead_ally_nb}☠️ shield for {duration} turn to ✨gods : "
         for god in visible_gods:
             msg += f"{god.name.capitalize()}, "
-            god.add_effect("hades_uw_shield", value=dead_ally_nb,duration = duration)
+            god.add_effect(EffectType.HADES_UW_MORE_HP, value=dead_ally_nb,duration = duration)
         return msg
     return ""
 
@@ -276,8 +273,8 @@ def tisiphone(kwargs):
     target = kwargs["target"]
     self = kwargs["self"]
     if len(kwargs["ennemy_team"]) > 2 and len(kwargs["ally_team"]) > 2:
-        target.add_effect("tisi_freeze_timer", value=1, duration=2)
-        self.add_effect("tisi_freeze_timer", value=1, duration=2)
+        target.add_effect(EffectType.TISI_FREEZE, value=1, duration=2)
+        self.add_effect(EffectType.TISI_FREEZE, value=1, duration=2)
         msg = f"Tisiphone froze ❄️ {target.name.capitalize()} and herself for 2 turns"
     else:
         if self.hp == self.max_hp:
@@ -295,7 +292,7 @@ def alecto(kwargs):
     value = 2
     duration = 2 if attacking_with_hermes else 3
     msg = f"Alecto gives {target.name.capitalize()} take more dmg 💢 for {duration} turns"
-    target.add_effect("alecto_get_more_dmg", value=value, duration=duration)
+    target.add_effect(EffectType.ALECTO_MORE_DMG, value=value, duration=duration)
     return msg
 
 def megaera(kwargs):
@@ -305,7 +302,7 @@ def megaera(kwargs):
     value = 4
     duration = 1 if attacking_with_hermes else 2
     msg = f"Megaera gives {target.name.capitalize()} dmg reduction 💚 for {duration} turns"
-    target.add_effect("mega_do_less_dmg", value=value, duration=duration)
+    target.add_effect(EffectType.MEGA_LESS_DMG, value=value, duration=duration)
     return msg
 
 def hecate(kwargs):
@@ -1,4 +1,4 @@
-from utils.gameplay_tag import God, Effect, EffectType
+from utils.gameplay_tag import God, EffectType, STUN_MASK
 import utils.abilities_tag as abilities
 import random as r
  
@@ -58,6 +58,18 @@ team_2 = [
     gods["charon"], gods["poseidon"], gods["zeus"], gods["hermes"], gods["apollo"]
 ]
 
+def new_gods():
+    """Return fresh copies of all gods (template order) for a new match."""
+    return [god.clone() for god in gods.values()]
+
+def clone_team(team):
+    """Return a copy of a team, keeping the order of the gods."""
+    return [god.clone() for god in team]
+
+def snapshot_teams(teams):
+    """Return a copy of a match.teams dict ({player_id: [gods]}) for search/simulation."""
+    return {player_id: [god.clone() for god in team] for player_id, team in teams.items()}
+
 def set_first_god_visible(team):
     """Make the first alive god visible if no gods are visible."""
     visible_gods = get_visible(team,True)
@@ -95,14 +107,14 @@ def became_visible_gain_effect(team, target):
 
 def get_visible(team,stunned = False):
     if stunned:
-        return [god for god in team if god.visible and god.alive and not any(e in god.effects for e in {"zeus_stun","tisi_freeze_timer"})]
+        return [god for god in team if god.visible and god.alive and not god.effect_mask & STUN_MASK]
     else:
         """Get all visible and alive gods from a team."""
         return [god for god in team if god.visible and god.alive]
 
 def get_alive(team,stunned = False):
     if stunned:
-        return [god for god in team if god.alive and not any(e in god.effects for e in {"zeus_stun","tisi_freeze_timer"})]
+        return [god for god in team if god.alive and not god.effect_mask & STUN_MASK]
     else:
         """Get all alive gods from a team."""
         return [god for god in team if god.alive]
@@ -111,17 +123,16 @@ def get_dead(team):
     """Get all dead gods from a team."""
     return [god for god in team if not god.alive]
 
-def delete_effect(team, effect_name):
-    """Delete a specific effect from all gods in a team."""
+def delete_effect(team, effect: EffectType):
+    """Delete a specific effect from all gods in a team (it expires at the next effect update)."""
     for god in team:
-        if effect_name in god.effects:
-            effect = god.effects[effect_name]
-            effect.duration = 0
+        if god.has_effect(effect):
+            god.effect_durations[effect] = 0
 
             # Handle special effect removals
-            if effect_name == "athena_more_max_hp":
-                god.max_hp -= effect.value
-                god.hp -= effect.value
+            if effect == EffectType.ATHENA_MORE_HP:
+                god.max_hp -= god.effect_values[effect]
+                god.hp -= god.effect_values[effect]
         
         # Ensure HP doesn't exceed max HP
         if god.max_hp < god.hp:
@@ -133,25 +144,25 @@ def action_befor_delete_effect(attack_team):
         if god.hp < 1 and god.alive:
             # Remove effects when gods die
             if god.name == "poseidon":
-                delete_effect(attack_team, "posi_shield")
+                delete_effect(attack_team, EffectType.POSI_SHIELD)
             elif god.name == "ares":
-                delete_effect(attack_team, "ares_do_more_dmg")
+                delete_effect(attack_team, EffectType.ARES_MORE_DMG)
             elif god.name == "athena":
-                delete_effect(attack_team, "athena_more_max_hp")
+                delete_effect(attack_team, EffectType.ATHENA_MORE_HP)
             elif god.name == "charon":
-                delete_effect(attack_team, "charon_invisible_duration")
+                delete_effect(attack_team, EffectType.CHARON_INVISIBLE)
 
 def delete_passive_effect_when_hiding(attack_team,target):
     """Handle effects before they are deleted when gods die."""
     for god in attack_team:
             if god.name == "poseidon" and target.name == "poseidon":
-                delete_effect(attack_team, "posi_shield")
+                delete_effect(attack_team, EffectType.POSI_SHIELD)
             elif god.name == "ares" and target.name == "ares":
-                delete_effect(attack_team, "ares_do_more_dmg")
+                delete_effect(attack_team, EffectType.ARES_MORE_DMG)
             elif god.name == "athena" and target.name == "athena":
-                delete_effect(attack_team, "athena_more_max_hp")
-            elif "cerberus_more_max_hp_per_visible_ally" in target.effects:
-                delete_effect(target, "cerberus_more_max_hp_per_visible_ally")
+                delete_effect(attack_team, EffectType.ATHENA_MORE_HP)
+            elif target.has_effect(EffectType.CERBERUS_MORE_MAX_HP):
+                delete_effect([target], EffectType.CERBERUS_MORE_MAX_HP)
 
 def action_befor_die(defend_team, attack_team):
     """Handle actions before gods die."""
@@ -170,9 +181,9 @@ def action_befor_die(defend_team, attack_team):
     
     # Handle Charon's protective effect and death processing for defending team
     for god in defend_team:
-        if "charon_invisible_duration" in god.effects:
+        if god.has_effect(EffectType.CHARON_INVISIBLE):
             # Charon's protection restores HP
-            god.hp = god.effects["charon_invisible_duration"].value
+            god.hp = god.effect_values[EffectType.CHARON_INVISIBLE]
         
         if god.hp < 1 and god.alive:
             god.alive = False
@@ -192,6 +203,6 @@ def reset_god_to_default(god_name):
         original_god.hp = original_god.max_hp
         original_god.visible = False
         original_god.alive = True
-        original_god.effects = {}
+        original_god.clear_effects()
         return original_god
     return None
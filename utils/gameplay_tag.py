@@ -1,72 +1,172 @@
-from enum import Enum
-
-class EffectType(Enum):
-    """All effect names used in the game."""
-    POSI_SHIELD = "posi_shield"
-    HEP_SHIELD = "hep_shield"
-    ARES_MORE_DMG = "ares_do_more_dmg"
-    APHRO_CHARM = "aphro_charm"
-    ZEUS_STUN = "zeus_stun"
-    ATHENA_MORE_HP = "athena_more_max_hp"
-    HADES_OW_MORE_DMG = "hades_ow_do_more_dmg"
-    CERBERUS_MORE_MAX_HP = "cerberus_more_max_hp_per_visible_ally"
-    CHARON_INVISIBLE = "charon_invisible_duration"
-    HADES_UW_MORE_HP = "hades_uw_shield"
-    TISI_FREEZE = "tisi_freeze_timer"
-    ALECTO_MORE_DMG = "alecto_get_more_dmg"
-    MEGA_LESS_DMG = "mega_do_less_dmg"
-
-class Effect:
-    """Represents a temporary effect on a god."""
-    
-    def __init__(self, value: int, duration: int):
-        self.value = value
-        self.duration = duration
+from enum import IntEnum
 
-    def update(self):
-        """Decrease duration by 1."""
-        self.duration -= 1
+class EffectType(IntEnum):
+    """All effects used in the game. The value is the effect's slot in the God effect arrays."""
+    POSI_SHIELD = 0
+    HEP_SHIELD = 1
+    ARES_MORE_DMG = 2
+    APHRO_CHARM = 3
+    ZEUS_STUN = 4
+    ATHENA_MORE_HP = 5
+    HADES_OW_MORE_DMG = 6
+    CERBERUS_MORE_MAX_HP = 7
+    CHARON_INVISIBLE = 8
+    HADES_UW_MORE_HP = 9
+    TISI_FREEZE = 10
+    ALECTO_MORE_DMG = 11
+    MEGA_LESS_DMG = 12
+
+    @property
+    def key(self) -> str:
+        """Legacy effect name (used by saves and the tutorial overrides)."""
+        return EFFECT_KEYS[self]
+
+    @property
+    def icon(self) -> str:
+        return EFFECT_ICONS[self]
+
+    @property
+    def bit(self) -> int:
+        return 1 << self
+
+    @classmethod
+    def from_key(cls, key: str) -> "EffectType":
+        return cls(EFFECT_KEYS.index(key))
+
+
+# Canonical effect registry, indexed by EffectType (the order is also the save format order)
+EFFECT_COUNT = len(EffectType)
+EFFECT_KEYS = (
+    "posi_shield", "hep_shield", "ares_do_more_dmg", "aphro_charm", "zeus_stun",
+    "athena_more_max_hp", "hades_ow_do_more_dmg", "cerberus_more_max_hp_per_visible_ally",
+    "charon_invisible_duration", "hades_uw_shield", "tisi_freeze_timer",
+    "alecto_get_more_dmg", "mega_do_less_dmg",
+)
+EFFECT_ICONS = (
+    "🔱", "🛡️", "🔥", "💘", "💫",
+    "📯", "💥", "🐶",
+    "🧿", "☠️", "❄️",
+    "💢", "💚",
+)
+
+# Effect groups used by the engine and the board display
+SHIELD_EFFECTS = (EffectType.POSI_SHIELD, EffectType.HEP_SHIELD, EffectType.HADES_UW_MORE_HP)
+DMG_BOOST_EFFECTS = (
+    (EffectType.ARES_MORE_DMG, "+"),
+    (EffectType.HADES_OW_MORE_DMG, "+"),
+    (EffectType.MEGA_LESS_DMG, "-"),
+)
+MISC_EFFECTS = (
+    EffectType.ZEUS_STUN, EffectType.APHRO_CHARM, EffectType.CHARON_INVISIBLE,
+    EffectType.TISI_FREEZE, EffectType.CERBERUS_MORE_MAX_HP, EffectType.ALECTO_MORE_DMG,
+)
+NEGATIVE_EFFECTS = (
+    EffectType.APHRO_CHARM, EffectType.ZEUS_STUN, EffectType.TISI_FREEZE,
+    EffectType.ALECTO_MORE_DMG, EffectType.MEGA_LESS_DMG,
+)
+
+# Bitmasks over God.effect_mask
+SHIELD_MASK = sum(effect.bit for effect in SHIELD_EFFECTS)
+NEGATIVE_MASK = sum(effect.bit for effect in NEGATIVE_EFFECTS)
+STUN_MASK = EffectType.ZEUS_STUN.bit | EffectType.TISI_FREEZE.bit
+HP_BOOST_MASK = EffectType.ATHENA_MORE_HP.bit | EffectType.CERBERUS_MORE_MAX_HP.bit
+
+_ALECTO_BIT = EffectType.ALECTO_MORE_DMG.bit
+_ARES_BIT = EffectType.ARES_MORE_DMG.bit
+_HADES_OW_BIT = EffectType.HADES_OW_MORE_DMG.bit
+_MEGA_BIT = EffectType.MEGA_LESS_DMG.bit
+_APHRO_BIT = EffectType.APHRO_CHARM.bit
 
-    def is_expired(self):
-        """Check if the effect has expired."""
-        return self.duration <= 0
-    
-#used ?
-    def __str__(self):
-        """String representation of the effect."""
-        return f"Effect(value={self.value}, duration={self.duration})"
 
 class God:
-    """Represents a god in the game."""
-    
+    """
+    Represents a god in the game.
+    Active effects are stored as a bitmask over EffectType plus one value and one
+    duration slot per effect (slots of inactive effects are meaningless).
+    """
+    __slots__ = (
+        "name", "hp", "max_hp", "dmg", "ability",
+        "effect_mask", "effect_values", "effect_durations",
+        "visible", "alive", "reload", "reload_max",
+    )
+
     def __init__(self, name: str, hp: int, dmg: int, ability_func,reload_time):
         self.name = name
         self.hp = hp
         self.max_hp = hp
         self.dmg = dmg
         self.ability = ability_func
-        self.effects = {}
+        self.effect_mask = 0
+        self.effect_values = [0] * EFFECT_COUNT
+        self.effect_durations = [0] * EFFECT_COUNT
         self.visible = False
         self.alive = True
         self.reload = 0
         self.reload_max = reload_time
 
-    def add_effect(self, effect_name: str, value: int, duration: int):
+    def clone(self):
+        """Return an independent copy of the god (effects are copied, the ability function is shared)."""
+        copy = God.__new__(God)
+        copy.name = self.name
+        copy.hp = self.hp
+        copy.max_hp = self.max_hp
+        copy.dmg = self.dmg
+        copy.ability = self.ability
+        copy.effect_mask = self.effect_mask
+        copy.effect_values = self.effect_values[:]
+        copy.effect_durations = self.effect_durations[:]
+        copy.visible = self.visible
+        copy.alive = self.alive
+        copy.reload = self.reload
+        copy.reload_max = self.reload_max
+        return copy
+
+    def has_effect(self, effect: EffectType) -> bool:
+        return bool(self.effect_mask & (1 << effect))
+
+    def effect_value(self, effect: EffectType) -> int:
+        """Value of an active effect (0 if the effect isn't active)."""
+        return self.effect_values[effect] if self.effect_mask & (1 << effect) else 0
+
+    def active_effects(self) -> list[EffectType]:
+        """Active effects in EffectType order."""
+        mask = self.effect_mask
+        return [effect for effect in EffectType if mask & (1 << effect)]
+
+    def add_effect(self, effect: EffectType, value: int, duration: int):
         """Add an effect only if it doesn't already exist."""
-        if effect_name not in self.effects:
-            self.effects[effect_name] = Effect(value, duration * 2)
+        bit = 1 << effect
+        if not self.effect_mask & bit:
+            self.effect_mask |= bit
+            self.effect_values[effect] = value
+            self.effect_durations[effect] = duration * 2
+
+    def set_effect(self, effect: EffectType, value: int, duration: int):
+        """Set an effect with a raw (already doubled) duration, replacing any existing one."""
+        self.effect_mask |= 1 << effect
+        self.effect_values[effect] = value
+        self.effect_durations[effect] = duration
+
+    def remove_effect(self, effect: EffectType):
+        self.effect_mask &= ~(1 << effect)
 
+    def clear_effects(self):
+        self.effect_mask = 0
 
     def update_effects(self):
         """Update all effects, removing expired ones."""
         self.reload -= 1
-        to_remove = []
-        for name, effect in self.effects.items():
-            effect.update()
-            if effect.is_expired():
-                to_remove.append(name)
-        for name in to_remove:
-            del self.effects[name]
+        mask = self.effect_mask
+        if not mask:
+            return
+        durations = self.effect_durations
+        for effect in range(EFFECT_COUNT):
+            bit = 1 << effect
+            if mask & bit:
+                durations[effect] -= 1
+                if durations[effect] <= 0:
+                    mask &= ~bit
+        self.effect_mask = mask
     
     def check_abillity(self):
         if self.reload <= 0:
@@ -85,34 +185,32 @@ class God:
             self.hp += value
 
     def get_dmg(self, value: int,real = True):
-        """Apply damage to this god, prioritizing shield effects with the lowest duration left."""
+        """
+        Apply damage to this god, prioritizing shield effects with the lowest duration left.
+        With real=False nothing is changed and the damage that would reach HP is returned.
+        """
+        mask = self.effect_mask
+        values = self.effect_values
         # Apply damage boosts to incoming damage
-        if "alecto_get_more_dmg" in self.effects:
-            value += self.effects["alecto_get_more_dmg"].value
-
-        # Gather all active shields
-        shield_types = ["posi_shield", "hep_shield", "hades_uw_shield"]
-        shields = [
-            (shield_type, self.effects[shield_type])
-            for shield_type in shield_types
-            if shield_type in self.effects
-        ]
-
-        # Sort shields by duration (ascending)
-        shields.sort(key=lambda pair: pair[1].duration)
-
-        # Apply shields in that order
-        for _, shield in shields:
-            if value <= 0:
-                return  # All damage blocked
-
-            if shield.value >= value and real:
-                shield.value -= value
-                return  # All damage absorbed
-            else:
-                value -= shield.value
-                if real:
-                    shield.value = 0
+        if mask & _ALECTO_BIT:
+            value += values[EffectType.ALECTO_MORE_DMG]
+
+        # Apply active shields, lowest duration first
+        if mask & SHIELD_MASK:
+            durations = self.effect_durations
+            shields = [effect for effect in SHIELD_EFFECTS if mask & (1 << effect)]
+            shields.sort(key=lambda effect: durations[effect])
+            for shield in shields:
+                if value <= 0:
+                    return None if real else 0  # All damage blocked
+
+                if values[shield] >= value and real:
+                    values[shield] -= value
+                    return  # All damage absorbed
+                else:
+                    value -= values[shield]
+                    if real:
+                        values[shield] = 0
 
         # Apply remaining damage to HP
         if real:
@@ -126,22 +224,25 @@ class God:
     def do_damage(self):
         """Calculate and return damage output."""
         dmg = self.dmg
+        mask = self.effect_mask
+        if not mask:
+            return dmg
+        values = self.effect_values
 
         # Apply damage boosts
-        if "ares_do_more_dmg" in self.effects:
-            dmg += self.effects["ares_do_more_dmg"].value
+        if mask & _ARES_BIT:
+            dmg += values[EffectType.ARES_MORE_DMG]
 
-        if "hades_ow_do_more_dmg" in self.effects:
-            dmg += self.effects["hades_ow_do_more_dmg"].value
+        if mask & _HADES_OW_BIT:
+            dmg += values[EffectType.HADES_OW_MORE_DMG]
 
         # Apply damage reductions
-        if "mega_do_less_dmg" in self.effects:
-            dmg -= self.effects["mega_do_less_dmg"].value
+        if mask & _MEGA_BIT:
+            dmg -= values[EffectType.MEGA_LESS_DMG]
             
-        if "aphro_charm" in self.effects:
+        if mask & _APHRO_BIT:
             dmg = -1
 
-        # Make god visible when attacking
         return dmg
 
 #used ?
@@ -0,0 +1,100 @@
+"""
+Precomputed god matchup table (built offline by `python -m simulation.matchups`).
+
+The table holds, for the gods in template order:
+- strength[i]: win rate of the teams god i played in
+- duel[i, j]: win rate of the teams with god i against the teams with god j
+- synergy[i, j]: win rate of the teams with both god i and god j
+All lookups are array indexing, the file is read once per process.
+"""
+import logging
+import os
+
+import numpy as np
+
+from utils.game_test_on_discord import gods
+
+logger = logging.getLogger(__name__)
+
+MATCHUP_TABLE_PATH = os.path.join(os.path.dirname(__file__), "data", "matchups.npz")
+
+
+def roster_signature() -> str:
+    """Stats of the current roster; a table built for other stats is out of date."""
+    return ";".join(f"{god.name}:{god.max_hp}:{god.dmg}:{god.reload_max}" for god in gods.values())
+
+
+class MatchupTable:
+    def __init__(self, names, strength, duel, synergy, games: int = 0, signature: str = ""):
+        self.names = [str(name) for name in names]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.strength = np.asarray(strength, dtype=np.float32)
+        self.duel = np.asarray(duel, dtype=np.float32)
+        self.synergy = np.asarray(synergy, dtype=np.float32)
+        self.games = int(games)
+        self.signature = str(signature)
+
+    @classmethod
+    def load(cls, path: str = MATCHUP_TABLE_PATH) -> "MatchupTable":
+        with np.load(path) as data:
+            return cls(data["names"], data["strength"], data["duel"], data["synergy"],
+                       data["games"], data["signature"])
+
+    def save(self, path: str = MATCHUP_TABLE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(
+            path, names=np.array(self.names), strength=self.strength, duel=self.duel,
+            synergy=self.synergy, games=np.int64(self.games), signature=np.array(self.signature),
+        )
+
+    @property
+    def up_to_date(self) -> bool:
+        return self.signature == roster_signature()
+
+    def name_order(self) -> list[str]:
+        """God names from strongest to weakest."""
+        return [self.names[i] for i in np.argsort(-self.strength, kind="stable")]
+
+    def team_strength(self, team: list) -> float:
+        """Mean pair synergy of a team (its strength index, ~0.5 for an average team)."""
+        ids = [self.index[god.name] for god in team]
+        if len(ids) < 2:
+            return float(self.strength[ids].mean()) if ids else 0.5
+        block = self.synergy[np.ix_(ids, ids)]
+        return float((block.sum() - np.trace(block)) / (len(ids) * (len(ids) - 1)))
+
+    def draft_score(self, god, my_team: list, opp_team: list) -> float:
+        """Value of adding god to my_team: its strength, synergy with my team and duels with the opponents."""
+        i = self.index[god.name]
+        score = float(self.strength[i])
+        if my_team:
+            score += float(self.synergy[i, [self.index[g.name] for g in my_team]].mean()) - 0.5
+        if opp_team:
+            score += float(self.duel[i, [self.index[g.name] for g in opp_team]].mean()) - 0.5
+        return score
+
+
+_table = None
+_loaded = False
+
+
+def get_matchup_table() -> MatchupTable | None:
+    """The table of MATCHUP_TABLE_PATH (None if it hasn't been built, callers fall back to heuristics)."""
+    global _table, _loaded
+    if not _loaded:
+        _loaded = True
+        try:
+            _table = MatchupTable.load()
+            if not _table.up_to_date:
+                logger.warning("Matchup table was built for other god stats, rebuild it with python -m simulation.matchups")
+        except FileNotFoundError:
+            logger.warning(f"No matchup table at {MATCHUP_TABLE_PATH}, using the built-in god order")
+        except Exception as e:
+            logger.error(f"Failed to load the matchup table: {e}")
+    return _table
+
+
+def set_matchup_table(table: MatchupTable | None):
+    """Replace the table of this process (e.g. after a rebuild)."""
+    global _table, _loaded
+    _table, _loaded = table, True
@@ -0,0 +1,163 @@
+"""
+Gambling odds: win probability of the player for every (your_var, enemy_var, bot_type) configuration
+of the gambling menu, estimated offline by `python -m simulation.odds` and refreshed in the background
+by the bot when the god stats (or the god order used by assign_gods) change.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from utils.matchups import roster_signature
+from utils.team_assign import god_order
+
+logger = logging.getLogger(__name__)
+
+ODDS_TABLE_PATH = os.path.join(os.path.dirname(__file__), "data", "odds.npz")
+VAR_VALUES = list(range(-5, 6))  # slider values of the gambling menu
+GAMBLING_BOTS = ["bot_overloard"]  # opponents of the gambling mode
+PLAYER_BOT = "best_bot"  # plays the human side in the simulations
+REFRESH_GAMES = 200  # games per configuration of a background refresh
+HOUSE_EDGE = 0.05
+MIN_WIN_PROBABILITY = 1 / 12  # caps the payout at ~11x the bet, like the fixed curves
+
+
+def odds_signature() -> str:
+    """God stats and god order the odds were simulated with."""
+    return roster_signature() + "|" + ",".join(god_order())
+
+
+class OddsTable:
+    def __init__(self, bot_types, win_prob, games_per_config: int = 0, signature: str = ""):
+        self.bot_types = [str(bot) for bot in bot_types]
+        self.win_prob = np.asarray(win_prob, dtype=np.float32)  # [bot, your_var, enemy_var]
+        self.games_per_config = int(games_per_config)
+        self.signature = str(signature)
+
+    @classmethod
+    def load(cls, path: str = ODDS_TABLE_PATH) -> "OddsTable":
+        with np.load(path) as data:
+            return cls(data["bot_types"], data["win_prob"], data["games_per_config"], data["signature"])
+
+    def save(self, path: str = ODDS_TABLE_PATH):
+        """Write the table atomically (worker processes reload it when the file changes)."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez_compressed(
+                f, bot_types=np.array(self.bot_types), win_prob=self.win_prob,
+                games_per_config=np.int64(self.games_per_config), signature=np.array(self.signature),
+            )
+        os.replace(tmp, path)
+
+    @property
+    def up_to_date(self) -> bool:
+        return self.signature == odds_signature()
+
+    def win_probability(self, your_var: int, enemy_var: int, bot_type: str) -> float | None:
+        """Chance the player beats bot_type with these menu values (None if the bot wasn't simulated)."""
+        if bot_type not in self.bot_types:
+            return None
+        offset = VAR_VALUES[0]
+        return float(self.win_prob[self.bot_types.index(bot_type), your_var - offset, enemy_var - offset])
+
+
+_table = None
+_UNSET = object()
+_mtime = _UNSET  # st_mtime_ns of ODDS_TABLE_PATH when _table was read (None: no file)
+_refresh_task = None
+
+
+def true_gain(your_var: int, enemy_var: int, bet: int, wealth: int, bot_type: str = GAMBLING_BOTS[0],
+              table: OddsTable | None = None, reduction_neg=0.5, reduction_pos=0.2) -> int:
+    """
+    Gain paid when the player wins: the fair odds of the simulated win probability minus the
+    house edge (fixed curves of the slider sum without odds), reduced for bets close to the wealth.
+    """
+    table = table or get_odds_table()
+    p = table.win_probability(your_var, enemy_var, bot_type) if table is not None else None
+    fraction = bet / wealth
+    if p is not None:
+        p = max(p, MIN_WIN_PROBABILITY)
+        base = max(0.0, bet * ((1 - HOUSE_EDGE) / p - 1))
+        scale = 1 - fraction * (reduction_pos if p >= 0.5 else reduction_neg)
+    else:
+        v = your_var + enemy_var
+        if v > 0:
+            base = bet * (89 - 8 * v) / 90.0
+            scale = 1 - fraction * reduction_pos
+        elif v == 0:
+            base = bet
+            scale = 1 - fraction * reduction_pos
+        else:  # v < 0
+            base = bet * (-v + 1)
+            scale = 1 - fraction * reduction_neg
+    return round((base * scale)+100)  # only the gain
+
+
+def _table_mtime() -> int | None:
+    try:
+        return os.stat(ODDS_TABLE_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def get_odds_table() -> OddsTable | None:
+    """
+    The table of ODDS_TABLE_PATH (None if it hasn't been built, gambling uses the fixed curves).
+    It is read again whenever the file changes, so every worker process prices bets from the
+    table the last refresh wrote, whichever process ran it.
+    """
+    global _table, _mtime
+    mtime = _table_mtime()
+    if mtime != _mtime:
+        _mtime = mtime
+        if mtime is None:
+            logger.warning(f"No odds table at {ODDS_TABLE_PATH}, gambling uses the fixed payout curves")
+        else:
+            try:
+                _table = OddsTable.load(ODDS_TABLE_PATH)
+            except Exception as e:
+                logger.error(f"Failed to load the odds table: {e}")
+    return _table
+
+
+def set_odds_table(table: OddsTable | None):
+    """Replace the table of this process (e.g. after a rebuild written to ODDS_TABLE_PATH)."""
+    global _table, _mtime
+    _table, _mtime = table, _table_mtime()
+
+
+async def refresh_odds_table(games_per_config: int = REFRESH_GAMES, bot_types: list[str] = GAMBLING_BOTS):
+    """Rebuild the table in a worker process if it is missing, out of date or lacks a bot (the old one stays in use meanwhile)."""
+    table = get_odds_table()
+    if table is not None and table.up_to_date and all(bot in table.bot_types for bot in bot_types):
+        return
+    from simulation.odds import build_odds_table
+    logger.info(f"Simulating gambling odds ({games_per_config} games per configuration)...")
+    # spawn: the worker starts clean instead of forking the running bot
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        table = await asyncio.get_running_loop().run_in_executor(
+            executor, build_odds_table, games_per_config, bot_types, 0, 1
+        )
+    table.save()
+    set_odds_table(table)
+    logger.info("Gambling odds updated")
+
+
+def schedule_odds_refresh():
+    """Start refresh_odds_table in the background (once at a time)."""
+    global _refresh_task
+
+    async def run():
+        try:
+            await refresh_odds_table()
+        except Exception as e:
+            logger.error(f"Failed to refresh the gambling odds: {e}")
+
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.get_running_loop().create_task(run())
+    return _refresh_task
@@ -0,0 +1,206 @@
+import random
+import logging
+
+from utils.matchups import get_matchup_table
+
+logger = logging.getLogger(__name__)
+
+# canonical best->worst order you provided (used when no matchup table has been built)
+NAME_ORDER = [
+    "athena", "hephaestus", "hera", "megaera", "poseidon", "alecto", "hecate",
+    "aphrodite", "charon", "ares", "thanatos", "persephone", "artemis", "tisiphone",
+    "hades_uw", "apollo", "hermes", "cerberus", "zeus", "hades_ow"
+]
+
+def god_order() -> list[str]:
+    """God names best->worst: from the matchup table if it is up to date, else NAME_ORDER."""
+    table = get_matchup_table()
+    if table is not None and table.up_to_date:
+        return table.name_order()
+    return NAME_ORDER
+
+
+def assign_gods(match, your_var: int, enemy_var: int, start_random: bool = True, rng=random):
+    """
+    Assigns gods to match.teams based on your_var and enemy_var.
+    - match.gods must be a list of God instances (match.gods = list(match.gods.values()))
+    - match.available_gods must be a copy of match.gods (mutable)
+    - your_var, enemy_var in [-5,5]. Positive -> that many good; negative -> that many bad.
+    - Returns (team_p1, team_p2) where each is a list of God instances (len == 5).
+    - Side: player1 = match.player1_id, player2 = match.player2_id.
+    - start_random: if True, starting picker is random between player1 and player2.
+    """
+    # --- validation ---
+    if not (-5 <= your_var <= 5 and -5 <= enemy_var <= 5):
+        raise ValueError("your_var and enemy_var must be between -5 and 5")
+
+    # Prepare ordered_all according to god_order()
+    name_order = god_order()
+    all_objs = list(getattr(match, "gods", []))  # list of God instances
+    name_to_god = {g.name: g for g in all_objs}
+    ordered_all = []
+    for name in name_order:
+        if name in name_to_god:
+            ordered_all.append(name_to_god[name])
+        else:
+            logger.warning("Expected god name '%s' missing from match.gods", name)
+    # append any gods that exist in match.gods but were not in the order
+    for g in all_objs:
+        if g.name not in name_order:
+            ordered_all.append(g)
+
+    # Working pools
+    all_pool = ordered_all.copy()
+    good_pool = []
+    bad_pool = []
+
+    # Compute how many good/bad we need in pools (defaults to 7 each)
+    positive_sum = max(0, your_var) + max(0, enemy_var)
+    negative_sum = abs(min(0, your_var)) + abs(min(0, enemy_var))
+    good_size = max(7, positive_sum)
+    bad_size = max(7, negative_sum)
+
+    # Build good_pool from top (best) in order
+    i = 0
+    while len(good_pool) < good_size and i < len(ordered_all):
+        candidate = ordered_all[i]
+        if candidate not in good_pool:
+            good_pool.append(candidate)
+        i += 1
+
+    # Build bad_pool from bottom (worst) in order, skipping any already taken by good_pool
+    j = 1
+    while len(bad_pool) < bad_size and j <= len(ordered_all):
+        candidate = ordered_all[-j]
+        if candidate not in bad_pool and candidate not in good_pool:
+            bad_pool.append(candidate)
+        j += 1
+
+    # Sanity clamp: ensure pools don't exceed available gods
+    # (if pools cover almost all gods, it's okay — there are 20 total)
+    # NOTE: we do not remove pool elements from all_pool now; removals happen when a god is chosen.
+
+    # Prepare team containers (store God instances)
+    p1 = match.player1_id
+    p2 = match.player2_id
+    team_p1 = []
+    team_p2 = []
+
+    # Compute per-player special needs and types
+    def special_info(var):
+        if var > 0:
+            return ("good", var)
+        elif var < 0:
+            return ("bad", abs(var))
+        else:
+            return (None, 0)
+
+    p1_type, p1_need = special_info(your_var)
+    p2_type, p2_need = special_info(enemy_var)
+
+    # Helper: pick and remove from pools + all_pool
+    def pick_from_pool(pool_list):
+        """Pick random from pool_list; remove from pool_list and from all_pool; return picked instance or None."""
+        if not pool_list:
+            return None
+        chosen = rng.choice(pool_list)
+        # remove from pool_list
+        pool_list.remove(chosen)
+        # also remove from all_pool if present
+        if chosen in all_pool:
+            all_pool.remove(chosen)
+        # also ensure removed from the other pool if present
+        if chosen in good_pool:
+            try: good_pool.remove(chosen)
+            except ValueError: pass
+        if chosen in bad_pool:
+            try: bad_pool.remove(chosen)
+            except ValueError: pass
+        return chosen
+
+    def pick_from_all_pool():
+        if not all_pool:
+            return None
+        chosen = rng.choice(all_pool)
+        all_pool.remove(chosen)
+        # remove from special pools if present
+        if chosen in good_pool:
+            try: good_pool.remove(chosen)
+            except ValueError: pass
+        if chosen in bad_pool:
+            try: bad_pool.remove(chosen)
+            except ValueError: pass
+        return chosen
+
+    # Alternating picks to satisfy specials
+    current = rng.choice([p1, p2]) if start_random else p1
+    # Loop until both special needs are zero
+    while p1_need > 0 or p2_need > 0:
+        if current == p1:
+            if p1_need > 0:
+                if p1_type == "good":
+                    chosen = pick_from_pool(good_pool)
+                    if chosen is None:
+                        # fallback to all_pool
+                        chosen = pick_from_all_pool()
+                else:  # bad
+                    chosen = pick_from_pool(bad_pool)
+                    if chosen is None:
+                        chosen = pick_from_all_pool()
+                if chosen:
+                    team_p1.append(chosen)
+                    p1_need -= 1
+            # else: nothing this turn
+            current = p2
+        else:  # current == p2
+            if p2_need > 0:
+                if p2_type == "good":
+                    chosen = pick_from_pool(good_pool)
+                    if chosen is None:
+                        chosen = pick_from_all_pool()
+                else:  # bad
+                    chosen = pick_from_pool(bad_pool)
+                    if chosen is None:
+                        chosen = pick_from_all_pool()
+                if chosen:
+                    team_p2.append(chosen)
+                    p2_need -= 1
+            current = p1
+
+    # Now fill remaining slots until each team has 5, alternating
+    # (continue alternating from current)
+    while len(team_p1) < 5 or len(team_p2) < 5:
+        if current == p1:
+            if len(team_p1) < 5:
+                chosen = pick_from_all_pool()
+                if chosen is None:
+                    break  # no more gods
+                team_p1.append(chosen)
+            current = p2
+        else:
+            if len(team_p2) < 5:
+                chosen = pick_from_all_pool()
+                if chosen is None:
+                    break
+                team_p2.append(chosen)
+            current = p1
+
+    # Final shuffle of each team's order
+    rng.shuffle(team_p1)
+    rng.shuffle(team_p2)
+
+    # Save to match.teams (God instances)
+    match.teams = {
+        match.player1_id: team_p1,
+        match.player2_id: team_p2
+    }
+
+    # Remove assigned gods from match.available_gods if present
+    try:
+        remaining = [g for g in getattr(match, "available_gods", []) if g not in (team_p1 + team_p2)]
+        match.available_gods = remaining
+    except Exception:
+        # If match.available_gods doesn't exist or is not a list, ignore
+        logger.debug("Could not update match.available_gods; check structure.")
+
+    return team_p1, team_p2